@@ -23,7 +23,6 @@ Usage:
 """
 
 from .core import HouslerCrypto
-from .migration import FernetMigrator
 from .utils import mask, normalize_email, normalize_phone
 
 __version__ = "1.0.0"
@@ -34,3 +33,24 @@ __all__ = [
     "normalize_email",
     "FernetMigrator",
 ]
+
+# Rarely used parts load on first access (they pull in cryptography.fernet)
+_LAZY_IMPORTS = {
+    "FernetMigrator": "migration",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,241 @@
+"""
+Encryption coverage audit (152-FZ).
+
+Counts, per table and column, how many values are plaintext, HouslerCrypto
+``hc1:``, Fernet (lk/club), club ``enc:`` or agent AES-GCM, and which
+envelopes are malformed. Values are inspected structurally only - prefix,
+base64, version byte and minimum length - so no keys are needed.
+
+Agent AES-GCM values carry no marker; any long strict-base64 value that
+decodes to at least IV + tag + 1 bytes is counted as agent GCM.
+
+Usage:
+    from housler_crypto.audit import AuditReport
+
+    report = AuditReport()
+    report.scan_cursor(cursor, "users", ["email", "phone"])  # SELECT id, email, phone ...
+    with open("users.jsonl") as f:
+        report.scan_jsonl(f, "users", "id", ["email", "phone"])
+    print(report.to_dict())
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+import json
+import re
+from collections.abc import Iterable
+from typing import IO
+
+from .core import (
+    ENCRYPTED_PREFIX,
+    MIN_PACKED_LENGTH,
+    MIN_SIV_PACKED_LENGTH,
+    VERSION_GCM,
+    VERSION_SIV,
+)
+
+# Categories
+NULL = "null"
+EMPTY = "empty"
+PLAINTEXT = "plaintext"
+HC1 = "hc1"
+HC1_MALFORMED = "hc1_malformed"
+FERNET = "fernet"
+FERNET_MALFORMED = "fernet_malformed"
+ENC = "enc"
+ENC_MALFORMED = "enc_malformed"
+AGENT_GCM = "agent_gcm"
+
+CATEGORIES = (
+    NULL, EMPTY, PLAINTEXT, HC1, HC1_MALFORMED, FERNET, FERNET_MALFORMED,
+    ENC, ENC_MALFORMED, AGENT_GCM,
+)
+MALFORMED = (HC1_MALFORMED, FERNET_MALFORMED, ENC_MALFORMED)
+
+# Categories that need no follow-up, so no primary keys are sampled
+_NOT_SAMPLED = (NULL, EMPTY, HC1)
+
+# Fernet: version (0x80) + timestamp (8) + iv (16) + ciphertext (n * 16) + hmac (32)
+_FERNET_PREFIX = "gAAAAA"
+_FERNET_VERSION = 0x80
+_FERNET_OVERHEAD = 1 + 8 + 16 + 32
+_FERNET_BLOCK = 16
+
+# agent: iv (16) + tag (16) + ciphertext
+_AGENT_MIN_LENGTH = 16 + 16 + 1
+_AGENT_MIN_CHARS = (_AGENT_MIN_LENGTH + 2) // 3 * 4
+
+_B64 = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+_B64_URL = re.compile(r"[A-Za-z0-9_\-]+={0,2}")
+
+
+def _is_fernet_token(token: str) -> bool:
+    if not _B64_URL.fullmatch(token) or len(token) % 4:
+        return False
+    try:
+        data = base64.urlsafe_b64decode(token)
+    except (binascii.Error, ValueError):
+        return False
+    return (
+        data[0] == _FERNET_VERSION
+        and len(data) >= _FERNET_OVERHEAD + _FERNET_BLOCK
+        and (len(data) - _FERNET_OVERHEAD) % _FERNET_BLOCK == 0
+    )
+
+
+def classify(value: str | None) -> str:
+    """
+    Classify a stored value by its envelope, without decrypting it.
+
+    Returns one of CATEGORIES.
+    """
+    if value is None:
+        return NULL
+    if not value:
+        return EMPTY
+
+    if value.startswith(ENCRYPTED_PREFIX):
+        encoded = value[len(ENCRYPTED_PREFIX):]
+        if not _B64.fullmatch(encoded) or len(encoded) % 4:
+            return HC1_MALFORMED
+        packed = base64.b64decode(encoded)
+        if len(packed) >= MIN_PACKED_LENGTH and packed[0] == VERSION_GCM:
+            return HC1
+        # Deterministic (AES-SIV) values count as hc1 as well
+        if len(packed) >= MIN_SIV_PACKED_LENGTH and packed[0] == VERSION_SIV:
+            return HC1
+        return HC1_MALFORMED
+
+    if value.startswith("enc:"):
+        # club: "enc:" + urlsafe_b64(fernet token)
+        encoded = value[4:]
+        if not _B64_URL.fullmatch(encoded) or len(encoded) % 4:
+            return ENC_MALFORMED
+        try:
+            token = base64.urlsafe_b64decode(encoded).decode("ascii")
+        except (binascii.Error, ValueError):
+            return ENC_MALFORMED
+        return ENC if _is_fernet_token(token) else ENC_MALFORMED
+
+    if value.startswith(_FERNET_PREFIX):
+        return FERNET if _is_fernet_token(value) else FERNET_MALFORMED
+
+    if len(value) >= _AGENT_MIN_CHARS and len(value) % 4 == 0 and _B64.fullmatch(value):
+        return AGENT_GCM
+
+    return PLAINTEXT
+
+
+class AuditReport:
+    """
+    Streaming per-column audit counters.
+
+    Keeps counts per category and up to ``sample_size`` primary keys per
+    category, so memory does not grow with the number of rows.
+
+    Args:
+        sample_size: Primary keys kept per table/column/category
+    """
+
+    def __init__(self, sample_size: int = 10):
+        self._sample_size = sample_size
+        self._columns: dict[tuple[str, str], tuple[dict[str, int], dict[str, list]]] = {}
+
+    def _column(self, table: str, column: str) -> tuple[dict[str, int], dict[str, list]]:
+        key = (table, column)
+        entry = self._columns.get(key)
+        if entry is None:
+            entry = (dict.fromkeys(CATEGORIES, 0), {})
+            self._columns[key] = entry
+        return entry
+
+    def add(self, table: str, column: str, pk, value: str | None) -> str:
+        """Classify one value and account for it. Returns the category."""
+        category = classify(value)
+        counts, samples = self._column(table, column)
+        counts[category] += 1
+        if category not in _NOT_SAMPLED:
+            pks = samples.setdefault(category, [])
+            if len(pks) < self._sample_size:
+                pks.append(pk)
+        return category
+
+    def scan_rows(self, rows: Iterable[tuple], table: str, columns: list[str]) -> None:
+        """Audit (pk, value1, value2, ...) tuples for the given columns."""
+        entries = [self._column(table, column) for column in columns]
+        sample_size = self._sample_size
+        for pk, *values in rows:
+            for (counts, samples), value in zip(entries, values, strict=True):
+                category = classify(value)
+                counts[category] += 1
+                if category in _NOT_SAMPLED:
+                    continue
+                pks = samples.setdefault(category, [])
+                if len(pks) < sample_size:
+                    pks.append(pk)
+
+    def scan_cursor(
+        self,
+        cursor,
+        table: str,
+        columns: list[str],
+        batch_size: int = 10_000,
+    ) -> None:
+        """
+        Audit an executed DB cursor.
+
+        The cursor must select the primary key followed by ``columns``.
+        """
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            self.scan_rows(rows, table, columns)
+
+    def scan_csv(self, fp: IO[str], table: str, pk_column: str, columns: list[str]) -> None:
+        """Audit a CSV dump with a header row. Empty cells count as empty."""
+        reader = csv.DictReader(fp)
+        self.scan_rows(
+            ((row[pk_column], *(row[column] for column in columns)) for row in reader),
+            table,
+            columns,
+        )
+
+    def scan_jsonl(self, fp: IO[str], table: str, pk_column: str, columns: list[str]) -> None:
+        """Audit a JSON Lines dump (one object per line)."""
+        loads = json.loads
+        self.scan_rows(
+            (
+                (record.get(pk_column), *(record.get(column) for column in columns))
+                for record in map(loads, filter(str.strip, fp))
+            ),
+            table,
+            columns,
+        )
+
+    @property
+    def malformed(self) -> int:
+        """Total number of malformed envelopes across all columns."""
+        return sum(
+            counts[category]
+            for counts, _ in self._columns.values()
+            for category in MALFORMED
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Compact report: {table: {column: {"total", "counts", "samples"}}}.
+
+        Categories with a zero count are omitted.
+        """
+        result: dict = {}
+        for (table, column), (counts, samples) in self._columns.items():
+            result.setdefault(table, {})[column] = {
+                "total": sum(counts.values()),
+                "counts": {category: n for category, n in counts.items() if n},
+                "samples": {category: list(pks) for category, pks in samples.items()},
+            }
+        return result
@@ -0,0 +1,288 @@
+"""
+Micro-benchmarks for the core primitives.
+
+Covers encrypt/decrypt for payloads from 10 B to 1 MB, blind_index,
+cold and warm key derivation, the single and batch paths, and the log
+redaction filter on lines with and without PII. Results are
+JSON with ops/sec, latency percentiles and bytes/sec per case.
+
+Usage:
+    python -m housler_crypto.bench run --output baseline.json
+    python -m housler_crypto.bench run --compare baseline.json --threshold 0.15
+    python -m housler_crypto.bench compare baseline.json current.json
+
+``compare`` (and ``run --compare``) exits with status 1 when any case is
+slower than the baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from .core import HouslerCrypto
+
+PAYLOAD_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BATCH_SIZE = 1000
+BATCH_PAYLOAD_SIZES = (10, 100, 1_000)
+
+_BENCH_KEY = "0f" * 32
+
+
+def _percentile(sorted_values: list[int], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index] / 1000  # ns -> us
+
+
+def measure(
+    func: Callable[[], object],
+    ops_per_call: int = 1,
+    bytes_per_call: int = 0,
+    min_time: float = 0.2,
+    min_rounds: int = 5,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    """
+    Time repeated calls of ``func``.
+
+    Runs for at least ``min_time`` seconds and ``min_rounds`` calls.
+    ``setup`` runs before every call and is not timed.
+    """
+    perf_counter_ns = time.perf_counter_ns
+    timings: list[int] = []
+    deadline = time.perf_counter() + min_time
+
+    while len(timings) < min_rounds or time.perf_counter() < deadline:
+        if setup is not None:
+            setup()
+        start = perf_counter_ns()
+        func()
+        timings.append(perf_counter_ns() - start)
+
+    total_seconds = sum(timings) / 1e9
+    timings.sort()
+    calls_per_sec = len(timings) / total_seconds if total_seconds else float("inf")
+
+    return {
+        "rounds": len(timings),
+        "ops_per_sec": calls_per_sec * ops_per_call,
+        "bytes_per_sec": calls_per_sec * bytes_per_call,
+        "p50_us": _percentile(timings, 0.50),
+        "p90_us": _percentile(timings, 0.90),
+        "p99_us": _percentile(timings, 0.99),
+    }
+
+
+def _payload(size: int) -> str:
+    # ASCII, so the size in characters is the size in bytes
+    return ("user@example.com;" * (size // 17 + 1))[:size]
+
+
+def run_benchmarks(
+    min_time: float = 0.2,
+    sizes: tuple[int, ...] = PAYLOAD_SIZES,
+    batch_size: int = BATCH_SIZE,
+    iterations: int = 100_000,
+) -> dict:
+    """
+    Run every case and return the JSON-serializable result.
+
+    Args:
+        min_time: Seconds spent per case
+        sizes: Payload sizes for the single-value cases
+        batch_size: Values per call in the batch cases
+        iterations: PBKDF2 iterations (the library default)
+    """
+    crypto = HouslerCrypto(master_key=_BENCH_KEY, iterations=iterations)
+    results: dict[str, dict] = {}
+
+    def cold_reset() -> None:
+        crypto._key_cache.clear()
+
+    results["derive_key.cold"] = measure(
+        lambda: crypto._derive_key("email"), min_time=min_time, setup=cold_reset,
+    )
+    crypto._derive_key("email")
+    results["derive_key.warm"] = measure(lambda: crypto._derive_key("email"), min_time=min_time)
+
+    for size in sizes:
+        plaintext = _payload(size)
+        ciphertext = crypto.encrypt(plaintext, field="email")
+        results[f"encrypt.{size}"] = measure(
+            lambda p=plaintext: crypto.encrypt(p, field="email"),
+            bytes_per_call=size, min_time=min_time,
+        )
+        results[f"decrypt.{size}"] = measure(
+            lambda c=ciphertext: crypto.decrypt(c, field="email"),
+            bytes_per_call=size, min_time=min_time,
+        )
+
+    for size in (s for s in sizes if s in BATCH_PAYLOAD_SIZES):
+        plaintexts = [_payload(size)] * batch_size
+        ciphertexts = crypto.encrypt_many(plaintexts, field="email")
+        results[f"encrypt_many.{size}"] = measure(
+            lambda p=plaintexts: crypto.encrypt_many(p, field="email"),
+            ops_per_call=batch_size, bytes_per_call=size * batch_size, min_time=min_time,
+        )
+        results[f"decrypt_many.{size}"] = measure(
+            lambda c=ciphertexts: crypto.decrypt_many(c, field="email"),
+            ops_per_call=batch_size, bytes_per_call=size * batch_size, min_time=min_time,
+        )
+
+    email = "User@Example.com"
+    results["blind_index"] = measure(
+        lambda: crypto.blind_index(email, field="email"),
+        bytes_per_call=len(email), min_time=min_time,
+    )
+    emails = [email] * batch_size
+    results["blind_index_many"] = measure(
+        lambda: crypto.blind_index_many(emails, field="email"),
+        ops_per_call=batch_size, bytes_per_call=len(email) * batch_size, min_time=min_time,
+    )
+
+    results.update(_redact_benchmarks(min_time, batch_size))
+
+    return {
+        "meta": _metadata(iterations),
+        "results": results,
+    }
+
+
+def _redact_benchmarks(min_time: float, batch_size: int) -> dict[str, dict]:
+    """PIIRedactingFilter on log records, one record per op."""
+    import logging
+
+    from .redact import PIIRedactingFilter
+
+    redacting_filter = PIIRedactingFilter()
+    lines = {
+        "redact.clean": ("Processed batch %d in %.2f ms for tenant %s", (12, 3.4, "acme")),
+        "redact.pii": ("User %s logged in from %s", ("user@example.com", "+7 (999) 123-45-67")),
+    }
+
+    results = {}
+    for name, (msg, args) in lines.items():
+        records: list[logging.LogRecord] = []
+
+        def make_records(msg=msg, args=args, records=records) -> None:
+            records[:] = [
+                logging.LogRecord("bench", logging.INFO, __file__, 0, msg, args, None)
+                for _ in range(batch_size)
+            ]
+
+        def run_filter(records=records) -> None:
+            for record in records:
+                redacting_filter.filter(record)
+
+        results[name] = measure(
+            run_filter, ops_per_call=batch_size, min_time=min_time, setup=make_records,
+        )
+    return results
+
+
+def _metadata(iterations: int) -> dict:
+    try:
+        from cryptography import __version__ as cryptography_version
+    except ImportError:  # pragma: no cover
+        cryptography_version = "unknown"
+
+    from . import __version__
+
+    return {
+        "housler_crypto": __version__,
+        "cryptography": cryptography_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    """
+    Find cases whose throughput dropped by more than ``threshold``.
+
+    Cases missing from either run are ignored. Returns one entry per
+    regression with both ops/sec values and the relative change.
+    """
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = current.get("results", {}).get(name)
+        if cur is None or not base.get("ops_per_sec"):
+            continue
+        change = cur["ops_per_sec"] / base["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append({
+                "case": name,
+                "baseline_ops_per_sec": base["ops_per_sec"],
+                "current_ops_per_sec": cur["ops_per_sec"],
+                "change": change,
+            })
+    return regressions
+
+
+def _report_regressions(regressions: list[dict], threshold: float) -> int:
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}", file=sys.stderr)
+        return 0
+    for r in regressions:
+        print(
+            f"REGRESSION {r['case']}: {r['baseline_ops_per_sec']:.0f} -> "
+            f"{r['current_ops_per_sec']:.0f} ops/sec ({r['change']:+.1%})",
+            file=sys.stderr,
+        )
+    return 1
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m housler_crypto.bench",
+        description="Benchmark housler-crypto primitives",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run the benchmarks and print JSON")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds per case")
+    run_parser.add_argument("--quick", action="store_true", help="payloads up to 10 KB only")
+    run_parser.add_argument("--output", help="write JSON here instead of stdout")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="fail on regression vs BASELINE")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    cmp_parser = sub.add_parser("compare", help="compare two result files")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    cmp_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+        return _report_regressions(regressions, args.threshold)
+
+    sizes = tuple(s for s in PAYLOAD_SIZES if s <= 10_000) if args.quick else PAYLOAD_SIZES
+    result = run_benchmarks(min_time=args.min_time, sizes=sizes)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(_load(args.compare), result, args.threshold)
+        return _report_regressions(regressions, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+End-to-end migration benchmark on synthetic SQLite datasets.
+
+Generates a legacy-encrypted ``users`` table (email, phone, name) in one of
+the supported source formats, then runs migrate_database_fields() with
+different batch sizes and modes on fresh copies of it. For every run it
+records rows/sec, peak RSS and the time spent per phase (count, read,
+write, commit, crypto), and projects the duration for 1M/10M/50M rows.
+Crypto is the time spent in FernetMigrator.migrate(); pipelined runs sum
+it over their crypto threads, so it can exceed the wall-clock time.
+
+A dataset kept with ``--db`` is only reused if it has the requested number
+of rows and is still in the legacy format, i.e. was not migrated in place.
+
+Everything runs offline against local SQLite files, so pagination and
+write-path changes can be measured reproducibly.
+
+Formats:
+    lk     - single Fernet key (FernetMigrator.from_lk_config)
+    club   - per-field Fernet keys, "enc:" wrapped (from_club_config)
+    agent  - raw AES-256-GCM (from_agent_config)
+
+Usage:
+    python -m housler_crypto.bench_migration --rows 1000000 --format club \\
+        --batch-sizes 500,1000,5000 --workers 0,4 --output club.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from .audit import AGENT_GCM, ENC, FERNET, classify
+from .core import HouslerCrypto
+from .migration import FernetMigrator, migrate_database_fields
+
+FORMATS = ("lk", "club", "agent")
+COLUMNS = {"email": "email", "phone": "phone", "name": "name"}
+PROJECTED_ROWS = (1_000_000, 10_000_000, 50_000_000)
+# audit.classify() category of the values of each format
+_CATEGORIES = {"lk": FERNET, "club": ENC, "agent": AGENT_GCM}
+
+# Synthetic keys - never use outside of benchmarks
+_NEW_KEY = "1a" * 32
+_LEGACY_KEY = "2b" * 32
+_LK_SALT = "bench_lk_salt"
+_CLUB_SALT = "vas3k_club_pii_salt_v1"
+
+
+def _legacy_migrator(source_format: str) -> FernetMigrator:
+    if source_format == "lk":
+        return FernetMigrator.from_lk_config(_LEGACY_KEY, _LK_SALT)
+    if source_format == "club":
+        return FernetMigrator.from_club_config(_LEGACY_KEY, salt=_CLUB_SALT)
+    if source_format == "agent":
+        return FernetMigrator.from_agent_config(_LEGACY_KEY)
+    raise ValueError(f"Unknown format: {source_format}")
+
+
+def _legacy_encryptor(source_format: str):
+    """Return encrypt(value, field) producing values in the legacy format."""
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    def fernet_for(salt: bytes) -> Fernet:
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100_000)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(bytes.fromhex(_LEGACY_KEY))))
+
+    if source_format == "lk":
+        fernet = fernet_for(_LK_SALT.encode("utf-8"))
+        return lambda value, field: fernet.encrypt(value.encode("utf-8")).decode("utf-8")
+
+    if source_format == "club":
+        fernets: dict[str, Fernet] = {}
+
+        def encrypt_club(value: str, field: str) -> str:
+            if field not in fernets:
+                fernets[field] = fernet_for(_CLUB_SALT.encode("utf-8") + field.encode("utf-8"))
+            token = fernets[field].encrypt(value.encode("utf-8"))
+            return "enc:" + base64.urlsafe_b64encode(token).decode("ascii")
+
+        return encrypt_club
+
+    if source_format == "agent":
+        aesgcm = AESGCM(bytes.fromhex(_LEGACY_KEY))
+
+        def encrypt_agent(value: str, field: str) -> str:
+            iv = os.urandom(16)
+            sealed = aesgcm.encrypt(iv, value.encode("utf-8"), None)
+            return base64.b64encode(iv + sealed[-16:] + sealed[:-16]).decode("ascii")
+
+        return encrypt_agent
+
+    raise ValueError(f"Unknown format: {source_format}")
+
+
+def generate_dataset(
+    path: str,
+    rows: int,
+    source_format: str,
+    distinct: int = 10_000,
+    chunk_size: int = 10_000,
+) -> float:
+    """
+    Create a legacy-encrypted users table at ``path``.
+
+    Only ``distinct`` values per column are actually encrypted and then
+    reused, so generating tens of millions of rows stays fast; the
+    migration still decrypts and re-encrypts every row.
+
+    Returns the generation time in seconds.
+    """
+    start = time.perf_counter()
+    encrypt = _legacy_encryptor(source_format)
+    pool_size = max(1, min(distinct, rows))
+    pool = [
+        (
+            encrypt(f"user{i}@example.com", "email"),
+            encrypt(f"+7999{i:07d}", "phone"),
+            encrypt(f"Иван{i} Иванов", "name"),
+        )
+        for i in range(pool_size)
+    ]
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("DROP TABLE IF EXISTS users")
+        conn.execute(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, phone TEXT, name TEXT)"
+        )
+        for chunk_start in range(0, rows, chunk_size):
+            conn.executemany(
+                "INSERT INTO users VALUES (?, ?, ?, ?)",
+                (
+                    (pk + 1, *pool[pk % pool_size])
+                    for pk in range(chunk_start, min(rows, chunk_start + chunk_size))
+                ),
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+    return time.perf_counter() - start
+
+
+def check_dataset(path: str, rows: int, source_format: str, sample_size: int = 1000) -> None:
+    """
+    Refuse to reuse a dataset that does not match the requested run.
+
+    Checks the row count, then classifies the first and last
+    ``sample_size`` rows by primary key, which catches both a partial and a
+    complete migration.
+
+    Raises:
+        ValueError: If the users table is missing, has another row count
+            or holds values that are not in the requested legacy format
+    """
+    expected = _CATEGORIES[source_format]
+    columns = ", ".join(COLUMNS)
+    conn = sqlite3.connect(path)
+    try:
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{path} is not a benchmark dataset: {e}") from e
+        if count != rows:
+            raise ValueError(f"{path} has {count} rows, expected {rows}; use another --db path")
+
+        for order in ("ASC", "DESC"):
+            cursor = conn.execute(
+                f"SELECT id, {columns} FROM users ORDER BY id {order} LIMIT ?", (sample_size,)
+            )
+            for pk, *values in cursor:
+                for column, value in zip(COLUMNS, values, strict=True):
+                    category = classify(value)
+                    if category != expected:
+                        raise ValueError(
+                            f"{path}: users.{column} (id={pk}) is {category}, expected "
+                            f"{expected} values of the {source_format} format; "
+                            f"use another --db path"
+                        )
+    finally:
+        conn.close()
+
+
+class _TimedCursor:
+    """Cursor proxy that accumulates time spent in the database driver."""
+
+    def __init__(self, cursor, phases: dict):
+        self._cursor = cursor
+        self._phases = phases
+
+    def _timed(self, phase: str, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._phases[phase] = self._phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def execute(self, sql, params=()):
+        if sql.startswith("SELECT COUNT"):
+            phase = "count"
+        elif sql.startswith("SELECT"):
+            phase = "read"
+        else:
+            phase = "write"
+        return self._timed(phase, self._cursor.execute, sql, params)
+
+    def executemany(self, sql, params):
+        return self._timed("write", self._cursor.executemany, sql, params)
+
+    def fetchone(self):
+        return self._timed("count", self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._timed("read", self._cursor.fetchall)
+
+
+class _TimedConnection:
+    """Connection proxy handing out timed cursors."""
+
+    def __init__(self, connection, phases: dict):
+        self._connection = connection
+        self.phases = phases
+
+    def cursor(self):
+        return _TimedCursor(self._connection.cursor(), self.phases)
+
+    def commit(self):
+        start = time.perf_counter()
+        self._connection.commit()
+        self.phases["commit"] = self.phases.get("commit", 0.0) + time.perf_counter() - start
+
+
+class _TimedMigrator:
+    """Migrator proxy that accumulates time spent in migrate(), from any thread."""
+
+    def __init__(self, migrator: FernetMigrator):
+        self._migrator = migrator
+        self._lock = threading.Lock()
+        self.seconds = 0.0
+
+    def migrate(self, old_ciphertext: str, field: str, new_crypto: HouslerCrypto) -> str:
+        start = time.perf_counter()
+        try:
+            return self._migrator.migrate(old_ciphertext, field, new_crypto)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.seconds += elapsed
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_scenario(
+    path: str,
+    source_format: str,
+    batch_size: int,
+    workers: int | None = None,
+    columns: dict[str, str] | None = None,
+) -> dict:
+    """
+    Migrate the dataset at ``path`` once and return timings.
+
+    ``path`` is modified; run it on a copy of the generated dataset.
+    """
+    columns = columns or COLUMNS
+    migrator = _legacy_migrator(source_format)
+    new_crypto = HouslerCrypto(master_key=_NEW_KEY)
+
+    # Derive keys up front so the first batch is not charged for PBKDF2
+    for field in columns.values():
+        new_crypto._derive_key(field)
+        migrator._get_fernet_for_field(field)
+
+    timed_migrator = _TimedMigrator(migrator)
+    phases: dict[str, float] = {}
+    read_phases: dict[str, float] = {}
+    connection = sqlite3.connect(path, check_same_thread=False)
+    read_connection = sqlite3.connect(path, check_same_thread=False) if workers else None
+
+    try:
+        start = time.perf_counter()
+        stats = migrate_database_fields(
+            _TimedConnection(connection, phases),
+            "users",
+            "id",
+            columns,
+            timed_migrator,
+            new_crypto,
+            batch_size=batch_size,
+            dry_run=False,
+            placeholder="?",
+            workers=workers,
+            read_connection=(
+                _TimedConnection(read_connection, read_phases) if read_connection else None
+            ),
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        connection.close()
+        if read_connection is not None:
+            read_connection.close()
+
+    for phase, seconds in read_phases.items():
+        phases[phase] = phases.get(phase, 0.0) + seconds
+    phases["crypto"] = timed_migrator.seconds
+
+    rows_per_sec = stats["rows"] / elapsed if elapsed else 0.0
+    return {
+        "format": source_format,
+        "batch_size": batch_size,
+        "workers": workers or 0,
+        "columns": len(columns),
+        "rows": stats["rows"],
+        "seconds": elapsed,
+        "rows_per_sec": rows_per_sec,
+        "peak_rss_kb": _peak_rss_kb(),
+        "phases": {phase: round(seconds, 4) for phase, seconds in sorted(phases.items())},
+        "projected_seconds": {
+            str(n): (n / rows_per_sec if rows_per_sec else None) for n in PROJECTED_ROWS
+        },
+        "migrated": stats["migrated"],
+        "errors": stats["errors"],
+    }
+
+
+def run_benchmark(
+    rows: int,
+    source_format: str,
+    batch_sizes: tuple[int, ...] = (1000,),
+    workers: tuple[int, ...] = (0,),
+    db_path: str | None = None,
+    distinct: int = 10_000,
+    isolate: bool = True,
+) -> dict:
+    """
+    Generate (or reuse) a dataset and run every batch size / worker combination.
+
+    Args:
+        rows: Number of rows in the synthetic table
+        source_format: "lk", "club" or "agent"
+        batch_sizes: Batch sizes to try
+        workers: Worker counts to try (0 = sequential mode)
+        db_path: Pristine dataset location; reused if it already exists and
+            passes check_dataset()
+        distinct: Distinct encrypted values per column in the dataset
+        isolate: Run each scenario in a fresh process so peak RSS is per run
+
+    Returns:
+        JSON-serializable result with one entry per run
+
+    Raises:
+        ValueError: On an unknown format or a dataset that cannot be reused
+    """
+    if source_format not in FORMATS:
+        raise ValueError(f"Unknown format: {source_format}")
+
+    workdir = tempfile.mkdtemp(prefix="hc-migration-bench-")
+    try:
+        generate_seconds = None
+        if db_path is None:
+            db_path = os.path.join(workdir, "pristine.db")
+        if os.path.exists(db_path):
+            check_dataset(db_path, rows, source_format)
+        else:
+            generate_seconds = generate_dataset(db_path, rows, source_format, distinct)
+
+        runs = []
+        for batch_size in batch_sizes:
+            for worker_count in workers:
+                copy = os.path.join(workdir, "run.db")
+                shutil.copyfile(db_path, copy)
+                args = (copy, source_format, batch_size, worker_count or None)
+                if isolate:
+                    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                        runs.append(pool.submit(run_scenario, *args).result())
+                else:
+                    runs.append(run_scenario(*args))
+                os.remove(copy)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "dataset": {
+            "rows": rows,
+            "format": source_format,
+            "distinct": distinct,
+            "generate_seconds": generate_seconds,
+        },
+        "runs": runs,
+    }
+
+
+def _int_list(value: str) -> tuple[int, ...]:
+    return tuple(int(item) for item in value.split(",") if item)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m housler_crypto.bench_migration",
+        description="Benchmark migrate_database_fields on synthetic SQLite data",
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=FORMATS, default="lk")
+    parser.add_argument("--batch-sizes", type=_int_list, default=(1000,))
+    parser.add_argument("--workers", type=_int_list, default=(0,), help="0 = sequential")
+    parser.add_argument("--distinct", type=int, default=10_000)
+    parser.add_argument("--db", help="pristine dataset path (generated if missing)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_benchmark(
+            args.rows,
+            args.format,
+            batch_sizes=args.batch_sizes,
+            workers=args.workers,
+            db_path=args.db,
+            distinct=args.distinct,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
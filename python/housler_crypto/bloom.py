@@ -0,0 +1,212 @@
+"""
+Bloom filters over blind indexes.
+
+Answers "is this email already registered?" without a database query for
+the common case of a new value: a negative answer is certain, a positive
+one is checked in the database. Bit positions come from the keyed blind
+index digest, so the filter can be built from an existing hash column
+without plaintext, and a leaked blob cannot be probed without the master
+key.
+
+Usage:
+    from housler_crypto.bloom import BloomFilter
+
+    emails = BloomFilter(crypto, capacity=1_000_000, error_rate=0.001)
+    emails.add_hashes(row[0] for row in cursor.execute("SELECT email_hash FROM users"))
+
+    if emails.might_contain("new@example.com", field="email"):
+        ...  # query the database to be sure
+    emails.add("new@example.com", field="email")
+
+    blob = emails.to_bytes()
+    emails = BloomFilter.from_bytes(crypto, blob)
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+import struct
+from collections.abc import Iterable
+
+from .core import BLIND_INDEX_ENCODINGS, BLIND_INDEX_SIZE, HouslerCrypto, _blind_index_encoder
+
+# Blob layout: header, then the bit array
+_MAGIC = b"HCBF"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBBBxQQ")
+
+_MAX_HASH_COUNT = 32
+
+
+class BloomFilter:
+    """
+    Bloom filter of blind indexes.
+
+    Sized for ``capacity`` values at ``error_rate`` false positives; more
+    values raise the rate (see estimated_error_rate()). Values are
+    normalized like blind_index() (lowercase, strip), and the filter only
+    matches blind indexes of the same ``digest_size``.
+
+    Args:
+        crypto: HouslerCrypto instance
+        capacity: Expected number of values
+        error_rate: False positive rate at capacity (0 < rate < 1)
+        digest_size: Blind index digest size the hashes use (8..32)
+
+    Raises:
+        ValueError: On a non-positive capacity or a rate outside (0, 1)
+    """
+
+    def __init__(
+        self,
+        crypto: HouslerCrypto,
+        capacity: int,
+        error_rate: float = 0.01,
+        digest_size: int = BLIND_INDEX_SIZE,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        _blind_index_encoder(digest_size, "raw")
+
+        # Optimal size and hash count: m = -n ln p / ln(2)^2, k = m / n ln 2
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hash_count = round(bits / capacity * math.log(2))
+        self._setup(crypto, -(-bits // 8) * 8, min(max(hash_count, 1), _MAX_HASH_COUNT), digest_size)
+
+    def _setup(self, crypto: HouslerCrypto, bit_count: int, hash_count: int, digest_size: int) -> None:
+        self._crypto = crypto
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.digest_size = digest_size
+        self.count = 0
+        self._bits = bytearray(bit_count // 8)
+
+    def __len__(self) -> int:
+        """Number of insertions (repeated values count again)."""
+        return self.count
+
+    def _positions(self, digest: bytes) -> list[int]:
+        # Double hashing over the two halves of the keyed digest
+        half = len(digest) // 2
+        h1 = int.from_bytes(digest[:half], "little")
+        h2 = int.from_bytes(digest[half:], "little") | 1
+        m = self.bit_count
+        return [(h1 + i * h2) % m for i in range(self.hash_count)]
+
+    def _add_digest(self, digest: bytes) -> None:
+        bits = self._bits
+        for position in self._positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def _has_digest(self, digest: bytes) -> bool:
+        bits = self._bits
+        for position in self._positions(digest):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _digest(self, value: str, field: str) -> bytes:
+        return self._crypto.blind_index(value, field, digest_size=self.digest_size, encoding="raw")
+
+    def add(self, value: str, field: str = "default") -> None:
+        """Insert a plaintext value; empty values are ignored."""
+        if value:
+            self._add_digest(self._digest(value, field))
+
+    def add_many(self, values: Iterable[str], field: str = "default") -> None:
+        """Insert a batch of plaintext values of one field."""
+        add = self._add_digest
+        digests = self._crypto.blind_index_many(
+            values, field, digest_size=self.digest_size, encoding="raw",
+        )
+        for digest in digests:
+            if digest:
+                add(digest)
+
+    def add_hashes(self, hashes: Iterable[str | bytes], encoding: str = "hex") -> None:
+        """
+        Insert stored blind indexes, e.g. read from an index column.
+
+        Raises:
+            ValueError: If a hash has another digest size or encoding
+        """
+        add = self._add_digest
+        for value in hashes:
+            if value:
+                add(self._decode(value, encoding))
+
+    def might_contain(self, value: str, field: str = "default") -> bool:
+        """
+        False if the value was never added; True if it probably was.
+
+        Empty values are never contained.
+        """
+        if not value:
+            return False
+        return self._has_digest(self._digest(value, field))
+
+    def might_contain_many(self, values: Iterable[str], field: str = "default") -> list[bool]:
+        """might_contain() for a batch of values of one field."""
+        has = self._has_digest
+        digests = self._crypto.blind_index_many(
+            values, field, digest_size=self.digest_size, encoding="raw",
+        )
+        return [bool(digest) and has(digest) for digest in digests]
+
+    def might_contain_hash(self, value: str | bytes, encoding: str = "hex") -> bool:
+        """might_contain() for a stored blind index."""
+        return bool(value) and self._has_digest(self._decode(value, encoding))
+
+    def _decode(self, value: str | bytes, encoding: str) -> bytes:
+        if encoding == "hex":
+            digest = bytes.fromhex(value)
+        elif encoding == "base64url":
+            digest = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        elif encoding == "raw":
+            digest = bytes(value)
+        else:
+            raise ValueError(f"Unknown encoding {encoding!r}, expected one of {BLIND_INDEX_ENCODINGS}")
+        if len(digest) != self.digest_size:
+            raise ValueError(f"Expected a {self.digest_size}-byte blind index, got {len(digest)} bytes")
+        return digest
+
+    def estimated_error_rate(self) -> float:
+        """False positive rate for the current number of insertions."""
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filter: a 24-byte header and the bit array."""
+        header = _HEADER.pack(
+            _MAGIC, _FORMAT_VERSION, self.hash_count, self.digest_size, self.bit_count, self.count,
+        )
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, crypto: HouslerCrypto, blob: bytes) -> BloomFilter:
+        """
+        Load a filter written by to_bytes().
+
+        ``crypto`` must use the master key the filter was built with.
+
+        Raises:
+            ValueError: If the blob is not a filter or is truncated
+        """
+        if len(blob) < _HEADER.size:
+            raise ValueError("Not a Bloom filter blob")
+        magic, version, hash_count, digest_size, bit_count, count = _HEADER.unpack_from(blob)
+        if magic != _MAGIC:
+            raise ValueError("Not a Bloom filter blob")
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported Bloom filter version: {version}")
+        if len(blob) != _HEADER.size + bit_count // 8 or bit_count % 8 or not bit_count:
+            raise ValueError("Bloom filter blob is truncated or corrupt")
+
+        bloom = cls.__new__(cls)
+        bloom._setup(crypto, bit_count, hash_count, digest_size)
+        bloom._bits[:] = blob[_HEADER.size:]
+        bloom.count = count
+        return bloom
@@ -0,0 +1,338 @@
+"""
+Command line tool for encrypting, decrypting, masking and auditing columns
+of CSV and JSON Lines files.
+
+Input is streamed in batches, so memory use does not depend on file size.
+With ``--workers N`` batches are processed by N processes; output order
+always matches input order.
+
+The master key is read from HOUSLER_CRYPTO_KEY (HOUSLER_CRYPTO_SALT and
+HOUSLER_CRYPTO_ITERATIONS are honoured as well).
+
+Usage:
+    housler-crypto encrypt users.csv -o users.enc.csv \\
+        --field email --field phone --blind-index email
+    housler-crypto decrypt users.enc.jsonl --field email=email --workers 4
+    housler-crypto mask users.csv --field email=email --field full_name=name
+    housler-crypto audit users.enc.csv --pk id --field email --field phone
+
+``--field COLUMN[=NAME]`` selects a column; NAME is the key derivation
+field (encrypt/decrypt) or the mask kind (mask) and defaults to COLUMN.
+``--blind-index COLUMN[=OUTPUT]`` adds a blind index of the plaintext in
+OUTPUT (default ``<COLUMN>_hash``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import operator
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from typing import IO
+
+from .utils import batched, mask, ordered_pool_map
+
+MASK_KINDS = ("email", "phone", "name", "inn", "card")
+BATCH_SIZE = 1000
+
+class _Transform:
+    """
+    Column operations applied to a batch of rows.
+
+    Rows are lists (CSV, addressed by column index) or dicts (JSONL,
+    addressed by key). ``plan`` is a list of (operation, key, name, output).
+    """
+
+    def __init__(self, plan: list[tuple], crypto_args: tuple | None = None):
+        self._plan = plan
+        self._crypto = None
+        if crypto_args is not None:
+            from .core import HouslerCrypto
+
+            master_key, salt, iterations = crypto_args
+            self._crypto = HouslerCrypto(master_key, salt=salt, iterations=iterations)
+
+    def __call__(self, rows: list) -> list:
+        if not rows:
+            return rows
+        get = dict.get if isinstance(rows[0], dict) else operator.getitem
+        crypto = self._crypto
+
+        for operation, key, name, output in self._plan:
+            indexes = []
+            values = []
+            for i, row in enumerate(rows):
+                value = get(row, key)
+                if value is not None:
+                    indexes.append(i)
+                    values.append(value if isinstance(value, str) else str(value))
+
+            if operation == "encrypt":
+                results = crypto.encrypt_many(values, field=name)
+            elif operation == "decrypt":
+                results = crypto.decrypt_many(values, field=name)
+            elif operation == "blind_index":
+                results = crypto.blind_index_many(values, field=name)
+            else:
+                mask_value = getattr(mask, name)
+                results = [mask_value(value) for value in values]
+
+            for i, result in zip(indexes, results, strict=True):
+                rows[i][output] = result
+
+        return rows
+
+
+def _map_batches(
+    batches: Iterable[list],
+    plan: list[tuple],
+    crypto_args: tuple | None,
+    workers: int,
+) -> Iterator[list]:
+    """Transform batches in order, in this process or in a process pool."""
+    # Each worker builds its own _Transform (and derives keys) once
+    return ordered_pool_map(_Transform.__call__, batches, workers, _Transform, (plan, crypto_args))
+
+
+def parse_columns(specs: list[str]) -> list[tuple[str, str]]:
+    """
+    Parse ``COLUMN[=NAME]`` options into (column, name) pairs.
+
+    Raises:
+        ValueError: If a spec has an empty column or name
+    """
+    result = []
+    for spec in specs:
+        column, sep, name = spec.partition("=")
+        if not column or (sep and not name):
+            raise ValueError(f"Invalid column spec: {spec!r}")
+        result.append((column, name or column))
+    return result
+
+
+def build_plan(
+    command: str,
+    fields: list[tuple[str, str]],
+    blind_indexes: list[tuple[str, str]] = (),
+) -> list[tuple]:
+    """
+    Column operations for a command, as (operation, column, name, output).
+
+    Blind indexes are computed before encryption, from the plaintext, with
+    the key derivation field of their column if it is also encrypted.
+
+    Raises:
+        ValueError: On an unknown mask kind or blind indexes outside encrypt
+    """
+    if blind_indexes and command != "encrypt":
+        raise ValueError("--blind-index is only supported by encrypt")
+
+    plan = []
+    field_of = dict(fields)
+    for column, output in blind_indexes:
+        output = output if output != column else f"{column}_hash"
+        plan.append(("blind_index", column, field_of.get(column, column), output))
+
+    for column, name in fields:
+        if command == "mask" and name not in MASK_KINDS:
+            raise ValueError(f"Unknown mask kind {name!r}, expected one of {MASK_KINDS}")
+        plan.append((command, column, name, column))
+    return plan
+
+
+def _csv_batches(
+    reader: Iterator[list[str]],
+    header: list[str],
+    plan: list[tuple],
+    batch_size: int,
+) -> tuple[list[str], list[tuple], Iterator[list]]:
+    """Resolve plan columns to indexes; rows are padded to the output width."""
+    header = list(header)
+    index_of = {column: i for i, column in enumerate(header)}
+    resolved = []
+    for operation, column, name, output in plan:
+        if column not in index_of:
+            raise ValueError(f"Column {column!r} not found in CSV header")
+        if output not in index_of:
+            index_of[output] = len(header)
+            header.append(output)
+        resolved.append((operation, index_of[column], name, index_of[output]))
+
+    width = len(header)
+
+    def rows() -> Iterator[list[str]]:
+        for row in reader:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            yield row
+
+    return header, resolved, batched(rows(), batch_size)
+
+
+def transform_csv(
+    fin: IO[str],
+    fout: IO[str],
+    plan: list[tuple],
+    crypto_args: tuple | None = None,
+    batch_size: int = BATCH_SIZE,
+    workers: int = 0,
+) -> int:
+    """Apply ``plan`` to a CSV stream with a header row. Returns rows written."""
+    reader = csv.reader(fin)
+    writer = csv.writer(fout, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        return 0
+
+    header, resolved, batches = _csv_batches(reader, header, plan, batch_size)
+    writer.writerow(header)
+
+    written = 0
+    for batch in _map_batches(batches, resolved, crypto_args, workers):
+        writer.writerows(batch)
+        written += len(batch)
+    return written
+
+
+def transform_jsonl(
+    fin: IO[str],
+    fout: IO[str],
+    plan: list[tuple],
+    crypto_args: tuple | None = None,
+    batch_size: int = BATCH_SIZE,
+    workers: int = 0,
+) -> int:
+    """Apply ``plan`` to a JSON Lines stream. Returns records written."""
+    records = map(json.loads, filter(str.strip, fin))
+    dumps = json.dumps
+
+    written = 0
+    for batch in _map_batches(batched(records, batch_size), plan, crypto_args, workers):
+        fout.writelines(dumps(record, ensure_ascii=False) + "\n" for record in batch)
+        written += len(batch)
+    return written
+
+
+def _crypto_args_from_env() -> tuple:
+    master_key = os.environ.get("HOUSLER_CRYPTO_KEY")
+    if not master_key:
+        raise ValueError("HOUSLER_CRYPTO_KEY is not set")
+    return (
+        master_key,
+        os.environ.get("HOUSLER_CRYPTO_SALT", "housler_crypto_v1"),
+        int(os.environ.get("HOUSLER_CRYPTO_ITERATIONS", "100000")),
+    )
+
+
+def _detect_format(path: str, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def _audit(args, fin: IO[str], fout: IO[str], fmt: str) -> None:
+    from .audit import AuditReport
+
+    columns = [column for column, _ in parse_columns(args.field)]
+    table = args.table or os.path.splitext(os.path.basename(args.input))[0]
+    report = AuditReport(sample_size=args.sample_size)
+    if fmt == "jsonl":
+        report.scan_jsonl(fin, table, args.pk, columns)
+    else:
+        report.scan_csv(fin, table, args.pk, columns)
+    fout.write(json.dumps(report.to_dict(), indent=2, ensure_ascii=False) + "\n")
+
+
+def _open_input(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdin
+    return open(path, encoding="utf-8", newline="")
+
+
+def _open_output(path: str | None) -> IO[str]:
+    if not path or path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="housler-crypto",
+        description="Encrypt, decrypt, mask or audit columns of CSV/JSONL files",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    helps = {
+        "encrypt": "encrypt columns (key from HOUSLER_CRYPTO_KEY)",
+        "decrypt": "decrypt columns (key from HOUSLER_CRYPTO_KEY)",
+        "mask": "mask columns for display or logs",
+        "audit": "report encryption coverage of columns as JSON",
+    }
+    for command, help_text in helps.items():
+        p = sub.add_parser(command, help=help_text)
+        p.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+        p.add_argument("-o", "--output", help="output file (default: stdout)")
+        p.add_argument("--format", choices=("csv", "jsonl"), help="default: from file extension, else csv")
+        p.add_argument(
+            "--field", action="append", default=[], required=True, metavar="COLUMN[=NAME]",
+            help="column to process; NAME is the key field or mask kind (default: COLUMN)",
+        )
+        if command == "audit":
+            p.add_argument("--pk", default="id", help="primary key column (default: id)")
+            p.add_argument("--table", help="table name in the report (default: file name)")
+            p.add_argument("--sample-size", type=int, default=10)
+            continue
+
+        if command == "encrypt":
+            p.add_argument(
+                "--blind-index", action="append", default=[], metavar="COLUMN[=OUTPUT]",
+                help="add a blind index of COLUMN (default OUTPUT: COLUMN_hash)",
+            )
+        p.add_argument("--workers", type=int, default=0, help="worker processes (default: none)")
+        p.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    fmt = _detect_format(args.input, args.format)
+
+    try:
+        if args.command != "audit":
+            plan = build_plan(
+                args.command,
+                parse_columns(args.field),
+                parse_columns(getattr(args, "blind_index", [])),
+            )
+            crypto_args = _crypto_args_from_env() if args.command != "mask" else None
+
+        fin = _open_input(args.input)
+        try:
+            fout = _open_output(args.output)
+            try:
+                if args.command == "audit":
+                    _audit(args, fin, fout, fmt)
+                else:
+                    transform = transform_jsonl if fmt == "jsonl" else transform_csv
+                    transform(fin, fout, plan, crypto_args, args.batch_size, args.workers)
+            finally:
+                if fout is not sys.stdout:
+                    fout.close()
+        finally:
+            if fin is not sys.stdin:
+                fin.close()
+
+    except (ValueError, KeyError, OSError) as e:
+        print(f"housler-crypto: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
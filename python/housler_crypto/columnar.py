@@ -0,0 +1,340 @@
+"""
+Column-at-a-time encryption for NumPy, pandas and Arrow data.
+
+``encrypt_column``, ``decrypt_column`` and ``blind_index_column`` take a
+NumPy array, a pandas Series or a pyarrow string array and return the same
+container type. Nulls (None, NaN, pd.NA, Arrow nulls) stay null; other
+values follow the rules of the batch methods of HouslerCrypto.
+
+Arrow input is read from and written to its string buffers directly, so no
+per-cell Python ``str`` objects are created. pandas Series backed by Arrow
+strings take the same path. Raw (bytes) blind indexes come back as Arrow
+binary arrays and object pandas Series.
+
+NumPy, pandas and pyarrow are optional (``pip install housler-crypto[columnar]``)
+and are only imported when a column of that type is passed in.
+
+Usage:
+    from housler_crypto.columnar import blind_index_column, encrypt_column
+
+    df["email_hash"] = blind_index_column(crypto, df["email"], field="email")
+    df["email"] = encrypt_column(crypto, df["email"], field="email")
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import os
+
+from .core import (
+    _PREFIX_BYTES,
+    BLIND_INDEX_SIZE,
+    IV_LENGTH,
+    HouslerCrypto,
+    _aesgcm,
+    _blind_index_encoder,
+    _blind_index_input,
+    _decryption_error,
+    _pack_bytes,
+)
+
+_INT32_MAX = 2**31 - 1
+
+# Blind index encodings straight to bytes, for Arrow buffers
+_BYTES_ENCODERS = {
+    "hex": binascii.hexlify,
+    "base64url": lambda digest: base64.urlsafe_b64encode(digest).rstrip(b"="),
+    "raw": lambda digest: digest,
+}
+
+
+def encrypt_column(crypto: HouslerCrypto, column, field: str = "default"):
+    """
+    Encrypt every value of a column.
+
+    Args:
+        crypto: HouslerCrypto instance
+        column: NumPy array, pandas Series or pyarrow (Chunked)Array of strings
+        field: Field name for key derivation
+
+    Returns:
+        Column of the same type with "hc1:" values
+
+    Raises:
+        TypeError: If the column type or a value type is not supported
+    """
+    return _apply(crypto, column, field, "encrypt")
+
+
+def decrypt_column(crypto: HouslerCrypto, column, field: str = "default"):
+    """
+    Decrypt every value of a column.
+
+    Values without the "hc1:" prefix pass through unchanged.
+
+    Raises:
+        TypeError: If the column type or a value type is not supported
+        ValueError: On the first value that fails to decrypt
+    """
+    return _apply(crypto, column, field, "decrypt")
+
+
+def blind_index_column(
+    crypto: HouslerCrypto,
+    column,
+    field: str = "default",
+    digest_size: int = BLIND_INDEX_SIZE,
+    encoding: str = "hex",
+):
+    """
+    Blind indexes for every value of a column, same as blind_index().
+
+    Args:
+        crypto: HouslerCrypto instance
+        column: NumPy array, pandas Series or pyarrow (Chunked)Array of strings
+        field: Field name for key derivation
+        digest_size: Digest size in bytes (8..32)
+        encoding: "hex", "base64url" (unpadded) or "raw" (bytes)
+
+    Raises:
+        TypeError: If the column type or a value type is not supported
+        ValueError: On an invalid digest size or encoding
+    """
+    _blind_index_encoder(digest_size, encoding)
+    return _apply(crypto, column, field, "blind_index", digest_size=digest_size, encoding=encoding)
+
+
+def _apply(crypto: HouslerCrypto, column, field: str, operation: str, **options):
+    module = type(column).__module__.partition(".")[0]
+
+    if module == "pyarrow":
+        return _apply_arrow(crypto, column, field, operation, **options)
+    if module == "pandas":
+        return _apply_pandas(crypto, column, field, operation, **options)
+    if module == "numpy":
+        return _apply_numpy(crypto, column, field, operation, **options)
+    raise TypeError(f"Unsupported column type: {type(column).__name__}")
+
+
+# ----------------------------------------------------------------------------
+# NumPy / pandas: object values through the HouslerCrypto batch methods
+# ----------------------------------------------------------------------------
+
+def _is_null(value) -> bool:
+    if value is None:
+        return True
+    try:
+        return bool(value != value)  # NaN, NaT
+    except TypeError:  # pd.NA
+        return True
+
+
+def _apply_values(
+    crypto: HouslerCrypto, values: list, field: str, operation: str, **options
+) -> list:
+    """Process the non-null values of a list; nulls are kept as they are."""
+    indexes = []
+    strings = []
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            indexes.append(i)
+            strings.append(value)
+        elif not _is_null(value):
+            raise TypeError(f"Expected str values, got {type(value).__name__}")
+
+    results = getattr(crypto, operation + "_many")(strings, field=field, **options)
+
+    output = list(values)
+    for i, result in zip(indexes, results, strict=True):
+        output[i] = result
+    return output
+
+
+def _apply_numpy(crypto: HouslerCrypto, column, field: str, operation: str, **options):
+    import numpy as np
+
+    if not isinstance(column, np.ndarray) or column.ndim != 1:
+        raise TypeError("Expected a one-dimensional NumPy array")
+
+    output = np.empty(len(column), dtype=object)
+    output[:] = _apply_values(crypto, column.tolist(), field, operation, **options)
+    return output
+
+
+def _apply_pandas(crypto: HouslerCrypto, column, field: str, operation: str, **options):
+    import pandas as pd
+
+    if not isinstance(column, pd.Series):
+        raise TypeError(f"Unsupported column type: {type(column).__name__}")
+
+    dtype = column.dtype
+    # Raw blind indexes are bytes, which string dtypes cannot hold
+    output_dtype = object if options.get("encoding") == "raw" else dtype
+    if isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow":
+        import pyarrow as pa
+
+        result = _apply_arrow(crypto, pa.array(column.array), field, operation, **options)
+        values = result.to_pylist() if output_dtype is object else pd.array(result, dtype=dtype)
+        return pd.Series(values, index=column.index, name=column.name, dtype=output_dtype)
+
+    values = _apply_values(crypto, column.tolist(), field, operation, **options)
+    return pd.Series(values, index=column.index, name=column.name, dtype=output_dtype)
+
+
+# ----------------------------------------------------------------------------
+# Arrow: bytes straight from and into string buffers
+# ----------------------------------------------------------------------------
+
+def _apply_arrow(crypto: HouslerCrypto, column, field: str, operation: str, **options):
+    import pyarrow as pa
+
+    if isinstance(column, pa.ChunkedArray):
+        chunks = [
+            _apply_arrow(crypto, chunk, field, operation, **options) for chunk in column.chunks
+        ]
+        if not chunks:
+            return column
+        arrow_type = _common_type(chunks)
+        return pa.chunked_array(
+            [chunk if chunk.type == arrow_type else chunk.cast(arrow_type) for chunk in chunks],
+            type=arrow_type,
+        )
+
+    if not isinstance(column, pa.Array) or column.type not in (pa.string(), pa.large_string()):
+        raise TypeError("Expected a pyarrow string or large_string array")
+
+    values = _arrow_values(column)
+    binary = False
+    if operation == "encrypt":
+        results = _encrypt_bytes(crypto, values, field)
+    elif operation == "decrypt":
+        results = _decrypt_bytes(crypto, values, field)
+    else:
+        results = _blind_index_bytes(crypto, values, field, **options)
+        binary = options.get("encoding") == "raw"
+
+    return _build_arrow(column, results, binary)
+
+
+def _common_type(chunks: list):
+    import pyarrow as pa
+
+    large = any(chunk.type in (pa.large_string(), pa.large_binary()) for chunk in chunks)
+    if chunks[0].type in (pa.binary(), pa.large_binary()):
+        return pa.large_binary() if large else pa.binary()
+    return pa.large_string() if large else pa.string()
+
+
+def _arrow_values(column) -> list[bytes | None]:
+    """UTF-8 bytes of every cell, None for nulls."""
+    import numpy as np
+    import pyarrow as pa
+
+    n = len(column)
+    _, offsets_buffer, data_buffer = column.buffers()
+    offset_type = np.int64 if column.type == pa.large_string() else np.int32
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_type)[
+        column.offset:column.offset + n + 1
+    ].tolist()
+    data = data_buffer.to_pybytes() if data_buffer is not None else b""
+
+    values = [data[offsets[i]:offsets[i + 1]] for i in range(n)]
+    if column.null_count:
+        valid = column.is_valid().to_numpy(zero_copy_only=False).tolist()
+        values = [value if ok else None for value, ok in zip(values, valid, strict=True)]
+    return values
+
+
+def _build_arrow(column, results: list[bytes | None], binary: bool = False):
+    """
+    String (or binary) array with ``results`` as data and the validity of ``column``.
+
+    The input validity bitmap is reused as is, so offsets are laid out from
+    ``column.offset`` like the input. Promotes to the large type if the data
+    no longer fits 32-bit offsets.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    lengths = np.fromiter(
+        (len(r) if r is not None else 0 for r in results), dtype=np.int64, count=len(results),
+    )
+    data = b"".join(r for r in results if r is not None)
+
+    large = column.type == pa.large_string() or len(data) > _INT32_MAX
+    if binary:
+        arrow_type = pa.large_binary() if large else pa.binary()
+    else:
+        arrow_type = pa.large_string() if large else pa.string()
+    offset_type = np.int64 if large else np.int32
+
+    offsets = np.zeros(column.offset + len(results) + 1, dtype=offset_type)
+    np.cumsum(lengths, out=offsets[column.offset + 1:])
+
+    return pa.Array.from_buffers(
+        arrow_type,
+        len(results),
+        [column.buffers()[0], pa.py_buffer(offsets), pa.py_buffer(data)],
+        null_count=column.null_count,
+        offset=column.offset,
+    )
+
+
+def _encrypt_bytes(crypto: HouslerCrypto, values: list, field: str) -> list:
+    """encrypt_many() on UTF-8 bytes."""
+    aesgcm = _aesgcm(crypto._derive_key(field))
+    ivs = os.urandom(IV_LENGTH * len(values))
+
+    result = []
+    append = result.append
+    for i, value in enumerate(values):
+        if not value or value.startswith(_PREFIX_BYTES):
+            append(value)
+            continue
+        iv = ivs[i * IV_LENGTH:(i + 1) * IV_LENGTH]
+        append(_pack_bytes(iv, aesgcm.encrypt(iv, value, None)))
+    return result
+
+
+def _decrypt_bytes(crypto: HouslerCrypto, values: list, field: str) -> list:
+    """decrypt_many() on UTF-8 bytes; plaintext is returned without decoding."""
+    result = []
+    append = result.append
+    open_envelope = crypto._open
+    aesgcm = None
+    for value in values:
+        if not value or not value.startswith(_PREFIX_BYTES):
+            append(value)
+            continue
+        if aesgcm is None:
+            aesgcm = _aesgcm(crypto._derive_key(field))
+        try:
+            append(open_envelope(value, field, aesgcm))
+        except Exception as e:
+            raise _decryption_error(field, e) from e
+    return result
+
+
+def _blind_index_bytes(
+    crypto: HouslerCrypto,
+    values: list,
+    field: str,
+    digest_size: int = BLIND_INDEX_SIZE,
+    encoding: str = "hex",
+) -> list:
+    """blind_index_many() on UTF-8 bytes; ASCII is normalized without decoding."""
+    hash_key = crypto._blind_index_key(field)
+    blake2b = hashlib.blake2b
+    encode = _BYTES_ENCODERS[encoding]
+    normalize = _blind_index_input
+
+    result = []
+    append = result.append
+    for value in values:
+        if not value:
+            append(value)
+            continue
+        append(encode(blake2b(normalize(value), key=hash_key, digest_size=digest_size).digest()))
+    return result
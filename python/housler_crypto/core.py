@@ -7,6 +7,11 @@ Format: base64(version + iv + tag + ciphertext)
 - tag: 16 bytes (128 bits, authentication tag)
 - ciphertext: variable length
 
+Deterministic format (opt-in, AES-256-SIV): base64(version + siv + ciphertext)
+- version: 1 byte (0x02 for SIV)
+- siv: 16 bytes (synthetic IV, doubles as the authentication tag)
+- ciphertext: variable length
+
 This format is cross-platform compatible with the TypeScript version.
 """
 
@@ -14,23 +19,198 @@ import base64
 import hashlib
 import logging
 import os
+import re
 import struct
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+from .utils import FIELD_NORMALIZERS, _normalize_default
 
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM, AESSIV
 
 logger = logging.getLogger(__name__)
 
 # Constants
 VERSION_GCM = 0x01
+VERSION_SIV = 0x02
 IV_LENGTH = 12  # 96 bits for GCM (recommended)
 TAG_LENGTH = 16  # 128 bits
 KEY_LENGTH = 32  # 256 bits
 
+# Minimum packed size: version (1) + iv (12) + tag (16) + at least 1 byte
+MIN_PACKED_LENGTH = 1 + IV_LENGTH + TAG_LENGTH + 1
+# Deterministic: version (1) + siv (16) + at least 1 byte
+MIN_SIV_PACKED_LENGTH = 1 + TAG_LENGTH + 1
+
 # Prefix for encrypted data
 ENCRYPTED_PREFIX = "hc1:"  # housler-crypto v1
 
+# Blind index digest sizes (bytes) and output encodings
+BLIND_INDEX_SIZE = 32
+MIN_BLIND_INDEX_SIZE = 8
+MAX_BLIND_INDEX_SIZE = 32
+BLIND_INDEX_ENCODINGS = ("hex", "base64url", "raw")
+
+_VERSION_GCM_BYTE = struct.pack("B", VERSION_GCM)
+_VERSION_SIV_BYTE = struct.pack("B", VERSION_SIV)
+_PREFIX_BYTES = ENCRYPTED_PREFIX.encode("ascii")
+# Characters str.strip() removes from ASCII text
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+# cryptography is imported on first use to keep `import housler_crypto` fast
+_AESGCM_CLASS = None
+_AESSIV_CLASS = None
+
+
+def _aesgcm(key: bytes) -> "AESGCM":
+    """Create an AES-GCM cipher, importing cryptography on first use."""
+    global _AESGCM_CLASS
+    if _AESGCM_CLASS is None:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        _AESGCM_CLASS = AESGCM
+    return _AESGCM_CLASS(key)
+
+
+def _aessiv(key: bytes) -> "AESSIV":
+    """Create an AES-SIV cipher, importing cryptography on first use."""
+    global _AESSIV_CLASS
+    if _AESSIV_CLASS is None:
+        from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+
+        _AESSIV_CLASS = AESSIV
+    return _AESSIV_CLASS(key)
+
+
+def _pack_bytes(iv: bytes, sealed: bytes) -> bytes:
+    """Encode AESGCM output (ciphertext + tag) as "hc1:" ASCII bytes."""
+    # Pack: version (1) + iv (12) + tag (16) + ciphertext
+    packed = _VERSION_GCM_BYTE + iv + sealed[-TAG_LENGTH:] + sealed[:-TAG_LENGTH]
+    return _PREFIX_BYTES + base64.b64encode(packed)
+
+
+def _pack(iv: bytes, sealed: bytes) -> str:
+    """Encode AESGCM output (ciphertext + tag) as an "hc1:" string."""
+    return _pack_bytes(iv, sealed).decode("ascii")
+
+
+def _pack_siv(sealed: bytes) -> str:
+    """Encode AESSIV output (siv + ciphertext) as an "hc1:" string."""
+    return ENCRYPTED_PREFIX + base64.b64encode(_VERSION_SIV_BYTE + sealed).decode("ascii")
+
+
+def _unpack_packed(packed: bytes) -> tuple[bytes, bytes]:
+    """
+    Split a base64-decoded GCM envelope into (iv, ciphertext + tag) for AESGCM.
+
+    Raises:
+        ValueError: If the envelope is too short or has another version
+    """
+    if len(packed) < MIN_PACKED_LENGTH:
+        raise ValueError("Ciphertext too short")
+
+    # Unpack
+    version = packed[0]
+    if version != VERSION_GCM:
+        raise ValueError(f"Unsupported version: {version}")
+
+    iv = packed[1:1 + IV_LENGTH]
+    tag = packed[1 + IV_LENGTH:1 + IV_LENGTH + TAG_LENGTH]
+    encrypted_data = packed[1 + IV_LENGTH + TAG_LENGTH:]
+
+    # AESGCM expects tag appended to ciphertext
+    return iv, encrypted_data + tag
+
+
+def _unpack_siv(packed: bytes) -> bytes:
+    """
+    Siv + ciphertext of a decoded deterministic envelope, for AESSIV.
+
+    Raises:
+        ValueError: If the envelope is too short
+    """
+    if len(packed) < MIN_SIV_PACKED_LENGTH:
+        raise ValueError("Ciphertext too short")
+    return packed[1:]
+
+
+_BLIND_INDEX_ALPHABETS = {
+    "hex": re.compile(r"[0-9a-f]*"),
+    "base64url": re.compile(r"[A-Za-z0-9_-]*"),
+}
+
+
+# Length prefix of compound blind index parts
+_LENGTH = struct.Struct(">I")
+
+
+def _length_prefixed(data: bytes) -> bytes:
+    return _LENGTH.pack(len(data)) + data
+
+
+def _b64url(digest: bytes) -> str:
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+_BLIND_INDEX_ENCODERS: dict[str, Callable] = {
+    "hex": lambda h: h.hexdigest(),
+    "base64url": lambda h: _b64url(h.digest()),
+    "raw": lambda h: h.digest(),
+}
+
+
+def _blind_index_encoder(digest_size: int, encoding: str) -> Callable:
+    """
+    Encoder of BLAKE2b objects for a blind index setting.
+
+    Raises:
+        ValueError: On a digest size outside 8..32 or an unknown encoding
+    """
+    if not MIN_BLIND_INDEX_SIZE <= digest_size <= MAX_BLIND_INDEX_SIZE:
+        raise ValueError(
+            f"digest_size must be {MIN_BLIND_INDEX_SIZE}..{MAX_BLIND_INDEX_SIZE} bytes, "
+            f"got {digest_size}"
+        )
+    encoder = _BLIND_INDEX_ENCODERS.get(encoding)
+    if encoder is None:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {BLIND_INDEX_ENCODINGS}")
+    return encoder
+
+
+def blind_index_length(digest_size: int = BLIND_INDEX_SIZE, encoding: str = "hex") -> int:
+    """
+    Length of a blind index value (characters, or bytes for "raw").
+
+    Useful for sizing index columns, e.g. CHAR(22) for 16 bytes of base64url.
+    """
+    _blind_index_encoder(digest_size, encoding)
+    if encoding == "hex":
+        return digest_size * 2
+    if encoding == "base64url":
+        return (digest_size * 4 + 2) // 3
+    return digest_size
+
+
+def _decryption_error(field: str, error: Exception) -> ValueError:
+    """Log a failed decryption and wrap it in the ValueError callers see."""
+    logger.error(f"Decryption failed for field {field}: {error}")
+    return ValueError(f"Decryption failed: {error}")
+
+
+def _blind_index_input(value: str | bytes) -> bytes:
+    """
+    Normalized blind index input: lowercased, stripped, UTF-8.
+
+    Accepts UTF-8 bytes too; ASCII bytes are normalized without decoding.
+    """
+    if isinstance(value, str):
+        return value.lower().strip().encode("utf-8")
+    if value.isascii():
+        return value.lower().strip(_ASCII_WHITESPACE)
+    return value.decode("utf-8").lower().strip().encode("utf-8")
+
 
 class HouslerCrypto:
     """
@@ -50,6 +230,9 @@ class HouslerCrypto:
         iterations: PBKDF2 iterations (default: 100000)
     """
 
+    # Stage tracer set by tracing.attach_hooks(); checked once per call
+    _tracer = None
+
     def __init__(
         self,
         master_key: str,
@@ -70,6 +253,7 @@ class HouslerCrypto:
         self._salt = salt.encode("utf-8")
         self._iterations = iterations
         self._key_cache: dict[str, bytes] = {}
+        self._siv_ciphers: dict[str, AESSIV] = {}
 
     def _derive_key(self, field: str) -> bytes:
         """
@@ -83,6 +267,9 @@ class HouslerCrypto:
         # Use field name as part of salt for uniqueness
         field_salt = self._salt + b":" + field.encode("utf-8")
 
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=KEY_LENGTH,
@@ -115,26 +302,32 @@ class HouslerCrypto:
         if plaintext.startswith(ENCRYPTED_PREFIX):
             return plaintext
 
-        key = self._derive_key(field)
-        iv = os.urandom(IV_LENGTH)
-
-        aesgcm = AESGCM(key)
-        ciphertext = aesgcm.encrypt(iv, plaintext.encode("utf-8"), None)
-
-        # GCM appends tag to ciphertext, we need to separate
-        # ciphertext[-16:] is the tag
-        tag = ciphertext[-TAG_LENGTH:]
-        encrypted_data = ciphertext[:-TAG_LENGTH]
-
-        # Pack: version (1) + iv (12) + tag (16) + ciphertext
-        packed = struct.pack("B", VERSION_GCM) + iv + tag + encrypted_data
-        encoded = base64.b64encode(packed).decode("ascii")
+        tracer = self._tracer
+        trace = tracer.start("encrypt", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            key = self._derive_key(field)
+            if trace is not None:
+                trace.stage("aead")
+            iv = os.urandom(IV_LENGTH)
+            sealed = _aesgcm(key).encrypt(iv, plaintext.encode("utf-8"), None)
+            if trace is not None:
+                trace.stage("encode")
+            # GCM appends the tag to the ciphertext; _pack moves it before
+            encrypted = _pack(iv, sealed)
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
 
-        return ENCRYPTED_PREFIX + encoded
+        if trace is not None:
+            trace.end()
+        return encrypted
 
     def decrypt(self, ciphertext: str, field: str = "default") -> str:
         """
-        Decrypt data encrypted with AES-256-GCM.
+        Decrypt data encrypted with AES-256-GCM or AES-256-SIV.
 
         Args:
             ciphertext: Encrypted string (with "hc1:" prefix)
@@ -153,66 +346,465 @@ class HouslerCrypto:
         if not ciphertext.startswith(ENCRYPTED_PREFIX):
             return ciphertext
 
+        tracer = self._tracer
+        trace = tracer.start("decrypt", field) if tracer is not None else None
         try:
-            encoded = ciphertext[len(ENCRYPTED_PREFIX):]
-            packed = base64.b64decode(encoded)
+            plaintext = self._open(ciphertext, field, None, trace).decode("utf-8")
+        except Exception as e:
+            error = _decryption_error(field, e)
+            if trace is not None:
+                trace.fail(e)
+                trace.end(error)
+            raise error from e
 
-            # Minimum size: version (1) + iv (12) + tag (16) + at least 1 byte
-            if len(packed) < 1 + IV_LENGTH + TAG_LENGTH + 1:
-                raise ValueError("Ciphertext too short")
+        if trace is not None:
+            trace.end()
+        return plaintext
 
-            # Unpack
-            version = packed[0]
-            if version != VERSION_GCM:
-                raise ValueError(f"Unsupported version: {version}")
+    def blind_index(
+        self,
+        plaintext: str,
+        field: str = "default",
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ) -> str | bytes:
+        """
+        Create a blind index (deterministic hash) for searchable encryption.
 
-            iv = packed[1:1 + IV_LENGTH]
-            tag = packed[1 + IV_LENGTH:1 + IV_LENGTH + TAG_LENGTH]
-            encrypted_data = packed[1 + IV_LENGTH + TAG_LENGTH:]
+        Uses keyed BLAKE2b with a digest of ``digest_size`` bytes (32 by
+        default). Same input always produces same output (for searching).
 
-            # AESGCM expects tag appended to ciphertext
-            combined = encrypted_data + tag
+        Shorter digests make smaller database indexes: 16 bytes as
+        base64url is 22 characters instead of 64. BLAKE2b hashes the digest
+        size into its parameters, so a truncated setting is not a prefix of
+        a longer one; values of different settings never match each other.
 
-            key = self._derive_key(field)
-            aesgcm = AESGCM(key)
-            plaintext = aesgcm.decrypt(iv, combined, None)
+        Args:
+            plaintext: Value to hash
+            field: Field name for key derivation
+            digest_size: Digest size in bytes (8..32)
+            encoding: "hex", "base64url" (unpadded) or "raw" (bytes)
 
-            return plaintext.decode("utf-8")
+        Returns:
+            The digest as a hex string (2 * digest_size characters, 64 by
+            default), an unpadded base64url string (ceil(4 * digest_size / 3)
+            characters) or raw bytes; "" (b"" for raw) for empty input
 
-        except Exception as e:
-            logger.error(f"Decryption failed for field {field}: {e}")
-            raise ValueError(f"Decryption failed: {e}") from e
+        Raises:
+            ValueError: On an invalid digest size or encoding
+        """
+        encode = _blind_index_encoder(digest_size, encoding)
+        if not plaintext:
+            return b"" if encoding == "raw" else ""
 
-    def blind_index(self, plaintext: str, field: str = "default") -> str:
+        tracer = self._tracer
+        trace = tracer.start("blind_index", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            hash_key = self._blind_index_key(field)
+            if trace is not None:
+                trace.stage("hash")
+            h = hashlib.blake2b(
+                _blind_index_input(plaintext),  # lowercase and strip
+                key=hash_key,
+                digest_size=digest_size,
+            )
+            result = encode(h)
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    def _blind_index_key(self, field: str) -> bytes:
+        """Blind index key of a field, separate from its encryption key."""
+        return self._derive_key(field + ":blind_index")[:32]
+
+    def _siv_key(self, field: str) -> bytes:
+        """64-byte AES-256-SIV key: S2V (MAC) half, then CTR half."""
+        return self._derive_key(field + ":siv_mac") + self._derive_key(field + ":siv_ctr")
+
+    def _siv_cipher(self, field: str) -> "AESSIV":
+        """AES-256-SIV cipher of a field, created once per instance."""
+        cipher = self._siv_ciphers.get(field)
+        if cipher is None:
+            cipher = self._siv_ciphers[field] = _aessiv(self._siv_key(field))
+        return cipher
+
+    def encrypt_deterministic(self, plaintext: str, field: str = "default") -> str:
         """
-        Create a blind index (deterministic hash) for searchable encryption.
+        Encrypt data deterministically using AES-256-SIV.
 
-        Uses BLAKE2b-256 with keyed hashing.
-        Same input always produces same output (for searching).
+        Equal plaintexts of one field give equal ciphertexts, so the stored
+        value itself can be indexed and queried with
+        ``WHERE email = encrypt_deterministic(value, "email")`` instead of a
+        separate blind index column. This reveals which rows share a value;
+        use it only for lookup fields, and normalize values (normalize_email,
+        normalize_phone) before encrypting. decrypt() reads both formats.
 
         Args:
-            plaintext: Value to hash
-            field: Field name for key derivation
+            plaintext: Data to encrypt
+            field: Field name for key derivation (e.g., "email", "phone")
 
         Returns:
-            Hex-encoded hash (64 characters)
+            Encrypted string with "hc1:" prefix (base64 encoded)
         """
         if not plaintext:
             return ""
 
-        # Normalize: lowercase and strip
-        normalized = plaintext.lower().strip()
+        # Skip if already encrypted
+        if plaintext.startswith(ENCRYPTED_PREFIX):
+            return plaintext
+
+        tracer = self._tracer
+        trace = tracer.start("encrypt_deterministic", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            aessiv = self._siv_cipher(field)
+            if trace is not None:
+                trace.stage("aead")
+            sealed = aessiv.encrypt(plaintext.encode("utf-8"), None)
+            if trace is not None:
+                trace.stage("encode")
+            encrypted = _pack_siv(sealed)
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return encrypted
+
+    def encrypt_deterministic_many(
+        self, plaintexts: Iterable[str], field: str = "default"
+    ) -> list[str]:
+        """
+        Encrypt a batch of values deterministically for one field.
+
+        Same output as encrypt_deterministic() for every value; the key and
+        cipher are set up once.
+        """
+        tracer = self._tracer
+        trace = tracer.start("encrypt_deterministic_many", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            encrypt = self._siv_cipher(field).encrypt
+            if trace is not None:
+                trace.stage("aead")
+            result = []
+            append = result.append
+            for plaintext in plaintexts:
+                if not plaintext:
+                    append("")
+                elif plaintext.startswith(ENCRYPTED_PREFIX):
+                    append(plaintext)
+                else:
+                    append(_pack_siv(encrypt(plaintext.encode("utf-8"), None)))
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    def encrypt_many(self, plaintexts: Iterable[str], field: str = "default") -> list[str]:
+        """
+        Encrypt a batch of values for one field.
+
+        Same output format and rules as encrypt() (empty -> "", already
+        encrypted values pass through), but the key and cipher are set up
+        once and IVs come from a single urandom call.
+        """
+        values = list(plaintexts)
+        tracer = self._tracer
+        trace = tracer.start("encrypt_many", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            aesgcm = _aesgcm(self._derive_key(field))
+            if trace is not None:
+                trace.stage("aead")
+            ivs = os.urandom(IV_LENGTH * len(values))
+
+            result = []
+            append = result.append
+            for i, plaintext in enumerate(values):
+                if not plaintext:
+                    append("")
+                    continue
+                if plaintext.startswith(ENCRYPTED_PREFIX):
+                    append(plaintext)
+                    continue
+
+                iv = ivs[i * IV_LENGTH:(i + 1) * IV_LENGTH]
+                append(_pack(iv, aesgcm.encrypt(iv, plaintext.encode("utf-8"), None)))
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    def decrypt_many(self, ciphertexts: Iterable[str], field: str = "default") -> list[str]:
+        """
+        Decrypt a batch of values for one field.
+
+        Same rules as decrypt(); raises ValueError on the first invalid value.
+        """
+        tracer = self._tracer
+        trace = tracer.start("decrypt_many", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            aesgcm = _aesgcm(self._derive_key(field))
+            if trace is not None:
+                trace.stage("aead")
+            open_envelope = self._open
+
+            result = []
+            append = result.append
+            for ciphertext in ciphertexts:
+                if not ciphertext or not ciphertext.startswith(ENCRYPTED_PREFIX):
+                    append(ciphertext or "")
+                    continue
+                append(open_envelope(ciphertext, field, aesgcm).decode("utf-8"))
+        except Exception as e:
+            error = _decryption_error(field, e)
+            if trace is not None:
+                trace.fail(e)
+                trace.end(error)
+            raise error from e
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    def _open(
+        self, envelope: str | bytes, field: str, aesgcm: "AESGCM | None", trace=None
+    ) -> bytes:
+        """
+        Plaintext bytes of one "hc1:" value, given as str or ASCII bytes.
+
+        Dispatches on the version byte: GCM values are opened with
+        ``aesgcm`` (created from the field key if None), SIV values with
+        the field's SIV cipher.
+
+        Raises:
+            ValueError: On a short envelope or unknown version
+            InvalidTag: If authentication fails
+        """
+        if trace is not None:
+            trace.stage("decode")
+        packed = base64.b64decode(envelope[len(ENCRYPTED_PREFIX):])
+        siv = packed[:1] == _VERSION_SIV_BYTE
+        if trace is not None:
+            trace.stage("derive_key")
+        if siv:
+            aessiv = self._siv_cipher(field)
+        elif aesgcm is None:
+            aesgcm = _aesgcm(self._derive_key(field))
+        if trace is not None:
+            trace.stage("aead")
+
+        if siv:
+            return aessiv.decrypt(_unpack_siv(packed), None)
+        iv, sealed = _unpack_packed(packed)
+        return aesgcm.decrypt(iv, sealed, None)
+
+    def _decrypt_packed(self, aesgcm: "AESGCM", ciphertext: str, field: str) -> str:
+        """Decrypt one "hc1:" value with a ready cipher (GCM) or the SIV key."""
+        try:
+            return self._open(ciphertext, field, aesgcm).decode("utf-8")
+        except Exception as e:
+            raise _decryption_error(field, e) from e
+
+    def blind_index_many(
+        self,
+        plaintexts: Iterable[str],
+        field: str = "default",
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ) -> list[str | bytes]:
+        """
+        Blind indexes for a batch of values of one field.
+
+        Same output as blind_index() for every value.
+        """
+        encode = _blind_index_encoder(digest_size, encoding)
+        tracer = self._tracer
+        trace = tracer.start("blind_index_many", field) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            hash_key = self._blind_index_key(field)
+            if trace is not None:
+                trace.stage("hash")
+            blake2b = hashlib.blake2b
+            normalize = _blind_index_input
+            if encoding == "hex":
+                result = [
+                    blake2b(normalize(p), key=hash_key, digest_size=digest_size).hexdigest()
+                    if p else ""
+                    for p in plaintexts
+                ]
+            else:
+                empty = b"" if encoding == "raw" else ""
+                result = [
+                    encode(blake2b(normalize(p), key=hash_key, digest_size=digest_size))
+                    if p else empty
+                    for p in plaintexts
+                ]
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    def compound_blind_index(
+        self,
+        parts: Sequence[tuple[str, str]],
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ) -> str | bytes:
+        """
+        Blind index of several fields together, e.g. last name + birth date.
+
+        Each value is normalized for its field (utils.FIELD_NORMALIZERS:
+        phones to digits with a 7 prefix, names lowercased with "ё" -> "е",
+        dates to ISO, document numbers to digits, anything else lowercased
+        and stripped). Field names and values are length-prefixed, so
+        ("ab", "c") and ("a", "bc") never hash alike, and hashed in one
+        keyed BLAKE2b pass with a key derived for the ordered field list.
+
+        Args:
+            parts: Ordered (field, value) pairs
+            digest_size: Digest size in bytes (8..32)
+            encoding: "hex", "base64url" (unpadded) or "raw" (bytes)
+
+        Returns:
+            Encoded hash; empty if any value is empty or normalizes to empty
 
-        # Derive a separate key for hashing (different from encryption key)
-        hash_key = self._derive_key(field + ":blind_index")[:32]
+        Raises:
+            ValueError: On no parts, an invalid digest size or encoding
+        """
+        fields = [field for field, _ in parts]
+        return self._compound_blind_indexes(
+            [[value for _, value in parts]], fields, digest_size, encoding, "compound_blind_index",
+        )[0]
+
+    def compound_blind_index_many(
+        self,
+        rows: Iterable[Sequence[str]],
+        fields: Sequence[str],
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ) -> list[str | bytes]:
+        """
+        Compound blind indexes for a batch of rows.
 
-        h = hashlib.blake2b(
-            normalized.encode("utf-8"),
-            key=hash_key,
-            digest_size=32,
+        Args:
+            rows: Value sequences, in the order of ``fields``
+            fields: Field names of the parts
+
+        Same output as compound_blind_index() for every row.
+        """
+        return self._compound_blind_indexes(
+            rows, fields, digest_size, encoding, "compound_blind_index_many",
         )
 
-        return h.hexdigest()
+    def _compound_blind_indexes(
+        self,
+        rows: Iterable[Sequence[str]],
+        fields: Sequence[str],
+        digest_size: int,
+        encoding: str,
+        operation: str,
+    ) -> list[str | bytes]:
+        if not fields:
+            raise ValueError("At least one field is required")
+        encode = _blind_index_encoder(digest_size, encoding)
+        tracer = self._tracer
+        trace = tracer.start(operation, "+".join(fields)) if tracer is not None else None
+        try:
+            if trace is not None:
+                trace.stage("derive_key")
+            # One key per ordered field list; parts carry their field names as well
+            hash_key = self._derive_key("\x1f".join(fields) + ":compound_index")[:32]
+            if trace is not None:
+                trace.stage("hash")
+            normalizers = [FIELD_NORMALIZERS.get(field, _normalize_default) for field in fields]
+            prefixes = [_length_prefixed(field.encode("utf-8")) for field in fields]
+            count = len(fields)
+            blake2b = hashlib.blake2b
+            pack_length = _LENGTH.pack
+            empty = b"" if encoding == "raw" else ""
+
+            result = []
+            append = result.append
+            for values in rows:
+                if len(values) != count:
+                    raise ValueError(f"Expected {count} values, got {len(values)}")
+                h = blake2b(key=hash_key, digest_size=digest_size)
+                for value, normalize, prefix in zip(values, normalizers, prefixes, strict=True):
+                    data = normalize(value).encode("utf-8") if value else b""
+                    if not data:
+                        break
+                    h.update(prefix)
+                    h.update(pack_length(len(data)))
+                    h.update(data)
+                else:
+                    append(encode(h))
+                    continue
+                append(empty)
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return result
+
+    @staticmethod
+    def is_blind_index(
+        value: str | bytes,
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ) -> bool:
+        """
+        Check that a stored value has the shape of a blind index setting.
+
+        Compares type, length and alphabet, so index columns holding values
+        of a different digest size or encoding are caught before queries
+        silently stop matching. Hex values of 2n bytes have the length of
+        base64url values of 3n bytes and only use base64url characters, so
+        that one mix-up passes the base64url check.
+
+        Raises:
+            ValueError: On an invalid digest size or encoding
+        """
+        length = blind_index_length(digest_size, encoding)
+        if encoding == "raw":
+            return isinstance(value, bytes) and len(value) == length
+        return (
+            isinstance(value, str)
+            and len(value) == length
+            and _BLIND_INDEX_ALPHABETS[encoding].fullmatch(value) is not None
+        )
 
     def is_encrypted(self, value: str) -> bool:
         """Check if value is encrypted with HouslerCrypto."""
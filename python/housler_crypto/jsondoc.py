@@ -0,0 +1,423 @@
+"""
+Path-based encryption of JSON documents, in one streaming pass.
+
+Selectors use a JSONPath subset - ``$``, ``.name``, ``['name']``, ``[N]``,
+``[*]`` and ``.*`` - and pick the scalars to encrypt or decrypt. The key
+derivation field of a selector is its path without ``$``, indexes and
+wildcards (``$.contacts[*].phone`` -> ``contacts.phone``), unless given
+explicitly.
+
+Documents are tokenized incrementally from a text stream and copied to the
+output as they are read, with matched values replaced, so large arrays are
+never materialized. Matched values are collected and processed with the
+batch methods, once per document or every ``batch_size`` values.
+Formatting outside the matched values is preserved. A stream may hold
+several documents (e.g. JSON Lines).
+
+Numbers and booleans at a selected path are encrypted from their JSON text
+and decrypt to strings; nulls, objects and arrays are left as they are.
+
+Usage:
+    from housler_crypto.jsondoc import JsonPathCrypto
+
+    paths = JsonPathCrypto(crypto, ["$.applicant.passport.number", "$.contacts[*].phone"])
+    with open("forms.json") as fin, open("forms.enc.json", "w") as fout:
+        paths.encrypt_stream(fin, fout)
+
+    paths.decrypt('{"contacts": [{"phone": "hc1:..."}]}')
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import re
+from typing import IO
+
+from .core import ENCRYPTED_PREFIX, HouslerCrypto
+
+_CHUNK_SIZE = 64 * 1024
+# Pieces of output kept before matched values are flushed
+_MAX_PIECES = 10_000
+
+WILDCARD = object()
+
+_SELECTOR_PART = re.compile(
+    r"""\.(?P<name>[A-Za-z_$][\w$-]*)|\.\*|\[\*\]|\[(?P<index>\d+)\]|\[(?P<quoted>'[^']*'|"[^"]*")\]"""
+)
+# One token after optional whitespace; the group number tells the kind
+_TOKEN = re.compile(
+    r"""[ \t\n\r]*(?:"""
+    r"""("(?:[^"\\]|\\.)*")"""                             # 1 string
+    r"""|([{[])"""                                         # 2 open
+    r"""|([}\]])"""                                        # 3 close
+    r"""|(,)"""                                            # 4 comma
+    r"""|(:)"""                                            # 5 colon
+    r"""|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)"""  # 6 number
+    r"""|(true|false)"""                                   # 7 boolean
+    r"""|(null))""",                                       # 8 null
+    re.DOTALL,
+)
+_TRAILING_WHITESPACE = re.compile(r"[ \t\n\r]*\Z")
+# Characters a number may continue with in the next chunk
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+# Text up to the next bracket or unterminated string, used to skip subtrees
+_SKIP = re.compile(r"""(?:[^"{}\[\]]+|"(?:[^"\\]|\\.)*")*""", re.DOTALL)
+_STRING, _OPEN, _CLOSE, _COMMA, _COLON, _NUMBER, _BOOLEAN, _NULL = range(1, 9)
+
+
+def parse_selector(selector: str) -> tuple:
+    """
+    Parse a selector into path components: str keys, int indexes or WILDCARD.
+
+    Raises:
+        ValueError: If the selector is invalid or selects the root
+    """
+    if not selector.startswith("$"):
+        raise ValueError(f"Selector must start with '$': {selector!r}")
+
+    parts = []
+    position = 1
+    while position < len(selector):
+        match = _SELECTOR_PART.match(selector, position)
+        if match is None:
+            raise ValueError(f"Invalid selector {selector!r} at position {position}")
+        if match.group("name") is not None:
+            parts.append(match.group("name"))
+        elif match.group("index") is not None:
+            parts.append(int(match.group("index")))
+        elif match.group("quoted") is not None:
+            parts.append(match.group("quoted")[1:-1])
+        else:
+            parts.append(WILDCARD)
+        position = match.end()
+
+    if not parts:
+        raise ValueError("Selector must not select the whole document")
+    return tuple(parts)
+
+
+def field_for_selector(selector: str) -> str:
+    """Default key derivation field: the key names of the path, dot separated."""
+    return ".".join(part for part in parse_selector(selector) if isinstance(part, str))
+
+
+class _Matcher:
+    """
+    Selector automaton over document paths.
+
+    A state is the set of selectors whose prefix matches the current path;
+    states are numbered and transitions cached, so walking a document costs
+    a dict lookup per key or array element. DEAD means no selector can match
+    below the path.
+    """
+
+    DEAD = -1
+    # Array elements when no selector of the state names an index
+    _ANY_INDEX = object()
+    _MAX_TRANSITIONS = 10_000
+
+    def __init__(self, selectors: list[tuple[tuple, str]]):
+        self._states: list[tuple[int, tuple, bool]] = []
+        self._ids: dict[tuple, int] = {}
+        self._transitions: dict[tuple, tuple[int, str | None]] = {}
+        self.root = self._state(0, tuple(selectors))
+
+    def _state(self, depth: int, alive: tuple) -> int:
+        if not alive:
+            return self.DEAD
+        key = (depth, alive)
+        state = self._ids.get(key)
+        if state is None:
+            state = len(self._states)
+            has_index = any(isinstance(parts[depth], int) for parts, _ in alive)
+            self._states.append((depth, alive, has_index))
+            self._ids[key] = state
+        return state
+
+    def step(self, state: int, component) -> tuple[int, str | None]:
+        """(child state, field if the child itself is selected) for a key or index."""
+        if isinstance(component, int) and not self._states[state][2]:
+            component = self._ANY_INDEX
+        key = (state, component)
+        result = self._transitions.get(key)
+        if result is not None:
+            return result
+
+        depth, alive, _ = self._states[state]
+        matched = [
+            (parts, field) for parts, field in alive
+            if parts[depth] is WILDCARD or parts[depth] == component
+        ]
+        field = next((f for parts, f in matched if len(parts) == depth + 1), None)
+        child = self._state(depth + 1, tuple(s for s in matched if len(s[0]) > depth + 1))
+
+        result = (child, field)
+        if len(self._transitions) < self._MAX_TRANSITIONS:
+            self._transitions[key] = result
+        return result
+
+
+class _Frame:
+    """An open object or array while tokenizing."""
+
+    __slots__ = ("is_object", "state", "child_state", "child_field", "index", "expect_key")
+
+    def __init__(self, is_object: bool, state: int):
+        self.is_object = is_object
+        self.state = state
+        self.child_state = _Matcher.DEAD
+        self.child_field: str | None = None
+        self.index = -1
+        self.expect_key = is_object
+
+
+class JsonPathCrypto:
+    """
+    Encrypts or decrypts the values at selected paths of JSON documents.
+
+    Args:
+        crypto: HouslerCrypto instance
+        selectors: Selector list, or {selector: field} to set fields explicitly
+        batch_size: Matched values processed per batch call at most
+
+    Raises:
+        ValueError: If a selector is invalid
+    """
+
+    def __init__(
+        self,
+        crypto: HouslerCrypto,
+        selectors: list[str] | dict[str, str],
+        batch_size: int = 1000,
+    ):
+        if not isinstance(selectors, dict):
+            selectors = {selector: field_for_selector(selector) for selector in selectors}
+        self._crypto = crypto
+        self._matcher = _Matcher([(parse_selector(s), f) for s, f in selectors.items()])
+        self._batch_size = batch_size
+
+    def encrypt_stream(self, fin: IO[str], fout: IO[str]) -> int:
+        """Encrypt selected values of the documents in ``fin``. Returns values encrypted."""
+        return _StreamTransform(self, encrypt=True).run(fin, fout)
+
+    def decrypt_stream(self, fin: IO[str], fout: IO[str]) -> int:
+        """
+        Decrypt selected "hc1:" values of the documents in ``fin``.
+
+        Returns:
+            Number of values decrypted
+
+        Raises:
+            ValueError: If a value fails to decrypt
+        """
+        return _StreamTransform(self, encrypt=False).run(fin, fout)
+
+    def encrypt(self, text: str) -> str:
+        """Encrypt selected values of a JSON text."""
+        fout = io.StringIO()
+        self.encrypt_stream(io.StringIO(text), fout)
+        return fout.getvalue()
+
+    def decrypt(self, text: str) -> str:
+        """Decrypt selected values of a JSON text."""
+        fout = io.StringIO()
+        self.decrypt_stream(io.StringIO(text), fout)
+        return fout.getvalue()
+
+
+class _StreamTransform:
+    """
+    Incremental tokenizer that copies input to output, replacing matched values.
+
+    Unchanged text is copied as slices of the input buffer: ``_copied`` is
+    the buffer position up to which input has been moved to ``_out``.
+    """
+
+    def __init__(self, paths: JsonPathCrypto, encrypt: bool):
+        self._crypto = paths._crypto
+        self._matcher = paths._matcher
+        self._batch_size = paths._batch_size
+        self._encrypt = encrypt
+
+        self._out: list[str | None] = []
+        # (piece index, field, value)
+        self._pending: list[tuple[int, str, str]] = []
+        self._count = 0
+
+        self._fin: IO[str] | None = None
+        self._buffer = ""
+        self._position = 0
+        self._copied = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        """Append input to the buffer, dropping what was already consumed."""
+        if self._eof:
+            return False
+        chunk = self._fin.read(_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._out.append(self._buffer[self._copied:self._position])
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = self._copied = 0
+        return True
+
+    def _skip_container(self) -> None:
+        """Consume an object or array without selected values, after its bracket."""
+        depth = 1
+        while depth:
+            position = _SKIP.match(self._buffer, self._position).end()
+            self._position = position
+            if position == len(self._buffer) or self._buffer[position] == '"':
+                # End of buffer or a string continuing in the next chunk
+                if not self._read_more():
+                    raise ValueError("Invalid JSON: unexpected end of input")
+                continue
+            depth += 1 if self._buffer[position] in "{[" else -1
+            self._position = position + 1
+
+    def _flush(self, fout: IO[str]) -> None:
+        out = self._out
+        out.append(self._buffer[self._copied:self._position])
+        self._copied = self._position
+
+        if self._pending:
+            by_field: dict[str, list[tuple[int, str]]] = {}
+            for index, field, value in self._pending:
+                by_field.setdefault(field, []).append((index, value))
+
+            for field, entries in by_field.items():
+                values = [value for _, value in entries]
+                if self._encrypt:
+                    results = self._crypto.encrypt_many(values, field=field)
+                    for (index, _), result in zip(entries, results, strict=True):
+                        out[index] = f'"{result}"'
+                else:
+                    results = self._crypto.decrypt_many(values, field=field)
+                    for (index, _), result in zip(entries, results, strict=True):
+                        out[index] = json.dumps(result, ensure_ascii=False)
+
+            self._count += len(self._pending)
+            self._pending.clear()
+
+        fout.write("".join(out))
+        out.clear()
+
+    def _replace(self, match: re.Match, kind: int, field: str) -> None:
+        """Queue a scalar at a selected path for the next batch."""
+        token = match.group(kind)
+        if kind == _STRING:
+            value = token[1:-1] if "\\" not in token else json.loads(token)
+            if self._encrypt:
+                if not value or value.startswith(ENCRYPTED_PREFIX):
+                    return
+            elif not value.startswith(ENCRYPTED_PREFIX):
+                return
+        elif not self._encrypt:
+            return
+        else:
+            value = token
+
+        out = self._out
+        out.append(self._buffer[self._copied:match.start(kind)])
+        out.append(None)
+        self._copied = match.end()
+        self._pending.append((len(out) - 1, field, value))
+
+    def run(self, fin: IO[str], fout: IO[str]) -> int:
+        self._fin = fin
+        step = self._matcher.step
+        dead = _Matcher.DEAD
+        token_match = _TOKEN.match
+        stack: list[_Frame] = []
+        frame = None
+        buffer = self._buffer
+        position = self._position
+        buffer_end = len(buffer)
+
+        while True:
+            match = token_match(buffer, position)
+            end = match.end() if match is not None else -1
+            # A token touching the end of the buffer may continue in the next
+            # chunk, as may a number followed by a partial fraction or exponent
+            if end < 0 or not self._eof and (
+                end == buffer_end
+                or match.lastindex == _NUMBER and _NUMBER_TAIL.fullmatch(buffer, end)
+            ):
+                self._position = position
+                if self._read_more():
+                    buffer, position = self._buffer, self._position
+                    buffer_end = len(buffer)
+                    continue
+                if match is None:
+                    if _TRAILING_WHITESPACE.match(buffer, position):
+                        self._position = buffer_end
+                        break
+                    raise ValueError(f"Invalid JSON: bad token at {buffer[position:][:20]!r}")
+            position = self._position = end
+            kind = match.lastindex
+
+            if kind == _COMMA or kind == _COLON:
+                if frame is None:
+                    raise ValueError(f"Invalid JSON: unexpected {match.group(kind)!r}")
+                if kind == _COMMA and frame.is_object:
+                    frame.expect_key = True
+                continue
+
+            if kind == _CLOSE:
+                if frame is None or frame.is_object != (match.group(kind) == "}"):
+                    raise ValueError(f"Invalid JSON: unexpected {match.group(kind)!r}")
+                stack.pop()
+                frame = stack[-1] if stack else None
+                if frame is None:
+                    self._flush(fout)
+                continue
+
+            if frame is not None and frame.expect_key:
+                if kind != _STRING:
+                    raise ValueError(f"Invalid JSON: expected a key, got {match.group(kind)!r}")
+                frame.expect_key = False
+                if frame.state != dead:
+                    token = match.group(kind)
+                    key = token[1:-1] if "\\" not in token else json.loads(token)
+                    frame.child_state, frame.child_field = step(frame.state, key)
+                continue
+
+            # A value: find the selector state at its path
+            if frame is None:
+                state, field = self._matcher.root, None
+            elif frame.is_object:
+                state, field = frame.child_state, frame.child_field
+            else:
+                frame.index += 1
+                if frame.state == dead:
+                    state, field = dead, None
+                else:
+                    state, field = step(frame.state, frame.index)
+
+            if kind == _OPEN:
+                if state == dead and frame is not None:
+                    self._skip_container()
+                    buffer, position = self._buffer, self._position
+                    buffer_end = len(buffer)
+                    if len(self._out) >= _MAX_PIECES:
+                        self._flush(fout)
+                    continue
+                frame = _Frame(match.group(kind) == "{", state)
+                stack.append(frame)
+                continue
+
+            if field is not None and kind != _NULL:
+                self._replace(match, kind, field)
+
+            if frame is None:
+                self._flush(fout)
+            elif len(self._pending) >= self._batch_size or len(self._out) >= _MAX_PIECES:
+                self._flush(fout)
+
+        if stack:
+            raise ValueError("Invalid JSON: unexpected end of input")
+        self._flush(fout)
+        return self._count
@@ -0,0 +1,280 @@
+"""
+Compact blind index lookup tables for dedup and join jobs.
+
+A DigestTable keeps raw blind index digests sorted in one contiguous
+array, with integer primary keys in a parallel array: 24 bytes per row
+for 16-byte digests instead of a dict of 64-character hex strings.
+Lookups are binary searches (vectorized for batches), joins and duplicate
+groups come from merging sorted arrays, and tables are saved to a file
+that loads back memory-mapped, without reading or sorting it again.
+
+Requires numpy (``pip install housler-crypto[lookup]``).
+
+Usage:
+    from housler_crypto.lookup import DigestTable
+
+    table = DigestTable.build(crypto, emails, user_ids, field="email")
+    table.get(crypto.blind_index(email, "email", digest_size=16, encoding="raw"))
+
+    left_ids, right_ids = table.join(DigestTable.load("crm_emails.hcdt"))
+    table.save("users_emails.hcdt")
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import os
+import struct
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from .core import (
+    BLIND_INDEX_ENCODINGS,
+    BLIND_INDEX_SIZE,
+    MAX_BLIND_INDEX_SIZE,
+    MIN_BLIND_INDEX_SIZE,
+    HouslerCrypto,
+)
+
+logger = logging.getLogger(__name__)
+
+# File layout: header, digests, padding to 8 bytes, little-endian int64 keys
+_MAGIC = b"HCDT"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBBxxQ")
+
+
+class DigestTable:
+    """
+    Sorted blind index digests with their primary keys.
+
+    Digests may repeat (several rows with one value); lookups then return
+    the first key and ``keys_for()`` all of them.
+
+    Args:
+        digests: Array of dtype ``S<digest_size>``, sorted
+        keys: int64 array of the same length
+
+    Use build(), from_hashes() or load() rather than the constructor.
+    """
+
+    def __init__(self, digests: np.ndarray, keys: np.ndarray):
+        if len(digests) != len(keys):
+            raise ValueError("digests and keys must have the same length")
+        self.digests = digests
+        self.keys = keys
+        self.digest_size = digests.dtype.itemsize
+
+    @classmethod
+    def build(
+        cls,
+        crypto: HouslerCrypto,
+        values: Iterable[str],
+        keys: Iterable[int],
+        field: str = "default",
+        digest_size: int = 16,
+    ) -> DigestTable:
+        """
+        Blind index plaintext values and build a table.
+
+        Empty values are left out, as they have no blind index.
+        """
+        values = list(values)
+        digests = crypto.blind_index_many(values, field, digest_size=digest_size, encoding="raw")
+        return cls.from_hashes(digests, keys, encoding="raw", digest_size=digest_size)
+
+    @classmethod
+    def from_hashes(
+        cls,
+        hashes: Iterable[str | bytes],
+        keys: Iterable[int],
+        encoding: str = "hex",
+        digest_size: int | None = None,
+    ) -> DigestTable:
+        """
+        Build a table from blind_index()/blind_index_many() output.
+
+        Empty hashes are left out. ``digest_size`` defaults to the size of
+        the first hash, or BLIND_INDEX_SIZE when there are none; pass it
+        so that empty input still builds a table of the right size.
+
+        Raises:
+            ValueError: If hashes and keys differ in number, or hashes
+                differ in size
+        """
+        hashes = list(hashes)
+        keys = np.asarray(list(keys), dtype=np.int64)
+        if len(keys) != len(hashes):
+            raise ValueError(f"Got {len(hashes)} hashes and {len(keys)} keys")
+        present = np.fromiter((bool(h) for h in hashes), dtype=bool, count=len(hashes))
+        if not present.all():
+            hashes = [h for h in hashes if h]
+            keys = keys[present]
+
+        digests = _to_digests(hashes, encoding, digest_size)
+        order = np.argsort(digests, kind="stable")
+        logger.debug(f"Digest table built: {len(digests)} rows")
+        return cls(digests[order], keys[order])
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def __contains__(self, digest: str | bytes) -> bool:
+        return self.get(digest) is not None
+
+    def _digests(self, hashes: Iterable[str | bytes], encoding: str) -> np.ndarray:
+        return _to_digests(list(hashes), encoding, self.digest_size)
+
+    def get(self, digest: str | bytes, default: int | None = None, encoding: str = "raw") -> int | None:
+        """Key of the first row with ``digest``, or ``default``."""
+        query = self._digests([digest], encoding)
+        position = np.searchsorted(self.digests, query)[0]
+        if position < len(self.digests) and self.digests[position] == query[0]:
+            return int(self.keys[position])
+        return default
+
+    def keys_for(self, digest: str | bytes, encoding: str = "raw") -> np.ndarray:
+        """Keys of every row with ``digest``."""
+        query = self._digests([digest], encoding)
+        left = np.searchsorted(self.digests, query, "left")[0]
+        right = np.searchsorted(self.digests, query, "right")[0]
+        return self.keys[left:right]
+
+    def contains_many(self, hashes: Iterable[str | bytes], encoding: str = "raw") -> np.ndarray:
+        """Boolean array: is each digest in the table."""
+        query = self._digests(hashes, encoding)
+        positions = np.searchsorted(self.digests, query)
+        found = positions < len(self.digests)
+        found[found] = self.digests[positions[found]] == query[found]
+        return found
+
+    def get_many(
+        self, hashes: Iterable[str | bytes], default: int = -1, encoding: str = "raw"
+    ) -> np.ndarray:
+        """int64 array of the first key per digest, ``default`` where missing."""
+        query = self._digests(hashes, encoding)
+        positions = np.searchsorted(self.digests, query)
+        found = positions < len(self.digests)
+        found[found] = self.digests[positions[found]] == query[found]
+        result = np.full(len(query), default, dtype=np.int64)
+        result[found] = self.keys[positions[found]]
+        return result
+
+    def join(self, other: DigestTable) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Inner join on digest.
+
+        Returns:
+            (keys of this table, keys of other), one pair per matching row
+            pair, ordered by digest
+
+        Raises:
+            ValueError: If the tables have different digest sizes
+        """
+        if other.digest_size != self.digest_size:
+            raise ValueError(
+                f"Cannot join {self.digest_size}-byte and {other.digest_size}-byte digests"
+            )
+        left = np.searchsorted(other.digests, self.digests, "left")
+        counts = np.searchsorted(other.digests, self.digests, "right") - left
+        total = int(counts.sum())
+
+        mine = np.repeat(self.keys, counts)
+        # Index of every matching row of other: run start plus position in the run
+        run_starts = np.repeat(left, counts)
+        run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return mine, other.keys[run_starts + run_offsets]
+
+    def duplicates(self) -> Iterator[np.ndarray]:
+        """Key arrays of rows sharing a digest, one per group of two or more."""
+        digests = self.digests
+        if len(digests) < 2:
+            return
+        same = digests[1:] == digests[:-1]
+        # Group boundaries: where a run of equal digests starts and ends
+        starts = np.flatnonzero(same & ~np.concatenate(([False], same[:-1])))
+        ends = np.flatnonzero(same & ~np.concatenate((same[1:], [False]))) + 2
+        for start, end in zip(starts, ends, strict=True):
+            yield self.keys[start:end]
+
+    def save(self, path: str) -> None:
+        """Write the table to ``path`` (see load())."""
+        count = len(self.digests)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, self.digest_size, count))
+            file.write(np.ascontiguousarray(self.digests).tobytes())
+            file.write(b"\0" * _padding(count * self.digest_size))
+            file.write(np.ascontiguousarray(self.keys, dtype="<i8").tobytes())
+        logger.info(f"Digest table saved to {path}: {count} rows")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> DigestTable:
+        """
+        Read a table written by save().
+
+        With ``mmap`` the arrays map the file read-only, so loading is
+        instant and pages are read on demand and shared between processes.
+
+        Raises:
+            ValueError: If the file is not a digest table or is truncated
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a digest table")
+        magic, version, digest_size, count = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a digest table")
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported digest table version: {version}")
+
+        digests_offset = _HEADER.size
+        keys_offset = digests_offset + count * digest_size + _padding(count * digest_size)
+        expected = keys_offset + count * 8
+        if os.path.getsize(path) < expected:
+            raise ValueError(f"{path} is truncated")
+        if count == 0:
+            return cls(np.empty(0, dtype=f"S{digest_size}"), np.empty(0, dtype=np.int64))
+
+        if mmap:
+            digests = np.memmap(path, f"S{digest_size}", "r", digests_offset, (count,))
+            keys = np.memmap(path, "<i8", "r", keys_offset, (count,))
+        else:
+            data = np.fromfile(path, dtype=np.uint8)
+            digests = data[digests_offset:digests_offset + count * digest_size].view(
+                f"S{digest_size}"
+            )
+            keys = data[keys_offset:expected].view("<i8")
+        return cls(digests, keys)
+
+
+def _padding(size: int) -> int:
+    return -(_HEADER.size + size) % 8
+
+
+def _to_digests(hashes: list, encoding: str, digest_size: int | None = None) -> np.ndarray:
+    """Fixed-width digest array from encoded blind indexes of ``digest_size`` bytes."""
+    if encoding == "hex":
+        raw = [bytes.fromhex(h) for h in hashes]
+    elif encoding == "base64url":
+        raw = [base64.urlsafe_b64decode(h + "=" * (-len(h) % 4)) for h in hashes]
+    elif encoding == "raw":
+        raw = hashes
+    else:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {BLIND_INDEX_ENCODINGS}")
+
+    if digest_size is not None:
+        size = digest_size
+    else:
+        size = len(raw[0]) if raw else BLIND_INDEX_SIZE
+    if not MIN_BLIND_INDEX_SIZE <= size <= MAX_BLIND_INDEX_SIZE:
+        raise ValueError(f"Digest size {size} is outside {MIN_BLIND_INDEX_SIZE}..{MAX_BLIND_INDEX_SIZE}")
+    if not raw:
+        return np.empty(0, dtype=f"S{size}")
+    data = b"".join(raw)
+    if len(data) != size * len(raw):
+        other = next(len(digest) for digest in raw if len(digest) != size)
+        raise ValueError(f"Expected {size}-byte digests, got {other}")
+    return np.frombuffer(data, dtype=f"S{size}")
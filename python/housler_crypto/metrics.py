@@ -0,0 +1,425 @@
+"""
+Optional per-field operation metrics for HouslerCrypto, FernetMigrator and TokenIndex.
+
+Counts operations, bytes and failures, and keeps fixed-bucket latency
+histograms labelled by operation and field, plus key derivations and key
+cache hits. Legacy values that are not Fernet tokens, which
+FernetMigrator.decrypt() returns unchanged, count as errors of the
+"legacy_fernet_passthrough" operation. Compound blind indexes are
+labelled with their field names joined by "+". Snapshots are available
+as a dict or in the Prometheus text exposition format.
+
+Instrumentation wraps the methods of a single instance. Instances that are
+not instrumented run the original code, so the disabled path costs nothing.
+
+Usage:
+    from housler_crypto.metrics import Metrics, instrument
+
+    metrics = Metrics()
+    instrument(crypto, metrics)
+    instrument(migrator, metrics)
+
+    crypto.encrypt("user@example.com", field="email")
+    print(metrics.to_prometheus())
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+# Upper bounds in seconds; an implicit +Inf bucket follows
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+_PREFIX = "housler_crypto"
+
+
+# Byte counters: size of the value side of each call
+def _size_of_input(value, result) -> int:
+    return len(value or "")
+
+
+def _size_of_result(value, result) -> int:
+    return len(result or "")
+
+
+def _size_of_inputs(values, result) -> int:
+    return sum(len(v or "") for v in values)
+
+
+def _size_of_results(values, result) -> int:
+    return sum(len(v or "") for v in result)
+
+
+def _size_of_parts(parts, result) -> int:
+    return sum(len(value or "") for _, value in parts)
+
+
+def _size_of_rows(rows, result) -> int:
+    return sum(len(value or "") for values in rows for value in values)
+
+
+# Field labels from the bound call arguments: the field argument, the
+# parts of compound indexes, or the index field
+def _field_of(obj, arguments: dict) -> str:
+    return arguments["field"]
+
+
+def _fields_of_parts(obj, arguments: dict) -> str:
+    return "+".join(field for field, _ in arguments["parts"])
+
+
+def _fields_of_rows(obj, arguments: dict) -> str:
+    return "+".join(arguments["fields"])
+
+
+def _index_field(obj, arguments: dict) -> str:
+    return obj.field
+
+
+# Method name -> (operation label, byte counter, field label)
+_CRYPTO_METHODS = {
+    "encrypt": ("encrypt", _size_of_result, _field_of),
+    "decrypt": ("decrypt", _size_of_input, _field_of),
+    "blind_index": ("blind_index", _size_of_input, _field_of),
+    "encrypt_deterministic": ("encrypt_deterministic", _size_of_result, _field_of),
+    "compound_blind_index": ("compound_blind_index", _size_of_parts, _fields_of_parts),
+    "encrypt_many": ("encrypt_many", _size_of_results, _field_of),
+    "decrypt_many": ("decrypt_many", _size_of_inputs, _field_of),
+    "blind_index_many": ("blind_index_many", _size_of_inputs, _field_of),
+    "encrypt_deterministic_many": ("encrypt_deterministic_many", _size_of_results, _field_of),
+    "compound_blind_index_many": ("compound_blind_index_many", _size_of_rows, _fields_of_rows),
+}
+
+_MIGRATOR_METHODS = {
+    "decrypt": ("legacy_decrypt", _size_of_input, _field_of),
+    "migrate": ("legacy_migrate", _size_of_input, _field_of),
+}
+
+_TOKEN_METHODS = {
+    "tokens": ("tokens", _size_of_input, _index_field),
+    "tokens_many": ("tokens_many", _size_of_inputs, _index_field),
+    "query": ("token_query", _size_of_input, _index_field),
+}
+
+
+class Metrics:
+    """
+    Thread-safe counters and latency histograms.
+
+    Byte counts are the size of the stored (encrypted) side of each call -
+    ciphertext produced by encrypt, consumed by decrypt and migrate - and
+    the input size for blind and token indexes.
+
+    Args:
+        buckets: Histogram bucket upper bounds in seconds, ascending
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, str, str], int] = {}
+        # (operation, field) -> [bucket counts..., +Inf count, sum]
+        self._histograms: dict[tuple[str, str], list] = {}
+
+    def observe(
+        self,
+        operation: str,
+        field: str,
+        seconds: float,
+        nbytes: int = 0,
+        count: int = 1,
+        error: bool = False,
+    ) -> None:
+        """Record one call covering ``count`` values."""
+        index = bisect.bisect_left(self._buckets, seconds)
+        key = (operation, field)
+        with self._lock:
+            counters = self._counters
+            name = "errors" if error else "operations"
+            counters[(name, operation, field)] = counters.get((name, operation, field), 0) + count
+            if nbytes:
+                counters[("bytes", operation, field)] = (
+                    counters.get(("bytes", operation, field), 0) + nbytes
+                )
+
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = [0] * (len(self._buckets) + 1) + [0.0]
+                self._histograms[key] = histogram
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def inc(self, name: str, operation: str, field: str, amount: int = 1) -> None:
+        """Increment a plain counter."""
+        with self._lock:
+            key = (name, operation, field)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Current values as a dict.
+
+        Returns:
+            {"counters": {name: {operation: {field: value}}},
+             "histograms": {operation: {field: {"buckets": {le: cumulative},
+                                                "count": n, "sum": seconds}}}}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(value) for key, value in self._histograms.items()}
+
+        result: dict = {"counters": {}, "histograms": {}}
+        for (name, operation, field), value in sorted(counters.items()):
+            result["counters"].setdefault(name, {}).setdefault(operation, {})[field] = value
+
+        bounds = [str(b) for b in self._buckets] + ["+Inf"]
+        for (operation, field), histogram in sorted(histograms.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, n in zip(bounds, histogram[:-1], strict=True):
+                cumulative += n
+                buckets[bound] = cumulative
+            result["histograms"].setdefault(operation, {})[field] = {
+                "buckets": buckets,
+                "count": cumulative,
+                "sum": histogram[-1],
+            }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Current values in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        descriptions = {
+            "operations": "Values processed",
+            "errors": "Failed calls",
+            "bytes": "Bytes of encrypted data processed",
+            "key_derivations": "Keys derived (key cache misses)",
+            "key_cache_hits": "Key cache hits",
+        }
+        for name, by_operation in snapshot["counters"].items():
+            metric = f"{_PREFIX}_{name}_total"
+            lines.append(f"# HELP {metric} {descriptions.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            for operation, by_field in by_operation.items():
+                for field, value in by_field.items():
+                    lines.append(f"{metric}{_labels(operation, field)} {value}")
+
+        if snapshot["histograms"]:
+            metric = f"{_PREFIX}_operation_duration_seconds"
+            lines.append(f"# HELP {metric} Call latency")
+            lines.append(f"# TYPE {metric} histogram")
+            for operation, by_field in snapshot["histograms"].items():
+                for field, histogram in by_field.items():
+                    for bound, value in histogram["buckets"].items():
+                        labels = _labels(operation, field, le=bound)
+                        lines.append(f"{metric}_bucket{labels} {value}")
+                    labels = _labels(operation, field)
+                    lines.append(f"{metric}_sum{labels} {histogram['sum']}")
+                    lines.append(f"{metric}_count{labels} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(operation: str, field: str, le: str | None = None) -> str:
+    labels = f'operation="{_escape(operation)}",field="{_escape(field)}"'
+    if le is not None:
+        labels += f',le="{le}"'
+    return "{" + labels + "}"
+
+
+def _wrap_operation(
+    obj,
+    method: Callable,
+    operation: str,
+    size_of: Callable[[object, object], int],
+    field_of: Callable[[object, dict], str],
+    metrics: Metrics,
+    batch: bool,
+) -> Callable:
+    perf_counter = time.perf_counter
+    observe = metrics.observe
+    # Calls are bound to the signature, so values passed by keyword are found too
+    signature = inspect.signature(method)
+    value_name = next(iter(signature.parameters))
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if batch:
+            arguments[value_name] = list(arguments[value_name])
+        field = field_of(obj, arguments)
+        start = perf_counter()
+        try:
+            result = method(*bound.args, **bound.kwargs)
+        except Exception:
+            observe(operation, field, perf_counter() - start, error=True)
+            raise
+        elapsed = perf_counter() - start
+        count = len(result) if batch else 1
+        observe(operation, field, elapsed, size_of(arguments[value_name], result), count)
+        return result
+
+    return wrapper
+
+
+def _wrap_lazy_batch(obj, method: Callable, operation: str, metrics: Metrics) -> Callable:
+    """
+    Wrap a method yielding one result per input value, like TokenIndex.tokens_many().
+
+    Latency is the time spent producing results, not the consumer's time
+    between them; the call is recorded when the iteration ends.
+    """
+    perf_counter = time.perf_counter
+    observe = metrics.observe
+    signature = inspect.signature(method)
+    value_name = next(iter(signature.parameters))
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs) -> Iterator:
+        bound = signature.bind(*args, **kwargs)
+        values = bound.arguments[value_name]
+        field = obj.field
+        nbytes = 0
+
+        def sized():
+            nonlocal nbytes
+            for value in values:
+                nbytes += len(value or "")
+                yield value
+
+        bound.arguments[value_name] = sized()
+        results = method(*bound.args, **bound.kwargs)
+        elapsed = 0.0
+        count = 0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    result = next(results)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += perf_counter() - start
+                count += 1
+                yield result
+        except Exception:
+            observe(operation, field, elapsed, error=True)
+            raise
+        observe(operation, field, elapsed, nbytes, count)
+
+    return wrapper
+
+
+def instrument(obj, metrics: Metrics):
+    """
+    Start recording metrics for a HouslerCrypto, FernetMigrator or TokenIndex instance.
+
+    Returns the same instance. Call uninstrument() to stop.
+    """
+    from .core import HouslerCrypto
+    from .migration import FernetMigrator
+    from .tokens import TokenIndex
+
+    if isinstance(obj, HouslerCrypto):
+        methods = _CRYPTO_METHODS
+    elif isinstance(obj, FernetMigrator):
+        methods = _MIGRATOR_METHODS
+    elif isinstance(obj, TokenIndex):
+        methods = _TOKEN_METHODS
+    else:
+        raise TypeError(f"Cannot instrument {type(obj).__name__}")
+
+    uninstrument(obj)
+    wrapped = []
+    for name, (operation, size_of, field_of) in methods.items():
+        method = getattr(obj, name, None)
+        if method is None:
+            continue
+        if isinstance(obj, TokenIndex) and name == "tokens_many":
+            wrapper = _wrap_lazy_batch(obj, method, operation, metrics)
+        else:
+            wrapper = _wrap_operation(
+                obj, method, operation, size_of, field_of, metrics, batch=name.endswith("_many"),
+            )
+        setattr(obj, name, wrapper)
+        wrapped.append(name)
+
+    if isinstance(obj, HouslerCrypto):
+        cache = obj._key_cache
+        wrapped.append(_wrap_key_cache(
+            obj, "_derive_key", lambda field: field in cache, metrics, "derive_key",
+        ))
+    elif isinstance(obj, FernetMigrator):
+        cache = obj._fernet_cache
+        wrapped.append(_wrap_key_cache(
+            obj,
+            "_get_fernet_for_field",
+            lambda field: obj._single_fernet is not None or field in cache,
+            metrics,
+            "legacy_key",
+        ))
+        wrapped.append(_wrap_passthrough(obj, metrics))
+
+    obj._instrumented_methods = wrapped
+    return obj
+
+
+def _wrap_key_cache(
+    obj,
+    name: str,
+    is_cached: Callable[[str], bool],
+    metrics: Metrics,
+    operation: str,
+) -> str:
+    method = getattr(obj, name)
+    inc = metrics.inc
+
+    @functools.wraps(method)
+    def wrapper(field):
+        inc("key_cache_hits" if is_cached(field) else "key_derivations", operation, field)
+        return method(field)
+
+    setattr(obj, name, wrapper)
+    return name
+
+
+def _wrap_passthrough(migrator, metrics: Metrics) -> str:
+    """Count legacy values returned as is because they are not Fernet tokens."""
+    method = migrator._passthrough
+    inc = metrics.inc
+
+    @functools.wraps(method)
+    def wrapper(ciphertext: str, field: str) -> str:
+        inc("errors", "legacy_fernet_passthrough", field)
+        return method(ciphertext, field)
+
+    migrator._passthrough = wrapper
+    return "_passthrough"
+
+
+def uninstrument(obj) -> None:
+    """Restore the original methods of an instrumented instance."""
+    for name in obj.__dict__.pop("_instrumented_methods", ()):
+        obj.__dict__.pop(name, None)
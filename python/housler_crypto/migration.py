@@ -10,12 +10,16 @@ from __future__ import annotations
 
 import base64
 import logging
+import queue
+import threading
+from collections.abc import Callable
 
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
-from .core import HouslerCrypto
+from .core import HouslerCrypto, blind_index_length
+from .throttle import RateGovernor
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +55,9 @@ class FernetMigrator:
         plaintext = migrator.decrypt(old_encrypted, field="email")
     """
 
+    # Stage tracer set by tracing.attach_hooks(); checked once per call
+    _tracer = None
+
     def __init__(self):
         self._fernet_cache: dict[str, Fernet] = {}
         self._single_fernet: Fernet | None = None
@@ -152,8 +159,24 @@ class FernetMigrator:
         if not ciphertext:
             return ""
 
+        tracer = self._tracer
+        trace = tracer.start("legacy_decrypt", field) if tracer is not None else None
+        try:
+            plaintext = self._decrypt(ciphertext, field, trace)
+        except Exception as e:
+            if trace is not None:
+                trace.end(e)
+            raise
+
+        if trace is not None:
+            trace.end()
+        return plaintext
+
+    def _decrypt(self, ciphertext: str, field: str, trace) -> str:
         # Club's "enc:" prefix
         if ciphertext.startswith("enc:"):
+            if trace is not None:
+                trace.stage("decode")
             ciphertext = ciphertext[4:]
             try:
                 ciphertext = base64.urlsafe_b64decode(ciphertext).decode("utf-8")
@@ -162,19 +185,31 @@ class FernetMigrator:
 
         # Try agent AES-GCM format
         if hasattr(self, "_is_agent") and self._is_agent:
+            if trace is not None:
+                trace.stage("aead")
             return self._decrypt_agent_gcm(ciphertext)
 
         # Try Fernet
+        if trace is not None:
+            trace.stage("derive_key")
         fernet = self._get_fernet_for_field(field)
         if not fernet:
             raise ValueError("Migrator not configured")
 
+        if trace is not None:
+            trace.stage("fernet")
         try:
             plaintext = fernet.decrypt(ciphertext.encode("utf-8"))
             return plaintext.decode("utf-8")
-        except InvalidToken:
-            logger.warning(f"Failed to decrypt field {field} - may be plaintext")
-            return ciphertext
+        except InvalidToken as e:
+            if trace is not None:
+                trace.fail(e)
+            return self._passthrough(ciphertext, field)
+
+    def _passthrough(self, ciphertext: str, field: str) -> str:
+        """Value that is not a Fernet token, returned as is (probably plaintext)."""
+        logger.warning(f"Failed to decrypt field {field} - may be plaintext")
+        return ciphertext
 
     def _decrypt_agent_gcm(self, ciphertext: str) -> str:
         """Decrypt agent's AES-256-GCM format."""
@@ -239,19 +274,130 @@ class FernetMigrator:
         return new_crypto.encrypt(plaintext, field)
 
 
-def migrate_database_field(
+def _migrate_row(
+    pk,
+    values,
+    columns: list[str],
+    fields: list[str],
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+    column_stats: dict,
+    table: str,
+    pk_column: str,
+) -> list[tuple[str, str]]:
+    """
+    Migrate every legacy value of one row.
+
+    Returns (column, new_value) pairs for the columns that need writing;
+    NULL and already migrated values are left out.
+    """
+    changes = []
+    for column, field, old_value in zip(columns, fields, values, strict=True):
+        if old_value is None:
+            continue
+
+        col_stats = column_stats[column]
+        try:
+            # Skip already migrated
+            if old_value.startswith("hc1:"):
+                col_stats["skipped"] += 1
+                continue
+
+            changes.append((column, migrator.migrate(old_value, field, new_crypto)))
+            col_stats["migrated"] += 1
+
+        except Exception as e:
+            logger.error(f"Failed to migrate {table}.{column} ({pk_column}={pk}): {e}")
+            col_stats["errors"] += 1
+
+    return changes
+
+
+def _write_changes(
+    cursor,
+    table: str,
+    pk_column: str,
+    updates: list[tuple[object, list[tuple[str, str]]]],
+    placeholder: str,
+) -> None:
+    """
+    Write migrated values back, one UPDATE statement per column set.
+
+    Rows that changed the same columns share a statement and are sent
+    with a single executemany call.
+    """
+    groups: dict[tuple[str, ...], list[tuple]] = {}
+    for pk, changes in updates:
+        key = tuple(column for column, _ in changes)
+        groups.setdefault(key, []).append(tuple(value for _, value in changes) + (pk,))
+
+    for key, params in groups.items():
+        assignments = ", ".join(f"{column} = {placeholder}" for column in key)
+        cursor.executemany(
+            f"UPDATE {table} SET {assignments} WHERE {pk_column} = {placeholder}",
+            params,
+        )
+
+
+def _updates_size(updates: list[tuple[object, list[tuple[str, str]]]]) -> int:
+    """Total length of the values written for a batch."""
+    return sum(len(value or "") for _, changes in updates for _, value in changes)
+
+
+def _count_columns(cursor, table: str, column_names: list[str], stats: dict) -> None:
+    """Count non-NULL values of every column in a single pass."""
+    counts = ", ".join(f"COUNT({column})" for column in column_names)
+    cursor.execute(f"SELECT {counts} FROM {table}")
+    for column, count in zip(column_names, cursor.fetchone(), strict=True):
+        stats["columns"][column]["total"] = count
+
+
+def _new_column_stats(column_names: list[str]) -> dict:
+    return {
+        column: {"migrated": 0, "skipped": 0, "errors": 0}
+        for column in column_names
+    }
+
+
+def _merge_column_stats(stats: dict, batch_stats: dict) -> None:
+    for column, counters in batch_stats.items():
+        target = stats["columns"][column]
+        for key, value in counters.items():
+            target[key] += value
+
+
+def migrate_database_fields(
     db_connection,
     table: str,
     pk_column: str,
-    encrypted_column: str,
-    field: str,
+    columns: dict[str, str],
     migrator: FernetMigrator,
     new_crypto: HouslerCrypto,
     batch_size: int = 1000,
     dry_run: bool = True,
+    placeholder: str = "%s",
+    workers: int | None = None,
+    queue_size: int = 4,
+    read_connection=None,
+    start_after=None,
+    on_commit: Callable[[object], None] | None = None,
+    governor: RateGovernor | None = None,
 ) -> dict:
     """
-    Migrate a database column from legacy encryption to HouslerCrypto.
+    Migrate several columns of a table from legacy encryption in one scan.
+
+    Each row is selected once, all of its legacy columns are migrated
+    together and the new values are written with one UPDATE per row
+    (batched with executemany).
+
+    With ``workers`` set, the migration runs as a pipeline: a reader
+    thread pages through the table by primary key, ``workers`` threads
+    decrypt and re-encrypt, and the calling thread writes and commits.
+    At most ``queue_size + workers`` batches are in flight at any time,
+    and batches are committed strictly in primary key order, so the
+    ``last_pk`` reported after a commit is a valid resume point for
+    ``start_after``. Without workers, batches are read, migrated and
+    committed one after another, paging by primary key in the same way.
 
     WARNING: Always run with dry_run=True first!
 
@@ -259,67 +405,506 @@ def migrate_database_field(
         db_connection: Database connection (supports execute/fetchall)
         table: Table name
         pk_column: Primary key column name
-        encrypted_column: Column with encrypted data
-        field: Field name for HouslerCrypto
+        columns: Mapping of encrypted column -> HouslerCrypto field name,
+            e.g. {"email_enc": "email", "phone_enc": "phone"}
         migrator: FernetMigrator instance
         new_crypto: HouslerCrypto instance
         batch_size: Number of rows per batch
         dry_run: If True, don't actually update
+        placeholder: Parameter placeholder of the DB driver
+            ("%s" for psycopg, "?" for sqlite3)
+        workers: Number of crypto threads; enables the pipelined mode
+        queue_size: Batches buffered between pipeline stages
+        read_connection: Separate connection for the reader stage. Without
+            it the reader shares db_connection under a lock (sqlite3 needs
+            check_same_thread=False for that)
+        start_after: Resume after this primary key
+        on_commit: Called with the last committed primary key after each
+            commit
+        governor: RateGovernor that caps throughput, sets the batch size
+            (batch_size is then ignored) and pauses between commits
 
     Returns:
-        Dict with migration stats
+        Dict with migration stats, per column under "columns"
     """
-    stats = {
+    if not columns:
+        raise ValueError("columns mapping is required")
+
+    column_names = list(columns)
+
+    stats: dict = {
+        "rows": 0,
         "total": 0,
         "migrated": 0,
         "skipped": 0,
         "errors": 0,
         "dry_run": dry_run,
+        "columns": {
+            column: {"total": 0, "migrated": 0, "skipped": 0, "errors": 0}
+            for column in column_names
+        },
     }
 
     cursor = db_connection.cursor()
+    _count_columns(cursor, table, column_names, stats)
+
+    if workers is not None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        _migrate_pipelined(
+            db_connection, read_connection, table, pk_column, columns,
+            migrator, new_crypto, batch_size, dry_run, placeholder,
+            workers, queue_size, start_after, on_commit, governor, stats,
+        )
+    else:
+        _migrate_sequential(
+            db_connection, cursor, table, pk_column, columns,
+            migrator, new_crypto, batch_size, dry_run, placeholder,
+            start_after, on_commit, governor, stats,
+        )
+
+    for key in ("total", "migrated", "skipped", "errors"):
+        stats[key] = sum(col[key] for col in stats["columns"].values())
+
+    if governor is not None:
+        stats["throttle"] = dict(governor.stats)
+
+    return stats
 
-    # Count total
-    cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {encrypted_column} IS NOT NULL")
-    stats["total"] = cursor.fetchone()[0]
+
+def _select_batch_sql(
+    table: str,
+    pk_column: str,
+    column_names: list[str],
+    after_pk: bool,
+    placeholder: str,
+) -> str:
+    """Build the SELECT for one batch, optionally paging by primary key."""
+    select_list = ", ".join(column_names)
+    not_null = " OR ".join(f"{column} IS NOT NULL" for column in column_names)
+    where = f"({not_null})"
+    if after_pk:
+        where = f"{pk_column} > {placeholder} AND {where}"
+    return (
+        f"SELECT {pk_column}, {select_list} FROM {table} "
+        f"WHERE {where} "
+        f"ORDER BY {pk_column} "
+    )
+
+
+def _migrate_sequential(
+    db_connection,
+    cursor,
+    table: str,
+    pk_column: str,
+    columns: dict[str, str],
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+    batch_size: int,
+    dry_run: bool,
+    placeholder: str,
+    start_after,
+    on_commit: Callable[[object], None] | None,
+    governor: RateGovernor | None,
+    stats: dict,
+) -> None:
+    """Read, migrate and write batches one after another, paging by primary key."""
+    column_names = list(columns)
+    fields = [columns[column] for column in column_names]
+    first_sql = _select_batch_sql(table, pk_column, column_names, False, placeholder)
+    next_sql = _select_batch_sql(table, pk_column, column_names, True, placeholder)
 
     # Process in batches
-    offset = 0
+    last_pk = start_after
     while True:
-        cursor.execute(
-            f"SELECT {pk_column}, {encrypted_column} FROM {table} "
-            f"WHERE {encrypted_column} IS NOT NULL "
-            f"LIMIT {batch_size} OFFSET {offset}"
-        )
+        if governor is not None:
+            batch_size = governor.batch_size
+        if last_pk is None:
+            cursor.execute(first_sql + f"LIMIT {batch_size}")
+        else:
+            cursor.execute(next_sql + f"LIMIT {batch_size}", (last_pk,))
         rows = cursor.fetchall()
 
         if not rows:
             break
 
-        for pk, old_value in rows:
-            try:
-                # Skip already migrated
-                if old_value.startswith("hc1:"):
-                    stats["skipped"] += 1
+        batch_stats = _new_column_stats(column_names)
+        updates = []
+        for pk, *values in rows:
+            changes = _migrate_row(
+                pk, values, column_names, fields, migrator, new_crypto,
+                batch_stats, table, pk_column,
+            )
+            if changes:
+                updates.append((pk, changes))
+
+        _merge_column_stats(stats, batch_stats)
+        stats["rows"] += len(rows)
+        last_pk = stats["last_pk"] = rows[-1][0]
+
+        if not dry_run:
+            _write_changes(cursor, table, pk_column, updates, placeholder)
+            db_connection.commit()
+            if on_commit is not None:
+                on_commit(last_pk)
+
+        if governor is not None:
+            governor.throttle(len(rows), _updates_size(updates))
+
+
+def _migrate_pipelined(
+    db_connection,
+    read_connection,
+    table: str,
+    pk_column: str,
+    columns: dict[str, str],
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+    batch_size: int,
+    dry_run: bool,
+    placeholder: str,
+    workers: int,
+    queue_size: int,
+    start_after,
+    on_commit: Callable[[object], None] | None,
+    governor: RateGovernor | None,
+    stats: dict,
+) -> None:
+    """
+    Run reader, crypto and writer stages concurrently.
+
+    The reader pages by primary key (keyset pagination), so batches are
+    independent of the rows the writer updates meanwhile. Crypto workers
+    may finish out of order; the writer buffers results and commits them
+    in sequence. A semaphore released only after a batch is written caps
+    the number of batches held in memory across all stages.
+    """
+    column_names = list(columns)
+    fields = [columns[column] for column in column_names]
+    first_sql = _select_batch_sql(table, pk_column, column_names, False, placeholder)
+    next_sql = _select_batch_sql(table, pk_column, column_names, True, placeholder)
+
+    max_in_flight = max(queue_size, 1) + workers
+    in_flight = threading.Semaphore(max_in_flight)
+    read_queue: queue.Queue = queue.Queue(maxsize=max_in_flight + workers)
+    write_queue: queue.Queue = queue.Queue(maxsize=max_in_flight + 2)
+    stop = threading.Event()
+
+    # Reader and writer share the connection unless a separate one is given
+    shared_lock = threading.Lock() if read_connection is None else None
+    read_connection = read_connection if read_connection is not None else db_connection
+
+    def reader() -> None:
+        nonlocal batch_size
+        seq = 0
+        last_pk = start_after
+        try:
+            read_cursor = read_connection.cursor()
+            while not stop.is_set():
+                if not in_flight.acquire(timeout=0.1):
                     continue
+                if governor is not None:
+                    batch_size = governor.batch_size
+                if last_pk is None:
+                    sql, params = first_sql + f"LIMIT {batch_size}", ()
+                else:
+                    sql, params = next_sql + f"LIMIT {batch_size}", (last_pk,)
+                if shared_lock is not None:
+                    with shared_lock:
+                        read_cursor.execute(sql, params)
+                        rows = read_cursor.fetchall()
+                else:
+                    read_cursor.execute(sql, params)
+                    rows = read_cursor.fetchall()
+
+                if not rows:
+                    in_flight.release()
+                    break
+
+                last_pk = rows[-1][0]
+                read_queue.put((seq, rows))
+                seq += 1
+        except Exception as e:
+            write_queue.put((-1, e))
+        finally:
+            write_queue.put((None, seq))
+            for _ in range(workers):
+                read_queue.put(None)
+
+    def crypto_worker() -> None:
+        while True:
+            item = read_queue.get()
+            if item is None:
+                return
+            seq, rows = item
+            if stop.is_set():
+                continue
+            try:
+                batch_stats = _new_column_stats(column_names)
+                updates = []
+                for pk, *values in rows:
+                    changes = _migrate_row(
+                        pk, values, column_names, fields, migrator, new_crypto,
+                        batch_stats, table, pk_column,
+                    )
+                    if changes:
+                        updates.append((pk, changes))
+                write_queue.put((seq, (len(rows), rows[-1][0], updates, batch_stats)))
+            except Exception as e:
+                write_queue.put((-1, e))
 
-                new_value = migrator.migrate(old_value, field, new_crypto)
+    threads = [threading.Thread(target=reader, name="hc-migrate-reader", daemon=True)]
+    threads += [
+        threading.Thread(target=crypto_worker, name=f"hc-migrate-crypto-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
 
+    cursor = db_connection.cursor()
+    pending: dict[int, tuple] = {}
+    next_seq = 0
+    total_batches: int | None = None
+    try:
+        while total_batches is None or next_seq < total_batches:
+            seq, payload = write_queue.get()
+            if seq is None:
+                total_batches = payload
+                continue
+            if seq < 0:
+                raise payload
+            pending[seq] = payload
+
+            while next_seq in pending:
+                row_count, last_pk, updates, batch_stats = pending.pop(next_seq)
                 if not dry_run:
-                    cursor.execute(
-                        f"UPDATE {table} SET {encrypted_column} = %s WHERE {pk_column} = %s",
-                        (new_value, pk)
-                    )
+                    if shared_lock is not None:
+                        with shared_lock:
+                            _write_changes(cursor, table, pk_column, updates, placeholder)
+                            db_connection.commit()
+                    else:
+                        _write_changes(cursor, table, pk_column, updates, placeholder)
+                        db_connection.commit()
+
+                _merge_column_stats(stats, batch_stats)
+                stats["rows"] += row_count
+                stats["last_pk"] = last_pk
+                next_seq += 1
+
+                if on_commit is not None and not dry_run:
+                    on_commit(last_pk)
+
+                # Throttle before freeing the slot so the reader waits too
+                if governor is not None:
+                    governor.throttle(row_count, _updates_size(updates))
+                in_flight.release()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def recompute_blind_indexes(
+    db_connection,
+    table: str,
+    pk_column: str,
+    indexes: dict[str, tuple[str, str]],
+    crypto: HouslerCrypto,
+    digest_size: int = 16,
+    encoding: str = "base64url",
+    batch_size: int = 1000,
+    dry_run: bool = True,
+    placeholder: str = "%s",
+    governor: RateGovernor | None = None,
+) -> dict:
+    """
+    Recompute blind index columns in a compact form.
 
-                stats["migrated"] += 1
+    Every source value is decrypted (plaintext passes through, as in
+    decrypt()) and hashed with the new digest size and encoding. Rows are
+    paged by primary key; index values that already match are not
+    written, so an interrupted run can simply be started again. Point the
+    index columns at new columns (or drop the old database index first)
+    - a column mixing settings never matches queries for either.
 
-            except Exception as e:
-                logger.error(f"Failed to migrate {table}.{pk_column}={pk}: {e}")
-                stats["errors"] += 1
+    WARNING: Always run with dry_run=True first!
+
+    Args:
+        db_connection: Database connection (supports execute/fetchall)
+        table: Table name
+        pk_column: Primary key column name
+        indexes: Mapping of index column -> (source column, field name),
+            e.g. {"email_hash": ("email_enc", "email")}
+        crypto: HouslerCrypto instance
+        digest_size: Digest size in bytes (8..32)
+        encoding: "hex", "base64url" or "raw" (for BYTEA/BLOB columns)
+        batch_size: Number of rows per batch
+        dry_run: If True, don't actually update
+        placeholder: Parameter placeholder of the DB driver
+        governor: RateGovernor for throttling on a live database
+
+    Returns:
+        Dict with stats, per index column under "columns"
+
+    Raises:
+        ValueError: On an empty mapping, digest size or encoding
+    """
+    if not indexes:
+        raise ValueError("indexes mapping is required")
+    # Validate the setting before touching the table
+    blind_index_length(digest_size, encoding)
+
+    index_columns = list(indexes)
+    sources = [indexes[column] for column in index_columns]
+    select_list = [source for source, _ in sources] + index_columns
+    sql = _select_batch_sql(table, pk_column, select_list, True, placeholder)
+    first_sql = _select_batch_sql(table, pk_column, select_list, False, placeholder)
+
+    stats: dict = {
+        "rows": 0,
+        "updated": 0,
+        "skipped": 0,
+        "errors": 0,
+        "dry_run": dry_run,
+        "columns": {
+            column: {"updated": 0, "skipped": 0, "errors": 0} for column in index_columns
+        },
+    }
+
+    cursor = db_connection.cursor()
+    last_pk = None
+    while True:
+        if governor is not None:
+            batch_size = governor.batch_size
+        if last_pk is None:
+            cursor.execute(first_sql + f"LIMIT {batch_size}")
+        else:
+            cursor.execute(sql + f"LIMIT {batch_size}", (last_pk,))
+        rows = cursor.fetchall()
+        if not rows:
+            break
 
-        offset += batch_size
+        updates = []
+        for pk, *values in rows:
+            changes = []
+            for i, (column, (_, field)) in enumerate(zip(index_columns, sources, strict=True)):
+                source, current = values[i], values[len(sources) + i]
+                col_stats = stats["columns"][column]
+                try:
+                    new_value = None if source is None else crypto.blind_index(
+                        crypto.decrypt(source, field), field,
+                        digest_size=digest_size, encoding=encoding,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to recompute {table}.{column} ({pk_column}={pk}): {e}")
+                    col_stats["errors"] += 1
+                    continue
+                if isinstance(current, memoryview):
+                    current = current.tobytes()
+                if new_value == current:
+                    col_stats["skipped"] += 1
+                    continue
+                changes.append((column, new_value))
+                col_stats["updated"] += 1
+            if changes:
+                updates.append((pk, changes))
+
+        stats["rows"] += len(rows)
+        last_pk = rows[-1][0]
 
         if not dry_run:
+            _write_changes(cursor, table, pk_column, updates, placeholder)
             db_connection.commit()
 
+        if governor is not None:
+            governor.throttle(len(rows), _updates_size(updates))
+
+    for key in ("updated", "skipped", "errors"):
+        stats[key] = sum(col[key] for col in stats["columns"].values())
+
+    logger.info(
+        f"Blind indexes of {table}: {stats['updated']} updated, "
+        f"{stats['skipped']} unchanged, {stats['errors']} errors"
+    )
     return stats
+
+
+def migrate_database_field(
+    db_connection,
+    table: str,
+    pk_column: str,
+    encrypted_column: str,
+    field: str,
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+    batch_size: int = 1000,
+    dry_run: bool = True,
+    placeholder: str = "%s",
+    workers: int | None = None,
+    queue_size: int = 4,
+    read_connection=None,
+    start_after=None,
+    on_commit: Callable[[object], None] | None = None,
+    governor: RateGovernor | None = None,
+) -> dict:
+    """
+    Migrate a database column from legacy encryption to HouslerCrypto.
+
+    WARNING: Always run with dry_run=True first!
+
+    To migrate several columns of the same table, use
+    migrate_database_fields() so the table is scanned only once.
+
+    Args:
+        db_connection: Database connection (supports execute/fetchall)
+        table: Table name
+        pk_column: Primary key column name
+        encrypted_column: Column with encrypted data
+        field: Field name for HouslerCrypto
+        migrator: FernetMigrator instance
+        new_crypto: HouslerCrypto instance
+        batch_size: Number of rows per batch
+        dry_run: If True, don't actually update
+        placeholder: Parameter placeholder of the DB driver
+        workers: Number of crypto threads; enables the pipelined mode
+        queue_size: Batches buffered between pipeline stages
+        read_connection: Separate connection for the pipeline reader stage
+        start_after: Resume after this primary key
+        on_commit: Called with the last committed primary key after each
+            commit
+        governor: RateGovernor for throttling on a live database
+
+    Returns:
+        Dict with migration stats
+    """
+    stats = migrate_database_fields(
+        db_connection,
+        table,
+        pk_column,
+        {encrypted_column: field},
+        migrator,
+        new_crypto,
+        batch_size=batch_size,
+        dry_run=dry_run,
+        placeholder=placeholder,
+        workers=workers,
+        queue_size=queue_size,
+        read_connection=read_connection,
+        start_after=start_after,
+        on_commit=on_commit,
+        governor=governor,
+    )
+    column_stats = stats["columns"][encrypted_column]
+
+    result = {
+        "total": column_stats["total"],
+        "migrated": column_stats["migrated"],
+        "skipped": column_stats["skipped"],
+        "errors": column_stats["errors"],
+        "dry_run": dry_run,
+    }
+    for key in ("last_pk", "throttle"):
+        if key in stats:
+            result[key] = stats[key]
+
+    return result
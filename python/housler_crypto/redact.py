@@ -0,0 +1,123 @@
+"""
+PII redaction for log output.
+
+One combined regular expression finds emails, card numbers, Russian phone
+numbers and INNs in a single pass; matches are rewritten with the ``mask``
+rules (``user@example.com`` -> ``us***@example.com``). Ten- and twelve-digit
+numbers are only treated as INNs when their check digits are valid, and
+card numbers only when their Luhn sum is, so timestamps and ids are left
+alone.
+
+Usage:
+    import logging
+    from housler_crypto.redact import PIIRedactingFilter, PIIRedactingFormatter
+
+    handler = logging.StreamHandler()
+    handler.addFilter(PIIRedactingFilter())         # message and args
+    handler.setFormatter(PIIRedactingFormatter(     # whole line, tracebacks included
+        "%(asctime)s %(levelname)s %(message)s"
+    ))
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from .utils import _digits, mask
+
+# Patterns per kind, shared with the scanner module
+EMAIL_PATTERN = r"(?P<email>[A-Za-z0-9_.+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)"
+CARD_PATTERN = r"(?<!\d)(?P<card>(?:\d{4}[ -]){3}\d{4}|\d{16,19})(?!\d)"
+PHONE_PATTERN = (
+    r"(?<![\d+])(?P<phone>(?:\+7|7|8)[ \-(]{0,2}\d{3}[ \-)]{0,2}\d{3}[ -]?\d{2}[ -]?\d{2})(?!\d)"
+)
+INN_PATTERN = r"(?<!\d)(?P<inn>\d{12}|\d{10})(?!\d)"
+
+_PII = re.compile("|".join((EMAIL_PATTERN, CARD_PATTERN, PHONE_PATTERN, INN_PATTERN)))
+
+# Cheap pre-check: every pattern needs "@" or three digits in a row
+_CANDIDATE = re.compile(r"@|\d{3}")
+
+_INN10_WEIGHTS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_1 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_WEIGHTS_2 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+
+def _check_digit(digits: str, weights: tuple[int, ...]) -> int:
+    return sum(int(d) * w for d, w in zip(digits, weights, strict=False)) % 11 % 10
+
+
+def is_valid_inn(digits: str) -> bool:
+    """Check digits of a 10-digit (company) or 12-digit (individual) INN."""
+    if len(digits) == 10:
+        return _check_digit(digits, _INN10_WEIGHTS) == int(digits[9])
+    if len(digits) == 12:
+        return (
+            _check_digit(digits, _INN12_WEIGHTS_1) == int(digits[10])
+            and _check_digit(digits, _INN12_WEIGHTS_2) == int(digits[11])
+        )
+    return False
+
+
+def is_valid_luhn(digits: str) -> bool:
+    """Luhn check of a card number given as digits only."""
+    total = 0
+    for i, char in enumerate(reversed(digits)):
+        digit = int(char)
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def is_valid_card(value: str) -> bool:
+    """Luhn check of a card number, separators allowed."""
+    return is_valid_luhn(_digits(value))
+
+
+def _replace(match: re.Match) -> str:
+    kind = match.lastgroup
+    value = match.group(kind)
+    if kind == "email":
+        return mask.email(value)
+    if kind == "phone":
+        return mask.phone(value)
+    if kind == "card":
+        return mask.card(value) if is_valid_card(value) else value
+    return mask.inn(value) if is_valid_inn(value) else value
+
+
+def redact(text: str) -> str:
+    """Mask every email, card number, phone number and INN in ``text``."""
+    if not _CANDIDATE.search(text):
+        return text
+    return _PII.sub(_replace, text)
+
+
+class PIIRedactingFilter(logging.Filter):
+    """
+    Masks PII in the message of every record.
+
+    The message is formatted with its args once and redacted; the record
+    then carries the result with no args. Records whose message cannot be
+    formatted are passed on untouched, so the handler reports the error.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            message = record.getMessage()
+        except Exception:
+            return True
+        record.msg = redact(message)
+        record.args = None
+        return True
+
+
+class PIIRedactingFormatter(logging.Formatter):
+    """Masks PII in the fully formatted line, including tracebacks."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(super().format(record))
@@ -0,0 +1,292 @@
+"""
+Declarative record schemas.
+
+Describe once how each attribute of a record is stored - key derivation
+field, normalizer, blind index, mask, encryption - and compile the schema
+into a plan with keys derived and functions bound. Plans then process
+dicts or batches of dicts in a tight loop.
+
+Compiled plans use the derived keys directly, so per-call metrics and
+tracing hooks on the HouslerCrypto instance do not see their operations.
+
+Usage:
+    from housler_crypto.schema import Attribute, RecordSchema
+
+    schema = RecordSchema({
+        "phone": Attribute(normalize="phone", blind_index=True, mask="phone"),
+        "email": Attribute(normalize="email", blind_index="email_hash", mask="email"),
+        "full_name": Attribute(field="name", mask="name"),
+    })
+    plan = schema.compile(crypto)
+
+    row = plan.encrypt({"phone": "8 (999) 123-45-67", "email": "User@Example.com"})
+    # {"phone": "hc1:...", "phone_hash": "...", "email": "hc1:...", "email_hash": "..."}
+    logger.info(f"Saved {plan.mask(record)}")
+
+    reader = plan.decryptor(["email"])
+    reader.decrypt(row)["email"]  # "user@example.com"
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable, Iterable
+
+from .core import (
+    BLIND_INDEX_SIZE,
+    ENCRYPTED_PREFIX,
+    IV_LENGTH,
+    HouslerCrypto,
+    _aesgcm,
+    _blind_index_encoder,
+    _blind_index_input,
+    _pack,
+)
+from .utils import mask, normalize_email, normalize_phone
+
+NORMALIZERS: dict[str, Callable[[str], str]] = {
+    "phone": normalize_phone,
+    "email": normalize_email,
+    "strip": str.strip,
+}
+
+MASKS: dict[str, Callable[[str], str]] = {
+    "email": mask.email,
+    "phone": mask.phone,
+    "name": mask.name,
+    "inn": mask.inn,
+    "card": mask.card,
+}
+
+
+class Attribute:
+    """
+    How one record attribute is stored.
+
+    Args:
+        field: Key derivation field (default: the attribute name)
+        normalize: "phone", "email", "strip" or a callable, applied before
+            encryption and blind indexing
+        encrypt: Store the value encrypted (False keeps it as is)
+        blind_index: True for "<name>_hash", or the output key name
+        mask: Mask kind ("email", "phone", "name", "inn", "card") or a
+            callable, used by mask()
+        digest_size: Blind index digest size in bytes (8..32)
+        encoding: Blind index encoding, "hex", "base64url" (unpadded) or
+            "raw" (bytes)
+
+    Raises:
+        ValueError: On an unknown normalizer or mask kind, or invalid
+            blind index settings
+    """
+
+    def __init__(
+        self,
+        field: str | None = None,
+        normalize: str | Callable[[str], str] | None = None,
+        encrypt: bool = True,
+        blind_index: bool | str = False,
+        mask: str | Callable[[str], str] | None = None,
+        digest_size: int = BLIND_INDEX_SIZE,
+        encoding: str = "hex",
+    ):
+        _blind_index_encoder(digest_size, encoding)
+        if isinstance(normalize, str) and normalize not in NORMALIZERS:
+            raise ValueError(f"Unknown normalizer {normalize!r}, expected one of {list(NORMALIZERS)}")
+        if isinstance(mask, str) and mask not in MASKS:
+            raise ValueError(f"Unknown mask {mask!r}, expected one of {list(MASKS)}")
+
+        self.field = field
+        self.normalize = NORMALIZERS[normalize] if isinstance(normalize, str) else normalize
+        self.encrypt = encrypt
+        self.blind_index = blind_index
+        self.mask = MASKS[mask] if isinstance(mask, str) else mask
+        self.digest_size = digest_size
+        self.encoding = encoding
+
+
+class RecordSchema:
+    """
+    Mapping of record attribute names to Attribute.
+
+    Args:
+        attributes: {name: Attribute}
+    """
+
+    def __init__(self, attributes: dict[str, Attribute]):
+        self.attributes = dict(attributes)
+
+        outputs = set(self.attributes)
+        for name, attribute in self.attributes.items():
+            output = self._blind_index_key(name, attribute)
+            if output is None:
+                continue
+            if output in outputs:
+                raise ValueError(f"Blind index key {output!r} of {name!r} is already used")
+            outputs.add(output)
+
+    @staticmethod
+    def _blind_index_key(name: str, attribute: Attribute) -> str | None:
+        if attribute.blind_index is True:
+            return f"{name}_hash"
+        return attribute.blind_index or None
+
+    def compile(self, crypto: HouslerCrypto) -> RecordPlan:
+        """Derive keys and bind functions for ``crypto``."""
+        return RecordPlan(self, crypto)
+
+
+class RecordPlan:
+    """
+    Compiled RecordSchema for one HouslerCrypto instance.
+
+    Records are dicts holding plaintext values; missing and None values are
+    skipped, other values must be str. Input records are not modified.
+    """
+
+    def __init__(self, schema: RecordSchema, crypto: HouslerCrypto):
+        self._crypto = crypto
+        self._fields: dict[str, str] = {}
+        # (name, normalize, aesgcm or None, blind index or None), the blind index
+        # being (key, output, digest size, encoder, empty value)
+        self._steps: list[tuple] = []
+        self._masks: list[tuple[str, Callable[[str], str]]] = []
+
+        for name, attribute in schema.attributes.items():
+            field = attribute.field or name
+            self._fields[name] = field
+            output = RecordSchema._blind_index_key(name, attribute)
+            blind_index = None
+            if output:
+                blind_index = (
+                    crypto._blind_index_key(field),
+                    output,
+                    attribute.digest_size,
+                    _blind_index_encoder(attribute.digest_size, attribute.encoding),
+                    b"" if attribute.encoding == "raw" else "",
+                )
+            aesgcm = _aesgcm(crypto._derive_key(field)) if attribute.encrypt else None
+            if aesgcm is not None or blind_index is not None or attribute.normalize is not None:
+                self._steps.append((name, attribute.normalize, aesgcm, blind_index))
+            if attribute.mask is not None:
+                self._masks.append((name, attribute.mask))
+
+        self._encrypted_count = sum(1 for step in self._steps if step[2] is not None)
+
+    def encrypt(self, record: dict) -> dict:
+        """Normalize, blind index and encrypt one record."""
+        return self.encrypt_many([record])[0]
+
+    def encrypt_many(self, records: Iterable[dict]) -> list[dict]:
+        """
+        Normalize, blind index and encrypt a batch of records.
+
+        Already encrypted values pass through with their stored blind
+        index, so running a plan again over its output changes nothing.
+
+        Raises:
+            TypeError: If a value is neither None nor str
+        """
+        records = list(records)
+        ivs = os.urandom(IV_LENGTH * self._encrypted_count * len(records))
+        position = 0
+        blake2b = hashlib.blake2b
+        blind_index_input = _blind_index_input
+        steps = self._steps
+
+        result = []
+        append = result.append
+        for record in records:
+            out = dict(record)
+            for name, normalize, aesgcm, blind_index in steps:
+                value = out.get(name)
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    raise TypeError(f"Expected a str value for {name!r}, got {type(value).__name__}")
+                if value.startswith(ENCRYPTED_PREFIX):
+                    # Already encrypted: keep the value and its stored blind index
+                    continue
+                if normalize is not None:
+                    value = normalize(value)
+
+                if blind_index is not None:
+                    hash_key, output, digest_size, encode, empty = blind_index
+                    out[output] = encode(blake2b(
+                        blind_index_input(value), key=hash_key, digest_size=digest_size,
+                    )) if value else empty
+
+                if aesgcm is None:
+                    out[name] = value
+                    continue
+                iv = ivs[position:position + IV_LENGTH]
+                position += IV_LENGTH
+                if value:
+                    value = _pack(iv, aesgcm.encrypt(iv, value.encode("utf-8"), None))
+                out[name] = value
+            append(out)
+
+        return result
+
+    def mask(self, record: dict) -> dict:
+        """Copy of a plaintext record with masked values, for logs and display."""
+        out = dict(record)
+        for name, mask_value in self._masks:
+            value = out.get(name)
+            if value is not None:
+                out[name] = mask_value(value)
+        return out
+
+    def mask_many(self, records: Iterable[dict]) -> list[dict]:
+        """mask() for a batch of records."""
+        return mask.apply(records, dict(self._masks))
+
+    def decryptor(self, names: Iterable[str] | None = None) -> DecryptPlan:
+        """
+        Plan decrypting only ``names`` (default: every encrypted attribute).
+
+        Raises:
+            ValueError: If a name is not an encrypted attribute of the schema
+        """
+        encrypted = {step[0]: step[2] for step in self._steps if step[2] is not None}
+        names = list(encrypted) if names is None else list(names)
+        for name in names:
+            if name not in encrypted:
+                raise ValueError(f"{name!r} is not an encrypted attribute")
+        return DecryptPlan(
+            self._crypto, [(name, self._fields[name], encrypted[name]) for name in names],
+        )
+
+
+class DecryptPlan:
+    """Decrypts a fixed subset of attributes; other keys are copied as they are."""
+
+    def __init__(self, crypto: HouslerCrypto, steps: list[tuple]):
+        self._crypto = crypto
+        # (name, field, aesgcm)
+        self._steps = steps
+
+    def decrypt(self, record: dict) -> dict:
+        """
+        Decrypt one record.
+
+        Raises:
+            TypeError: If a value is neither None nor str
+            ValueError: If a value fails to decrypt
+        """
+        decrypt_packed = self._crypto._decrypt_packed
+        out = dict(record)
+        for name, field, aesgcm in self._steps:
+            value = out.get(name)
+            if value is None:
+                continue
+            if not isinstance(value, str):
+                raise TypeError(f"Expected a str value for {name!r}, got {type(value).__name__}")
+            if value.startswith(ENCRYPTED_PREFIX):
+                out[name] = decrypt_packed(aesgcm, value, field)
+        return out
+
+    def decrypt_many(self, records: Iterable[dict]) -> list[dict]:
+        """decrypt() for a batch of records."""
+        return [self.decrypt(record) for record in records]
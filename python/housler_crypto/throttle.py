@@ -0,0 +1,176 @@
+"""
+Adaptive throttling for long-running migrations on live databases.
+
+RateGovernor caps throughput (rows/sec and/or bytes/sec) and reacts to an
+optional health probe, e.g. one that reports replica lag:
+
+- unhealthy: batch size is halved and the pause between commits doubles
+- healthy: batch size grows back step by step and the pause decays
+
+The governor never stops on its own, so a migration backs off while the
+database is under pressure and recovers without a restart.
+
+Usage:
+    from housler_crypto.throttle import RateGovernor
+
+    governor = RateGovernor(
+        max_rows_per_sec=2000,
+        health_probe=lambda: replica_lag_seconds(),
+        max_lag=2.0,
+    )
+    migrate_database_fields(..., governor=governor)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class RateGovernor:
+    """
+    Rate limiter with AIMD batch sizing for migration loops.
+
+    The migration asks for ``batch_size`` before reading a batch and calls
+    ``throttle()`` after committing it.
+
+    Args:
+        max_rows_per_sec: Throughput cap in rows per second (None = no cap)
+        max_bytes_per_sec: Throughput cap in written bytes per second
+        health_probe: Callable returning the current lag in seconds (or a
+            bool, True meaning healthy); called once per commit
+        max_lag: Lag above which the database counts as unhealthy
+        batch_size: Initial batch size
+        min_batch_size: Lower bound when backing off
+        max_batch_size: Upper bound when recovering
+        base_pause: First pause after the database turns unhealthy
+        max_pause: Upper bound for the pause between commits
+        commit_interval: Target seconds per batch while rate-capped; the
+            batch size is limited so that commits stay this frequent
+        clock: Monotonic time source (for tests)
+        sleep: Sleep function (for tests)
+    """
+
+    def __init__(
+        self,
+        max_rows_per_sec: float | None = None,
+        max_bytes_per_sec: float | None = None,
+        health_probe: Callable[[], float | bool] | None = None,
+        max_lag: float = 1.0,
+        batch_size: int = 1000,
+        min_batch_size: int = 10,
+        max_batch_size: int = 10_000,
+        base_pause: float = 0.5,
+        max_pause: float = 30.0,
+        commit_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if max_rows_per_sec is not None and max_rows_per_sec <= 0:
+            raise ValueError("max_rows_per_sec must be positive")
+        if max_bytes_per_sec is not None and max_bytes_per_sec <= 0:
+            raise ValueError("max_bytes_per_sec must be positive")
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise ValueError("min_batch_size must be between 1 and max_batch_size")
+
+        self._max_rows_per_sec = max_rows_per_sec
+        self._max_bytes_per_sec = max_bytes_per_sec
+        self._health_probe = health_probe
+        self._max_lag = max_lag
+        self._min_batch_size = min_batch_size
+        self._max_batch_size = max_batch_size
+        self._base_pause = base_pause
+        self._max_pause = max_pause
+        self._clock = clock
+        self._sleep = sleep
+
+        # While rate-capped, keep batches small enough to commit regularly
+        if max_rows_per_sec is not None:
+            self._max_batch_size = max(
+                min_batch_size,
+                min(max_batch_size, int(max_rows_per_sec * commit_interval)),
+            )
+        self._step = max(1, self._max_batch_size // 10)
+
+        self._batch_size = max(min_batch_size, min(batch_size, self._max_batch_size))
+        self._pause = 0.0
+        self._last: float | None = None
+
+        self.stats = {
+            "batches": 0,
+            "backoffs": 0,
+            "throttled_seconds": 0.0,
+            "paused_seconds": 0.0,
+        }
+
+    @property
+    def batch_size(self) -> int:
+        """Number of rows to read for the next batch."""
+        return self._batch_size
+
+    @property
+    def pause(self) -> float:
+        """Current pause between commits in seconds."""
+        return self._pause
+
+    def throttle(self, rows: int, nbytes: int = 0) -> None:
+        """
+        Account for a committed batch and wait as long as needed.
+
+        Sleeps to keep throughput under the configured caps, then checks
+        the health probe and adapts batch size and pause.
+        """
+        self.stats["batches"] += 1
+        now = self._clock()
+
+        if self._last is not None:
+            needed = 0.0
+            if self._max_rows_per_sec is not None:
+                needed = rows / self._max_rows_per_sec
+            if self._max_bytes_per_sec is not None:
+                needed = max(needed, nbytes / self._max_bytes_per_sec)
+
+            wait = needed - (now - self._last)
+            if wait > 0:
+                self.stats["throttled_seconds"] += wait
+                self._sleep(wait)
+
+        if self._health_probe is not None:
+            if self._is_healthy():
+                self._recover()
+            else:
+                self._back_off()
+
+        if self._pause > 0:
+            self.stats["paused_seconds"] += self._pause
+            self._sleep(self._pause)
+
+        self._last = self._clock()
+
+    def _is_healthy(self) -> bool:
+        try:
+            value = self._health_probe()
+        except Exception as e:
+            # A failing probe is treated as pressure, not as a fatal error
+            logger.warning(f"Health probe failed: {e}")
+            return False
+
+        if isinstance(value, bool):
+            return value
+        return value <= self._max_lag
+
+    def _back_off(self) -> None:
+        self.stats["backoffs"] += 1
+        self._batch_size = max(self._min_batch_size, self._batch_size // 2)
+        self._pause = min(self._max_pause, max(self._pause * 2, self._base_pause))
+        logger.info(
+            f"Database unhealthy, backing off: batch_size={self._batch_size}, "
+            f"pause={self._pause:.2f}s"
+        )
+
+    def _recover(self) -> None:
+        self._batch_size = min(self._max_batch_size, self._batch_size + self._step)
+        self._pause = self._pause / 2 if self._pause >= 0.01 else 0.0
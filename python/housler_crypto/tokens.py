@@ -0,0 +1,176 @@
+"""
+Token blind indexes for prefix and partial search.
+
+A blind index only supports exact matches. A TokenIndex splits the
+normalized value into tokens - word prefixes, character n-grams or whole
+words - and stores a keyed hash of each, so "starts with" and "contains"
+queries become set lookups on hashes. Store the hashes of a row in an
+array column with a GIN index (``text[]`` in Postgres) or in a side table
+of (row id, token hash), and search for rows holding every hash returned
+by ``query()``.
+
+Tokens leak more than a blind index: rows sharing a prefix or n-gram are
+linkable. Keep digests short and token counts bounded, and only index
+fields that need partial search.
+
+Usage:
+    from housler_crypto.tokens import TokenIndex
+
+    surnames = TokenIndex(crypto, "last_name", mode="prefix")
+    surnames.tokens("Петров")       # hashes of "пет", "петр", "петро", "петров"
+    surnames.query("Петр")          # [hash of "петр"]
+    # SELECT * FROM users WHERE last_name_tokens @> %s
+
+    for row_id, hashes in zip(ids, surnames.tokens_many(values)):
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Iterable, Iterator
+
+from .core import HouslerCrypto, _blind_index_encoder
+from .utils import normalize_field
+
+PREFIX = "prefix"
+NGRAM = "ngram"
+WORD = "word"
+
+MODES = (PREFIX, NGRAM, WORD)
+
+# Word mode splits on anything but letters and digits
+_WORD = re.compile(r"[^\W_]+")
+
+
+class TokenIndex:
+    """
+    Keyed token hashes of one field.
+
+    Values are normalized for their field (utils.normalize_field), then:
+
+    - "prefix": prefixes of every whitespace-separated word, from
+      ``min_length`` up to ``max_length`` characters
+    - "ngram": character n-grams of ``ngram_size`` over the whole value
+    - "word": words of letters and digits, at least ``min_length`` long
+
+    Args:
+        crypto: HouslerCrypto instance
+        field: Field name for normalization and key derivation
+        mode: "prefix", "ngram" or "word"
+        min_length: Shortest prefix or word
+        max_length: Longest prefix; longer query terms are cut to it
+        ngram_size: N-gram length
+        max_tokens: Tokens kept per value, to bound index growth; text
+            past the limit cannot be found
+        digest_size: Digest size in bytes (8..32)
+        encoding: "hex", "base64url" (unpadded) or "raw" (bytes)
+
+    Raises:
+        ValueError: On an unknown mode, bad lengths or blind index settings
+    """
+
+    def __init__(
+        self,
+        crypto: HouslerCrypto,
+        field: str,
+        mode: str = PREFIX,
+        min_length: int = 3,
+        max_length: int = 16,
+        ngram_size: int = 3,
+        max_tokens: int = 32,
+        digest_size: int = 8,
+        encoding: str = "hex",
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        if not 1 <= min_length <= max_length:
+            raise ValueError("Lengths must satisfy 1 <= min_length <= max_length")
+        if ngram_size < 1 or max_tokens < 1:
+            raise ValueError("ngram_size and max_tokens must be at least 1")
+
+        self.field = field
+        self.mode = mode
+        self.min_length = min_length
+        self.max_length = max_length
+        self.ngram_size = ngram_size
+        self.max_tokens = max_tokens
+        self._encode = _blind_index_encoder(digest_size, encoding)
+        self._digest_size = digest_size
+
+        # Tokens of different modes (and n-gram sizes) must never match
+        key_name = f"{field}:token_index:{mode}"
+        if mode == NGRAM:
+            key_name += str(ngram_size)
+        self._key = crypto._derive_key(key_name)[:32]
+
+    def _split(self, value: str) -> list[str]:
+        """Distinct tokens of a normalized value, in order, capped at max_tokens."""
+        if self.mode == PREFIX:
+            low, high = self.min_length, self.max_length
+            candidates = (
+                word[:length]
+                for word in value.split()
+                for length in range(low, min(len(word), high) + 1)
+            )
+        elif self.mode == NGRAM:
+            size = self.ngram_size
+            candidates = (value[i:i + size] for i in range(len(value) - size + 1))
+        else:
+            candidates = (word for word in _WORD.findall(value) if len(word) >= self.min_length)
+
+        tokens: dict[str, None] = {}
+        limit = self.max_tokens
+        for token in candidates:
+            tokens[token] = None
+            if len(tokens) >= limit:
+                break
+        return list(tokens)
+
+    def _hash_all(self, tokens: list[str]) -> list[str | bytes]:
+        blake2b = hashlib.blake2b
+        key = self._key
+        size = self._digest_size
+        encode = self._encode
+        return [encode(blake2b(t.encode("utf-8"), key=key, digest_size=size)) for t in tokens]
+
+    def tokens(self, value: str | None) -> list[str | bytes]:
+        """Token hashes to store for a value; empty for empty values."""
+        if not value:
+            return []
+        return self._hash_all(self._split(normalize_field(value, self.field)))
+
+    def tokens_many(self, values: Iterable[str | None]) -> Iterator[list[str | bytes]]:
+        """tokens() for every value, yielded lazily for backfills."""
+        split = self._split
+        hash_all = self._hash_all
+        field = self.field
+        for value in values:
+            yield hash_all(split(normalize_field(value, field))) if value else []
+
+    def query(self, term: str) -> list[str | bytes]:
+        """
+        Token hashes a matching row must all contain.
+
+        Prefix mode gives one hash per word of the term (cut to
+        max_length), so "петр ива" finds "Петров Иван"; n-gram and word
+        modes give the term's own tokens. Matches are candidates: cut
+        prefixes and n-grams can match more rows than the term, so
+        decrypt and compare when exact results are needed.
+
+        Raises:
+            ValueError: If the term has no token long enough to search
+        """
+        normalized = normalize_field(term, self.field) if term else ""
+        if self.mode == PREFIX:
+            tokens = list(dict.fromkeys(
+                word[:self.max_length]
+                for word in normalized.split()
+                if len(word) >= self.min_length
+            ))
+        else:
+            tokens = self._split(normalized)
+        if not tokens:
+            raise ValueError(f"Search term {term!r} is too short for the {self.mode} index")
+        return self._hash_all(tokens)
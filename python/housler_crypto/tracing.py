@@ -0,0 +1,204 @@
+"""
+Tracing and profiling hooks around key derivation, base64 and AEAD calls.
+
+Hooks get an enter/exit callback for every stage of a traced call, so they
+can open OpenTelemetry-style spans or feed a profiler:
+
+    operation                   stages
+    encrypt                     total > derive_key, aead, encode
+    encrypt_deterministic       total > derive_key, aead, encode
+    decrypt                     total > decode, derive_key, aead
+    blind_index                 total > derive_key, hash
+    compound_blind_index        total > derive_key, hash
+    legacy_decrypt              total > decode, derive_key, fernet | aead (agent)
+    encrypt_many, decrypt_many, total > derive_key, aead
+    encrypt_deterministic_many
+    blind_index_many,           total > derive_key, hash
+    compound_blind_index_many
+
+Batch operations report their whole value loop as one aead or hash stage.
+Compound indexes use the field names joined with "+" as their field. A
+legacy value that is not a Fernet token (returned as is, probably
+plaintext) ends its fernet stage with InvalidToken.
+
+The stages are reported by HouslerCrypto and FernetMigrator themselves.
+``should_trace()`` is asked once per call; instances without hooks skip
+tracing with a single attribute check. Empty and passthrough values
+(already encrypted, or not encrypted on decrypt) are not traced.
+
+Usage:
+    from housler_crypto.tracing import SamplingProfiler, attach_hooks
+
+    profiler = SamplingProfiler(every=1000)
+    attach_hooks(crypto, profiler)
+    ...
+    print(profiler.snapshot())
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+
+class TraceHooks:
+    """
+    Base class for tracing hooks; override the callbacks you need.
+
+    Hooks run on the calling thread and must not raise.
+    """
+
+    def should_trace(self, operation: str, field: str) -> bool:
+        """Decide whether this call is traced. Called once per call."""
+        return True
+
+    def enter(self, operation: str, stage: str, field: str) -> object:
+        """Stage starts. The return value is passed back to exit()."""
+        return None
+
+    def exit(
+        self,
+        operation: str,
+        stage: str,
+        field: str,
+        state: object,
+        error: BaseException | None,
+    ) -> None:
+        """Stage ends, with the exception if it failed."""
+
+
+class SamplingProfiler(TraceHooks):
+    """
+    Records stage timings for 1-in-N calls.
+
+    Cheap enough to stay enabled in production: untraced calls cost one
+    counter increment.
+
+    Args:
+        every: Trace one call out of ``every``
+    """
+
+    def __init__(self, every: int = 100):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self._every = every
+        self._calls = itertools.count(1)
+        self._lock = threading.Lock()
+        # (operation, stage) -> [count, total, max]
+        self._timings: dict[tuple[str, str], list] = {}
+
+    def should_trace(self, operation: str, field: str) -> bool:
+        return next(self._calls) % self._every == 0
+
+    def enter(self, operation: str, stage: str, field: str) -> float:
+        return time.perf_counter()
+
+    def exit(
+        self,
+        operation: str,
+        stage: str,
+        field: str,
+        state: object,
+        error: BaseException | None,
+    ) -> None:
+        elapsed = time.perf_counter() - state
+        key = (operation, stage)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                self._timings[key] = [1, elapsed, elapsed]
+            else:
+                timing[0] += 1
+                timing[1] += elapsed
+                if elapsed > timing[2]:
+                    timing[2] = elapsed
+
+    def snapshot(self) -> dict:
+        """{operation: {stage: {"count", "total_seconds", "mean_seconds", "max_seconds"}}}"""
+        with self._lock:
+            timings = {key: list(value) for key, value in self._timings.items()}
+
+        result: dict = {}
+        for (operation, stage), (count, total, peak) in sorted(timings.items()):
+            result.setdefault(operation, {})[stage] = {
+                "count": count,
+                "total_seconds": total,
+                "mean_seconds": total / count,
+                "max_seconds": peak,
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+
+
+class _Tracer:
+    """Installed as ``_tracer`` on a traced instance; starts a _Trace for sampled calls."""
+
+    __slots__ = ("_hooks",)
+
+    def __init__(self, hooks: TraceHooks):
+        self._hooks = hooks
+
+    def start(self, operation: str, field: str) -> _Trace | None:
+        hooks = self._hooks
+        if not hooks.should_trace(operation, field):
+            return None
+        return _Trace(hooks, operation, field)
+
+
+class _Trace:
+    """
+    One traced call: the "total" stage and a sequence of inner stages.
+
+    stage() ends the current inner stage and enters the next, fail() ends
+    it with an error, end() closes whatever is open.
+    """
+
+    __slots__ = ("_hooks", "_operation", "_field", "_total", "_stage", "_state")
+
+    def __init__(self, hooks: TraceHooks, operation: str, field: str):
+        self._hooks = hooks
+        self._operation = operation
+        self._field = field
+        self._stage: str | None = None
+        self._state = None
+        self._total = hooks.enter(operation, "total", field)
+
+    def stage(self, name: str) -> None:
+        if self._stage is not None:
+            self.fail(None)
+        self._stage = name
+        self._state = self._hooks.enter(self._operation, name, self._field)
+
+    def fail(self, error: BaseException | None) -> None:
+        if self._stage is not None:
+            self._hooks.exit(self._operation, self._stage, self._field, self._state, error)
+            self._stage = None
+
+    def end(self, error: BaseException | None = None) -> None:
+        self.fail(error)
+        self._hooks.exit(self._operation, "total", self._field, self._total, error)
+
+
+def attach_hooks(obj, hooks: TraceHooks):
+    """
+    Trace a HouslerCrypto or FernetMigrator instance with ``hooks``.
+
+    Returns the same instance. Call detach_hooks() to stop.
+    """
+    from .core import HouslerCrypto
+    from .migration import FernetMigrator
+
+    if not isinstance(obj, (HouslerCrypto, FernetMigrator)):
+        raise TypeError(f"Cannot attach hooks to {type(obj).__name__}")
+
+    obj._tracer = _Tracer(hooks)
+    return obj
+
+
+def detach_hooks(obj) -> None:
+    """Remove hooks attached with attach_hooks()."""
+    obj.__dict__.pop("_tracer", None)
@@ -1,8 +1,34 @@
 """
 PII utility functions: masking, normalization, validation.
+
+Batch variants (normalize_phones, validate_emails, ...) return the same
+results as the single-value functions, plus validity as a bytearray of
+0/1 flags that can be wrapped without copying, e.g. with
+``numpy.frombuffer(valid, dtype=bool)``. ``mask.emails()``, ``mask.phones()``
+and friends mask whole columns, ``mask.apply()`` batches of dict records.
+
+``batched()`` and ``ordered_pool_map()`` are the shared plumbing of the
+CLI, Parquet and scanner worker pools.
 """
 
 import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+
+_NON_DIGIT = re.compile(r"\D")
+_DMY_DATE = re.compile(r"(\d{1,2})[./-](\d{1,2})[./-](\d{4})")
+_EMAIL = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+# Every byte except ASCII digits, for bytes.translate(None, delete)
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 0x30 <= c <= 0x39)
+
+
+def _digits(value: str) -> str:
+    r"""Same as re.sub(r"\D", "", value); ASCII input takes a translate fast path."""
+    if value.isascii():
+        return value.encode("ascii").translate(None, _NON_DIGIT_BYTES).decode("ascii")
+    # \d also matches non-ASCII decimal digits
+    return _NON_DIGIT.sub("", value)
 
 
 def normalize_phone(phone: str) -> str:
@@ -22,7 +48,7 @@ def normalize_phone(phone: str) -> str:
         return ""
 
     # Keep only digits
-    digits = re.sub(r"\D", "", phone)
+    digits = _digits(phone)
 
     # Convert 8 to 7 for Russian numbers
     if len(digits) == 11 and digits.startswith("8"):
@@ -47,6 +73,78 @@ def normalize_email(email: str) -> str:
     return email.lower().strip()
 
 
+def normalize_name(name: str) -> str:
+    """
+    Normalize a person name for consistent hashing.
+
+    - Lowercase
+    - "ё" -> "е"
+    - Collapse whitespace
+
+    Examples:
+        "  Пётр   ПЕТРОВ " -> "петр петров"
+    """
+    if not name:
+        return ""
+    return " ".join(name.lower().replace("ё", "е").split())
+
+
+def normalize_date(value: str) -> str:
+    """
+    Normalize a date to ISO format (YYYY-MM-DD).
+
+    Accepts ISO dates and DD.MM.YYYY (also with "/" or "-"); anything
+    else is only stripped.
+
+    Examples:
+        "01.02.1990" -> "1990-02-01"
+    """
+    if not value:
+        return ""
+    value = value.strip()
+    match = _DMY_DATE.fullmatch(value)
+    if match:
+        day, month, year = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return value
+
+
+def _normalize_digits(value: str) -> str:
+    return _digits(value) if value else ""
+
+
+def _normalize_default(value: str) -> str:
+    return value.lower().strip() if value else ""
+
+
+# Normalization of compound blind index parts, by field name
+FIELD_NORMALIZERS = {
+    "phone": normalize_phone,
+    "email": normalize_email,
+    "name": normalize_name,
+    "first_name": normalize_name,
+    "last_name": normalize_name,
+    "middle_name": normalize_name,
+    "full_name": normalize_name,
+    "birth_date": normalize_date,
+    "inn": _normalize_digits,
+    "snils": _normalize_digits,
+    "passport": _normalize_digits,
+    "passport_series": _normalize_digits,
+    "passport_number": _normalize_digits,
+    "card": _normalize_digits,
+}
+
+
+def normalize_field(value: str, field: str) -> str:
+    """
+    Normalize a value by its field name (see FIELD_NORMALIZERS).
+
+    Unknown fields get the blind index normalization: lowercase and strip.
+    """
+    return FIELD_NORMALIZERS.get(field, _normalize_default)(value)
+
+
 class _Mask:
     """
     PII masking utilities for logging and display.
@@ -87,7 +185,7 @@ class _Mask:
         if not phone:
             return "***"
 
-        digits = re.sub(r"\D", "", phone)
+        digits = _digits(phone)
         if len(digits) < 4:
             return "***"
 
@@ -128,7 +226,7 @@ class _Mask:
         if not inn:
             return "***"
 
-        digits = re.sub(r"\D", "", inn)
+        digits = _digits(inn)
         if len(digits) < 6:
             return "***"
 
@@ -153,36 +251,315 @@ class _Mask:
         if not card_number:
             return "***"
 
-        digits = re.sub(r"\D", "", card_number)
+        digits = _digits(card_number)
         if len(digits) < 4:
             return "***"
 
         return f"**** **** **** {digits[-4:]}"
 
+    # Batch variants: same output as the single-value methods, with the
+    # digit extraction and string building inlined into one loop
+
+    @staticmethod
+    def emails(emails: Iterable[str]) -> list[str]:
+        """email() for a batch of values."""
+        result = []
+        append = result.append
+        for email in emails:
+            if not email:
+                append("***")
+                continue
+            local, at, domain = email.partition("@")
+            if not at:
+                append("***")
+            elif len(local) <= 2:
+                append("***@" + domain)
+            else:
+                append(local[:2] + "***@" + domain)
+        return result
+
+    @staticmethod
+    def phones(phones: Iterable[str]) -> list[str]:
+        """phone() for a batch of values."""
+        digits_of = _digits
+        result = []
+        append = result.append
+        for phone in phones:
+            if not phone:
+                append("***")
+                continue
+            digits = digits_of(phone)
+            if len(digits) < 4:
+                append("***")
+            elif phone[0] == "+":
+                append("+" + digits[0] + "***" + digits[-4:])
+            else:
+                append(digits[0] + "***" + digits[-4:])
+        return result
+
+    @staticmethod
+    def names(names: Iterable[str]) -> list[str]:
+        """name() for a batch of values."""
+        result = []
+        append = result.append
+        for name in names:
+            if not name:
+                append("***")
+                continue
+            masked = []
+            for part in name.split():
+                masked.append(part[:2] + "***" if len(part) > 2 else "***")
+            append(" ".join(masked))
+        return result
+
+    @staticmethod
+    def inns(inns: Iterable[str]) -> list[str]:
+        """inn() for a batch of values."""
+        digits_of = _digits
+        result = []
+        append = result.append
+        for value in inns:
+            if not value:
+                append("***")
+                continue
+            digits = digits_of(value)
+            append(digits[:2] + "***" + digits[-4:] if len(digits) >= 6 else "***")
+        return result
+
+    @staticmethod
+    def cards(card_numbers: Iterable[str]) -> list[str]:
+        """card() for a batch of values."""
+        digits_of = _digits
+        result = []
+        append = result.append
+        for value in card_numbers:
+            if not value:
+                append("***")
+                continue
+            digits = digits_of(value)
+            append("**** **** **** " + digits[-4:] if len(digits) >= 4 else "***")
+        return result
+
+    def apply(self, records: Iterable[dict], schema) -> list[dict]:
+        """
+        Mask a batch of dict records column by column.
+
+        Args:
+            records: Plaintext records; they are not modified
+            schema: {key: kind or callable}, kinds being "email", "phone",
+                "name", "inn" and "card"; or a RecordSchema, whose attribute
+                masks are used
+
+        Returns:
+            Copies of the records with masked values; missing and None
+            values are left as they are
+
+        Raises:
+            ValueError: On an unknown mask kind
+        """
+        attributes = getattr(schema, "attributes", None)
+        if attributes is not None:
+            schema = {
+                name: attribute.mask
+                for name, attribute in attributes.items()
+                if attribute.mask is not None
+            }
+
+        columns = []
+        for key, kind in schema.items():
+            if callable(kind):
+                # Single-value mask functions run as their batch variant
+                batch = _BATCH_MASKS.get(kind)
+                if batch is None:
+                    batch = _map(kind)
+            elif kind in _BATCH_MASKS_BY_KIND:
+                batch = _BATCH_MASKS_BY_KIND[kind]
+            else:
+                raise ValueError(
+                    f"Unknown mask {kind!r}, expected one of {list(_BATCH_MASKS_BY_KIND)}"
+                )
+            columns.append((key, batch))
+
+        result = [dict(record) for record in records]
+        for key, batch in columns:
+            rows = [row for row in result if row.get(key) is not None]
+            masked = batch([row[key] for row in rows])
+            for row, value in zip(rows, masked, strict=True):
+                row[key] = value
+        return result
+
 
 # Singleton instance
 mask = _Mask()
 
+_BATCH_MASKS_BY_KIND = {
+    "email": _Mask.emails,
+    "phone": _Mask.phones,
+    "name": _Mask.names,
+    "inn": _Mask.inns,
+    "card": _Mask.cards,
+}
+_BATCH_MASKS = {
+    _Mask.email: _Mask.emails,
+    _Mask.phone: _Mask.phones,
+    _Mask.name: _Mask.names,
+    _Mask.inn: _Mask.inns,
+    _Mask.card: _Mask.cards,
+}
+
+
+def _map(function):
+    def batch(values):
+        return [function(value) for value in values]
+    return batch
+
 
 def validate_email(email: str) -> bool:
     """Basic email validation."""
     if not email:
         return False
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    return bool(re.match(pattern, email))
+    return _EMAIL.match(email) is not None
 
 
 def validate_phone(phone: str) -> bool:
     """Basic Russian phone validation (10-11 digits)."""
     if not phone:
         return False
-    digits = re.sub(r"\D", "", phone)
-    return len(digits) in (10, 11)
+    return len(_digits(phone)) in (10, 11)
 
 
 def validate_inn(inn: str) -> bool:
     """Basic INN validation (10 or 12 digits for Russia)."""
     if not inn:
         return False
-    digits = re.sub(r"\D", "", inn)
-    return len(digits) in (10, 12)
+    return len(_digits(inn)) in (10, 12)
+
+
+def normalize_phones(phones: Iterable[str]) -> tuple[list[str], bytearray]:
+    """
+    normalize_phone() for a batch of values.
+
+    Returns:
+        (normalized values, validate_phone() of every input as 0/1 bytes)
+    """
+    digits_of = _digits
+
+    normalized = []
+    valid = bytearray()
+    append = normalized.append
+    flag = valid.append
+    for phone in phones:
+        if not phone:
+            append("")
+            flag(0)
+            continue
+
+        digits = digits_of(phone)
+        length = len(digits)
+        flag(length == 10 or length == 11)
+
+        if length == 11 and digits[0] == "8":
+            digits = "7" + digits[1:]
+        elif length == 10:
+            digits = "7" + digits
+        append(digits)
+
+    return normalized, valid
+
+
+def normalize_emails(emails: Iterable[str]) -> tuple[list[str], bytearray]:
+    """
+    normalize_email() for a batch of values.
+
+    Returns:
+        (normalized values, validate_email() of every input as 0/1 bytes)
+    """
+    match = _EMAIL.match
+    normalized = []
+    valid = bytearray()
+    for email in emails:
+        if not email:
+            normalized.append("")
+            valid.append(0)
+            continue
+        normalized.append(email.lower().strip())
+        valid.append(match(email) is not None)
+    return normalized, valid
+
+
+def validate_emails(emails: Iterable[str]) -> bytearray:
+    """validate_email() for a batch of values, as 0/1 bytes."""
+    match = _EMAIL.match
+    return bytearray(bool(email) and match(email) is not None for email in emails)
+
+
+def validate_phones(phones: Iterable[str]) -> bytearray:
+    """validate_phone() for a batch of values, as 0/1 bytes."""
+    return bytearray(bool(phone) and len(_digits(phone)) in (10, 11) for phone in phones)
+
+
+def validate_inns(inns: Iterable[str]) -> bytearray:
+    """validate_inn() for a batch of values, as 0/1 bytes."""
+    return bytearray(bool(inn) and len(_digits(inn)) in (10, 12) for inn in inns)
+
+
+# ----------------------------------------------------------------------------
+# Worker pools
+# ----------------------------------------------------------------------------
+
+# Set in worker processes by _init_pool_worker()
+_pool_state = None
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Lists of ``size`` consecutive items; the last one may be shorter."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _init_pool_worker(initializer: Callable, initargs: tuple) -> None:
+    global _pool_state
+    _pool_state = initializer(*initargs)
+
+
+def _run_pool_task(fn: Callable, item):
+    return fn(_pool_state, item)
+
+
+def ordered_pool_map(
+    fn: Callable,
+    items: Iterable,
+    processes: int,
+    initializer: Callable,
+    initargs: tuple = (),
+    window: int | None = None,
+) -> Iterator:
+    """
+    ``fn(state, item)`` for every item, in input order, across processes.
+
+    ``initializer(*initargs)`` builds the state once per worker process, so
+    keys and open files are not pickled with every item. Unlike Pool.imap,
+    items are read lazily: at most ``window`` (default two per process)
+    are in flight. With ``processes`` <= 1 everything runs in this process.
+
+    ``fn`` and ``initializer`` must be picklable (module-level functions or
+    classes).
+    """
+    if processes <= 1:
+        state = initializer(*initargs)
+        for item in items:
+            yield fn(state, item)
+        return
+
+    import multiprocessing
+
+    window = window or processes * 2
+    pending: deque = deque()
+    with multiprocessing.Pool(processes, _init_pool_worker, (initializer, initargs)) as pool:
+        for item in items:
+            pending.append(pool.apply_async(_run_pool_task, (fn, item)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
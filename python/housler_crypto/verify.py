@@ -0,0 +1,242 @@
+"""
+Post-migration verification.
+
+Proves that migrated ``hc1:`` values decrypt to the same plaintext as the
+legacy values they replaced. Two sources - typically the pre-migration
+backup and the live table - are streamed in primary key order, joined by
+primary key and compared in parallel.
+
+Memory stays constant: rows are merge-joined as they arrive and only a
+bounded number of chunks is in flight. Mismatches are reported by primary
+key and reason only; plaintext is never logged or returned.
+
+Usage:
+    from housler_crypto.verify import iter_column, verify_migration
+
+    report = verify_migration(
+        iter_column(backup_conn, "users", "id", "email"),
+        iter_column(live_conn, "users", "id", "email"),
+        field="email",
+        migrator=migrator,
+        new_crypto=crypto,
+        sample_rate=0.01,  # or 1.0 for a full scan
+    )
+    assert report["mismatched"] == 0
+"""
+
+from __future__ import annotations
+
+import hmac
+import logging
+import random
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from .core import ENCRYPTED_PREFIX, HouslerCrypto
+from .migration import FernetMigrator
+
+logger = logging.getLogger(__name__)
+
+# Mismatch reasons
+MISMATCH = "mismatch"
+NOT_MIGRATED = "not_migrated"
+DECRYPT_ERROR = "decrypt_error"
+MISSING_IN_LIVE = "missing_in_live"
+MISSING_IN_BACKUP = "missing_in_backup"
+
+_SENTINEL = object()
+
+
+def iter_column(
+    db_connection,
+    table: str,
+    pk_column: str,
+    column: str,
+    batch_size: int = 1000,
+) -> Iterator[tuple]:
+    """
+    Stream (pk, value) pairs of a column in primary key order.
+
+    Uses fetchmany, so only one batch is held in memory.
+    """
+    cursor = db_connection.cursor()
+    cursor.execute(f"SELECT {pk_column}, {column} FROM {table} ORDER BY {pk_column}")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _join_by_pk(legacy: Iterable[tuple], live: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Merge-join two pk-sorted streams.
+
+    Yields (pk, legacy_value, live_value); a side missing the pk yields
+    _SENTINEL for that value.
+    """
+    legacy_iter = iter(legacy)
+    live_iter = iter(live)
+    left = next(legacy_iter, None)
+    right = next(live_iter, None)
+
+    while left is not None or right is not None:
+        if right is None or (left is not None and left[0] < right[0]):
+            yield left[0], left[1], _SENTINEL
+            left = next(legacy_iter, None)
+        elif left is None or right[0] < left[0]:
+            yield right[0], _SENTINEL, right[1]
+            right = next(live_iter, None)
+        else:
+            yield left[0], left[1], right[1]
+            left = next(legacy_iter, None)
+            right = next(live_iter, None)
+
+
+def _check_chunk(
+    chunk: list[tuple],
+    field: str,
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+) -> tuple[int, list[tuple]]:
+    """
+    Compare one chunk of joined rows.
+
+    Returns the number of matches and (pk, reason) for every other row.
+    """
+    matched = 0
+    failures = []
+    for pk, legacy_value, live_value in chunk:
+        if legacy_value is None and live_value is None:
+            matched += 1
+            continue
+        if live_value is None or legacy_value is None:
+            failures.append((pk, MISMATCH))
+            continue
+        if not live_value.startswith(ENCRYPTED_PREFIX):
+            failures.append((pk, NOT_MIGRATED))
+            continue
+
+        try:
+            if legacy_value.startswith(ENCRYPTED_PREFIX):
+                expected = new_crypto.decrypt(legacy_value, field)
+            else:
+                expected = migrator.decrypt(legacy_value, field)
+            actual = new_crypto.decrypt(live_value, field)
+        except Exception:
+            # The exception text is not logged: it may quote the input
+            failures.append((pk, DECRYPT_ERROR))
+            continue
+
+        if hmac.compare_digest(expected.encode("utf-8"), actual.encode("utf-8")):
+            matched += 1
+        else:
+            failures.append((pk, MISMATCH))
+
+    return matched, failures
+
+
+def verify_migration(
+    legacy_rows: Iterable[tuple],
+    migrated_rows: Iterable[tuple],
+    field: str,
+    migrator: FernetMigrator,
+    new_crypto: HouslerCrypto,
+    sample_rate: float = 1.0,
+    workers: int = 4,
+    chunk_size: int = 500,
+    max_mismatches: int = 100,
+    seed: int | None = None,
+) -> dict:
+    """
+    Verify migrated values against their legacy originals.
+
+    Args:
+        legacy_rows: (pk, legacy_value) pairs sorted by pk (e.g. the backup)
+        migrated_rows: (pk, hc1_value) pairs sorted by pk (the live table)
+        field: Field name used for both legacy and HouslerCrypto keys
+        migrator: FernetMigrator for the legacy values
+        new_crypto: HouslerCrypto for the migrated values
+        sample_rate: Fraction of joined rows to check (1.0 = full scan)
+        workers: Number of threads decrypting in parallel
+        chunk_size: Rows per unit of work
+        max_mismatches: Maximum number of failures listed in the report
+            (all failures are still counted)
+        seed: Seed for reproducible sampling
+
+    Returns:
+        Dict with counts per outcome and "mismatches": [(pk, reason), ...]
+    """
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError("sample_rate must be in (0, 1]")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    report: dict = {
+        "joined": 0,
+        "checked": 0,
+        "matched": 0,
+        MISMATCH: 0,
+        NOT_MIGRATED: 0,
+        DECRYPT_ERROR: 0,
+        MISSING_IN_LIVE: 0,
+        MISSING_IN_BACKUP: 0,
+        "mismatches": [],
+    }
+
+    def record(pk, reason: str) -> None:
+        report[reason] += 1
+        if len(report["mismatches"]) < max_mismatches:
+            report["mismatches"].append((pk, reason))
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            matched, failures = future.result()
+            report["matched"] += matched
+            for pk, reason in failures:
+                record(pk, reason)
+
+    rng = random.Random(seed)
+    max_in_flight = workers * 2
+    in_flight: set[Future] = set()
+    chunk: list[tuple] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for pk, legacy_value, live_value in _join_by_pk(legacy_rows, migrated_rows):
+            report["joined"] += 1
+            if sample_rate < 1.0 and rng.random() >= sample_rate:
+                continue
+
+            if live_value is _SENTINEL:
+                record(pk, MISSING_IN_LIVE)
+                continue
+            if legacy_value is _SENTINEL:
+                record(pk, MISSING_IN_BACKUP)
+                continue
+
+            report["checked"] += 1
+            chunk.append((pk, legacy_value, live_value))
+            if len(chunk) < chunk_size:
+                continue
+
+            in_flight.add(executor.submit(_check_chunk, chunk, field, migrator, new_crypto))
+            chunk = []
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        if chunk:
+            in_flight.add(executor.submit(_check_chunk, chunk, field, migrator, new_crypto))
+        collect(wait(in_flight).done)
+
+    report["mismatched"] = sum(
+        report[reason]
+        for reason in (MISMATCH, NOT_MIGRATED, DECRYPT_ERROR, MISSING_IN_LIVE, MISSING_IN_BACKUP)
+    )
+    if report["mismatched"]:
+        logger.warning(
+            f"Verification of field {field} found {report['mismatched']} problem rows "
+            f"out of {report['checked']} checked"
+        )
+
+    return report
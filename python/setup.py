@@ -29,7 +29,24 @@ setup(
     install_requires=[
         "cryptography>=41.0.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "housler-crypto=housler_crypto.cli:main",
+        ],
+    },
     extras_require={
+        "columnar": [
+            "numpy>=1.22",
+            "pandas>=1.5",
+            "pyarrow>=10.0",
+        ],
+        "parquet": [
+            "numpy>=1.22",
+            "pyarrow>=10.0",
+        ],
+        "lookup": [
+            "numpy>=1.22",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,145 @@
+"""
+Tests for the encryption coverage audit.
+"""
+
+import base64
+import io
+import json
+import os
+import sqlite3
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.audit import AuditReport, classify
+
+from .test_migration import TEST_MASTER_KEY, _lk_fernet
+
+
+@pytest.fixture(scope="module")
+def samples():
+    """One value of every kind."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    crypto = HouslerCrypto(master_key=TEST_MASTER_KEY)
+    token = _lk_fernet().encrypt(b"user@example.com").decode()
+
+    iv = os.urandom(16)
+    sealed = AESGCM(b"k" * 32).encrypt(iv, b"user@example.com", None)
+    agent = base64.b64encode(iv + sealed[-16:] + sealed[:-16]).decode()
+
+    return {
+        "hc1": crypto.encrypt("user@example.com", field="email"),
+        "fernet": token,
+        "enc": "enc:" + base64.urlsafe_b64encode(token.encode()).decode(),
+        "agent_gcm": agent,
+        "plaintext": "user@example.com",
+    }
+
+
+class TestClassify:
+    """Test structural classification."""
+
+    @pytest.mark.parametrize("kind", ["hc1", "fernet", "enc", "agent_gcm", "plaintext"])
+    def test_valid_envelopes(self, samples, kind):
+        """Each well-formed value is recognized."""
+        assert classify(samples[kind]) == kind
+
+    def test_null_and_empty(self):
+        """NULL and empty strings have their own categories."""
+        assert classify(None) == "null"
+        assert classify("") == "empty"
+
+    def test_malformed_hc1(self, samples):
+        """Bad base64, version or length make hc1 malformed."""
+        packed = bytearray(base64.b64decode(samples["hc1"][4:]))
+        packed[0] = 0x03
+
+        assert classify("hc1:not base64!") == "hc1_malformed"
+        assert classify("hc1:" + base64.b64encode(b"\x01short").decode()) == "hc1_malformed"
+        assert classify("hc1:" + base64.b64encode(bytes(packed)).decode()) == "hc1_malformed"
+        assert classify(samples["hc1"][:-4]) == "hc1"
+        assert classify(samples["hc1"][:-1]) == "hc1_malformed"
+
+    def test_deterministic_hc1(self):
+        """AES-SIV envelopes are hc1 too."""
+        crypto = HouslerCrypto(master_key=TEST_MASTER_KEY)
+        assert classify(crypto.encrypt_deterministic("user@example.com", field="email")) == "hc1"
+        assert classify("hc1:" + base64.b64encode(b"\x02" + b"s" * 16).decode()) == "hc1_malformed"
+
+    def test_malformed_fernet_and_enc(self, samples):
+        """Truncated tokens are malformed."""
+        assert classify(samples["fernet"][:-8]) == "fernet_malformed"
+        assert classify("enc:notvalid") == "enc_malformed"
+        assert classify("enc:" + base64.urlsafe_b64encode(b"plain").decode()) == "enc_malformed"
+
+    def test_short_base64_is_plaintext(self):
+        """Short base64-looking words are not taken for agent GCM."""
+        assert classify("Ivanov") == "plaintext"
+        assert classify("79991234567") == "plaintext"
+
+
+class TestAuditReport:
+    """Test report accumulation over the supported sources."""
+
+    def test_scan_cursor(self, samples):
+        """Counts and samples per column from a DB cursor."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, phone TEXT)")
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?, ?)",
+            [
+                (1, samples["hc1"], samples["plaintext"]),
+                (2, samples["fernet"], None),
+                (3, "hc1:broken", samples["hc1"]),
+                (4, samples["hc1"], samples["enc"]),
+            ],
+        )
+        cursor = conn.execute("SELECT id, email, phone FROM users ORDER BY id")
+
+        report = AuditReport()
+        report.scan_cursor(cursor, "users", ["email", "phone"], batch_size=3)
+        result = report.to_dict()["users"]
+
+        assert result["email"]["total"] == 4
+        assert result["email"]["counts"] == {"hc1": 2, "fernet": 1, "hc1_malformed": 1}
+        assert result["email"]["samples"] == {"fernet": [2], "hc1_malformed": [3]}
+        assert result["phone"]["counts"] == {"plaintext": 1, "null": 1, "hc1": 1, "enc": 1}
+        assert report.malformed == 1
+
+    def test_scan_csv_and_jsonl(self, samples):
+        """CSV and JSONL dumps feed the same report."""
+        csv_dump = io.StringIO(
+            "id,email\n"
+            f"1,{samples['hc1']}\n"
+            f"2,{samples['plaintext']}\n"
+            "3,\n"
+        )
+        jsonl_dump = io.StringIO(
+            json.dumps({"id": 10, "email": samples["agent_gcm"]}) + "\n\n"
+            + json.dumps({"id": 11, "email": None}) + "\n"
+        )
+
+        report = AuditReport()
+        report.scan_csv(csv_dump, "users", "id", ["email"])
+        report.scan_jsonl(jsonl_dump, "users", "id", ["email"])
+        result = report.to_dict()["users"]["email"]
+
+        assert result["counts"] == {
+            "hc1": 1, "plaintext": 1, "empty": 1, "agent_gcm": 1, "null": 1,
+        }
+        assert result["samples"] == {"plaintext": ["2"], "agent_gcm": [10]}
+
+    def test_sample_size_bounded(self):
+        """Only sample_size primary keys are kept per category."""
+        report = AuditReport(sample_size=3)
+        report.scan_rows(((pk, "plain") for pk in range(1000)), "t", ["c"])
+        result = report.to_dict()["t"]["c"]
+
+        assert result["counts"] == {"plaintext": 1000}
+        assert result["samples"] == {"plaintext": [0, 1, 2]}
+
+    def test_add_single_value(self, samples):
+        """add() classifies and records one value."""
+        report = AuditReport()
+        assert report.add("t", "c", 1, samples["fernet"]) == "fernet"
+        assert report.to_dict()["t"]["c"]["samples"] == {"fernet": [1]}
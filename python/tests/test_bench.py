@@ -0,0 +1,50 @@
+"""
+Tests for the micro-benchmark module.
+"""
+
+import json
+
+import pytest
+
+from housler_crypto import bench
+
+
+class TestBench:
+    """Test benchmark runs and regression gates."""
+
+    def test_run_produces_all_cases(self):
+        """A tiny run reports every case with the expected metrics."""
+        result = bench.run_benchmarks(min_time=0, sizes=(10, 1_000), batch_size=10, iterations=1000)
+
+        assert set(result["results"]) == {
+            "derive_key.cold", "derive_key.warm",
+            "encrypt.10", "decrypt.10", "encrypt.1000", "decrypt.1000",
+            "encrypt_many.10", "decrypt_many.10", "encrypt_many.1000", "decrypt_many.1000",
+            "blind_index", "blind_index_many", "redact.clean", "redact.pii",
+        }
+        case = result["results"]["encrypt_many.10"]
+        assert case["ops_per_sec"] > 0
+        assert case["bytes_per_sec"] == pytest.approx(case["ops_per_sec"] * 10)
+        assert case["p50_us"] <= case["p90_us"] <= case["p99_us"]
+        assert result["meta"]["iterations"] == 1000
+        json.dumps(result)
+
+    def test_compare_flags_regressions(self):
+        """Only drops beyond the threshold are regressions."""
+        baseline = {"results": {"a": {"ops_per_sec": 100}, "b": {"ops_per_sec": 100}}}
+        current = {"results": {"a": {"ops_per_sec": 95}, "b": {"ops_per_sec": 80}, "c": {}}}
+
+        regressions = bench.compare(baseline, current, threshold=0.1)
+
+        assert [r["case"] for r in regressions] == ["b"]
+        assert round(regressions[0]["change"], 2) == -0.2
+
+    def test_compare_cli_exit_code(self, tmp_path):
+        """The compare command fails on regression."""
+        baseline = tmp_path / "baseline.json"
+        current = tmp_path / "current.json"
+        baseline.write_text(json.dumps({"results": {"a": {"ops_per_sec": 100}}}))
+        current.write_text(json.dumps({"results": {"a": {"ops_per_sec": 50}}}))
+
+        assert bench.main(["compare", str(baseline), str(current)]) == 1
+        assert bench.main(["compare", str(baseline), str(baseline)]) == 0
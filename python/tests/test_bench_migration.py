@@ -0,0 +1,86 @@
+"""
+Tests for the end-to-end migration benchmark harness.
+"""
+
+import sqlite3
+
+import pytest
+from housler_crypto import bench_migration
+from housler_crypto.audit import AuditReport
+
+
+class TestBenchMigration:
+    """Test dataset generation and benchmark runs."""
+
+    @pytest.mark.parametrize("source_format,category", [
+        ("lk", "fernet"), ("club", "enc"), ("agent", "agent_gcm"),
+    ])
+    def test_generate_dataset(self, tmp_path, source_format, category):
+        """Generated tables hold values in the requested legacy format."""
+        path = str(tmp_path / "data.db")
+        bench_migration.generate_dataset(path, rows=25, source_format=source_format, distinct=10)
+
+        conn = sqlite3.connect(path)
+        report = AuditReport()
+        report.scan_cursor(conn.execute("SELECT id, email, phone, name FROM users"),
+                           "users", ["email", "phone", "name"])
+        conn.close()
+
+        for column in report.to_dict()["users"].values():
+            assert column["counts"] == {category: 25}
+
+    @pytest.mark.parametrize("source_format", bench_migration.FORMATS)
+    def test_run_benchmark(self, source_format):
+        """Every run migrates all rows and reports timings."""
+        result = bench_migration.run_benchmark(
+            rows=30, source_format=source_format,
+            batch_sizes=(7, 50), workers=(0, 2), distinct=5, isolate=False,
+        )
+
+        assert result["dataset"]["rows"] == 30
+        assert len(result["runs"]) == 4
+        for run in result["runs"]:
+            assert run["rows"] == 30
+            assert run["migrated"] == 90
+            assert run["errors"] == 0
+            assert run["rows_per_sec"] > 0
+            assert {"count", "read", "write", "commit", "crypto"} <= set(run["phases"])
+            assert run["phases"]["crypto"] > 0
+            assert set(run["projected_seconds"]) == {"1000000", "10000000", "50000000"}
+
+    def test_isolated_run_and_reused_dataset(self, tmp_path):
+        """Scenarios can run in a fresh process against a kept dataset."""
+        path = str(tmp_path / "pristine.db")
+        bench_migration.generate_dataset(path, rows=10, source_format="lk", distinct=2)
+
+        result = bench_migration.run_benchmark(
+            rows=10, source_format="lk", db_path=path, isolate=True,
+        )
+
+        assert result["dataset"]["generate_seconds"] is None
+        assert result["runs"][0]["peak_rss_kb"] > 0
+        # The pristine dataset is left untouched
+        conn = sqlite3.connect(path)
+        assert not conn.execute("SELECT email FROM users LIMIT 1").fetchone()[0].startswith("hc1:")
+        conn.close()
+
+    def test_reused_dataset_must_match(self, tmp_path):
+        """A kept dataset with another row count or format is not reused."""
+        path = str(tmp_path / "pristine.db")
+        bench_migration.generate_dataset(path, rows=10, source_format="lk", distinct=2)
+
+        with pytest.raises(ValueError, match="has 10 rows"):
+            bench_migration.run_benchmark(rows=20, source_format="lk", db_path=path, isolate=False)
+        with pytest.raises(ValueError, match="expected enc"):
+            bench_migration.run_benchmark(rows=10, source_format="club", db_path=path, isolate=False)
+
+    def test_migrated_dataset_is_not_reused(self, tmp_path):
+        """A dataset that was migrated in place is refused."""
+        path = str(tmp_path / "pristine.db")
+        bench_migration.generate_dataset(path, rows=10, source_format="lk", distinct=2)
+        bench_migration.run_scenario(path, "lk", batch_size=5)
+
+        with pytest.raises(ValueError, match="is hc1"):
+            bench_migration.check_dataset(path, 10, "lk")
+        with pytest.raises(SystemExit):
+            bench_migration.main(["--rows", "10", "--db", path])
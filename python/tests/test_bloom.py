@@ -0,0 +1,97 @@
+"""
+Tests for Bloom filters over blind indexes.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.bloom import BloomFilter
+
+from .test_migration import TEST_MASTER_KEY
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+
+class TestMembership:
+    """Test inserts and checks."""
+
+    def test_no_false_negatives(self, crypto):
+        """Every added value is found, with blind index normalization."""
+        bloom = BloomFilter(crypto, capacity=1000)
+        values = [f"user{i}@example.com" for i in range(1000)]
+        bloom.add_many(values, field="email")
+        bloom.add("Extra@Example.com ", field="email")
+
+        assert all(bloom.might_contain_many(values, field="email"))
+        assert bloom.might_contain("extra@example.com", field="email")
+        assert not bloom.might_contain("", field="email")
+        assert len(bloom) == 1001
+
+    def test_false_positive_rate(self, crypto):
+        """Unknown values match at about the configured rate."""
+        bloom = BloomFilter(crypto, capacity=2000, error_rate=0.01)
+        bloom.add_many([f"in{i}" for i in range(2000)], field="email")
+        hits = sum(bloom.might_contain_many([f"out{i}" for i in range(5000)], field="email"))
+        assert hits / 5000 < 0.03
+        assert 0.005 < bloom.estimated_error_rate() < 0.02
+
+    def test_fields_are_keyed(self, crypto):
+        """A value added for one field is not found under another."""
+        bloom = BloomFilter(crypto, capacity=10, error_rate=0.0001)
+        bloom.add("+79991234567", field="phone")
+        assert not bloom.might_contain("+79991234567", field="email")
+
+    def test_from_stored_hashes(self, crypto):
+        """Filters build from index columns, also compact ones."""
+        bloom = BloomFilter(crypto, capacity=10)
+        bloom.add_hashes([crypto.blind_index("a@example.com", "email"), ""])
+        assert bloom.might_contain("A@example.com", field="email")
+        assert bloom.might_contain_hash(crypto.blind_index("a@example.com", "email"))
+
+        compact = BloomFilter(crypto, capacity=10, digest_size=16)
+        compact.add_hashes(
+            [crypto.blind_index("a@example.com", "email", 16, "base64url")], encoding="base64url",
+        )
+        assert compact.might_contain("a@example.com", field="email")
+        with pytest.raises(ValueError, match="16-byte"):
+            compact.add_hashes([crypto.blind_index("a@example.com", "email")])
+
+
+class TestSerialization:
+    """Test the binary blob."""
+
+    def test_roundtrip(self, crypto):
+        """A loaded filter answers like the original and accepts inserts."""
+        bloom = BloomFilter(crypto, capacity=500, error_rate=0.001, digest_size=16)
+        bloom.add_many(["a@example.com", "b@example.com"], field="email")
+        blob = bloom.to_bytes()
+
+        loaded = BloomFilter.from_bytes(crypto, blob)
+        assert loaded.to_bytes() == blob
+        assert (loaded.bit_count, loaded.hash_count, loaded.digest_size, len(loaded)) == (
+            bloom.bit_count, bloom.hash_count, 16, 2,
+        )
+        assert loaded.might_contain("b@example.com", field="email")
+        loaded.add("c@example.com", field="email")
+        assert loaded.might_contain("c@example.com", field="email")
+
+    def test_compact(self, crypto):
+        """About 1.2 bytes per value at a 1% rate."""
+        assert len(BloomFilter(crypto, capacity=10_000).to_bytes()) < 12_000 + 24
+
+    def test_invalid(self, crypto):
+        """Bad settings and blobs raise ValueError."""
+        with pytest.raises(ValueError, match="capacity"):
+            BloomFilter(crypto, capacity=0)
+        with pytest.raises(ValueError, match="error_rate"):
+            BloomFilter(crypto, capacity=10, error_rate=1.0)
+        with pytest.raises(ValueError, match="digest_size"):
+            BloomFilter(crypto, capacity=10, digest_size=4)
+
+        blob = BloomFilter(crypto, capacity=10).to_bytes()
+        with pytest.raises(ValueError, match="truncated"):
+            BloomFilter.from_bytes(crypto, blob[:-1])
+        with pytest.raises(ValueError, match="Not a Bloom filter"):
+            BloomFilter.from_bytes(crypto, b"HCDT" + blob[4:])
@@ -0,0 +1,164 @@
+"""
+Tests for the command line tool.
+"""
+
+import csv
+import json
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.cli import build_plan, main, parse_columns
+
+from .test_migration import TEST_MASTER_KEY
+
+ITERATIONS = 1000
+
+
+@pytest.fixture
+def crypto(monkeypatch):
+    """Key in the environment, with cheap key derivation."""
+    monkeypatch.setenv("HOUSLER_CRYPTO_KEY", TEST_MASTER_KEY)
+    monkeypatch.setenv("HOUSLER_CRYPTO_ITERATIONS", str(ITERATIONS))
+    return HouslerCrypto(master_key=TEST_MASTER_KEY, iterations=ITERATIONS)
+
+
+@pytest.fixture
+def users_csv(tmp_path):
+    """Small CSV export, including an empty cell."""
+    path = tmp_path / "users.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "email", "phone"])
+        for i in range(25):
+            writer.writerow([i, f"User{i}@Example.com", "" if i == 3 else f"+7999000{i:04d}"])
+    return path
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class TestArguments:
+    """Test option parsing and plans."""
+
+    def test_parse_columns(self):
+        """COLUMN defaults NAME to the column."""
+        assert parse_columns(["email", "phone=user_phone"]) == [
+            ("email", "email"), ("phone", "user_phone"),
+        ]
+        with pytest.raises(ValueError):
+            parse_columns(["email="])
+
+    def test_blind_index_before_encrypt(self):
+        """Blind indexes use the plaintext and the column's key field."""
+        plan = build_plan("encrypt", [("email", "user_email")], [("email", "email")])
+        assert plan == [
+            ("blind_index", "email", "user_email", "email_hash"),
+            ("encrypt", "email", "user_email", "email"),
+        ]
+
+    def test_invalid_plans(self):
+        """Unknown mask kinds and blind indexes outside encrypt are rejected."""
+        with pytest.raises(ValueError):
+            build_plan("mask", [("email", "mail")])
+        with pytest.raises(ValueError):
+            build_plan("decrypt", [("email", "email")], [("email", "email")])
+
+    def test_missing_key(self, monkeypatch, users_csv, capsys):
+        """encrypt without HOUSLER_CRYPTO_KEY fails cleanly."""
+        monkeypatch.delenv("HOUSLER_CRYPTO_KEY", raising=False)
+        assert main(["encrypt", str(users_csv), "--field", "email"]) == 1
+        assert "HOUSLER_CRYPTO_KEY" in capsys.readouterr().err
+
+
+class TestCsv:
+    """Test CSV round trips."""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_encrypt_decrypt_roundtrip(self, crypto, users_csv, tmp_path, workers):
+        """Encrypted columns decrypt back; other columns are untouched."""
+        encrypted = tmp_path / "users.enc.csv"
+        decrypted = tmp_path / "users.dec.csv"
+        common = ["--workers", str(workers), "--batch-size", "4"]
+
+        assert main([
+            "encrypt", str(users_csv), "-o", str(encrypted),
+            "--field", "email", "--field", "phone", "--blind-index", "email", *common,
+        ]) == 0
+        rows = _read_csv(encrypted)
+        assert len(rows) == 25
+        assert rows[7]["id"] == "7"
+        assert crypto.decrypt(rows[7]["email"], field="email") == "User7@Example.com"
+        assert rows[7]["email_hash"] == crypto.blind_index("user7@example.com", field="email")
+        assert rows[3]["phone"] == ""
+
+        assert main([
+            "decrypt", str(encrypted), "-o", str(decrypted),
+            "--field", "email", "--field", "phone", *common,
+        ]) == 0
+        original = _read_csv(users_csv)
+        assert [
+            {k: v for k, v in row.items() if k != "email_hash"} for row in _read_csv(decrypted)
+        ] == original
+
+    def test_unknown_column(self, crypto, users_csv, capsys):
+        """A column missing from the header is an error."""
+        assert main(["encrypt", str(users_csv), "--field", "passport"]) == 1
+        assert "passport" in capsys.readouterr().err
+
+    def test_mask_needs_no_key(self, monkeypatch, users_csv, tmp_path):
+        """mask works without a master key."""
+        monkeypatch.delenv("HOUSLER_CRYPTO_KEY", raising=False)
+        out = tmp_path / "masked.csv"
+        assert main([
+            "mask", str(users_csv), "-o", str(out), "--field", "email=email", "--field", "phone",
+        ]) == 0
+        row = _read_csv(out)[1]
+        assert row["email"] == "Us***@Example.com"
+        assert row["phone"] == "+7***0001"
+
+
+class TestJsonl:
+    """Test JSON Lines streams."""
+
+    def test_stdin_stdout(self, crypto, monkeypatch, capsys):
+        """Records stream from stdin to stdout; nulls and missing keys stay as is."""
+        import io
+
+        lines = [
+            {"id": 1, "email": "a@example.com", "inn": 7707083893},
+            {"id": 2, "email": None},
+            {"id": 3},
+        ]
+        monkeypatch.setattr("sys.stdin", io.StringIO("".join(json.dumps(r) + "\n" for r in lines)))
+
+        assert main(["encrypt", "--format", "jsonl", "--field", "email", "--field", "inn"]) == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+        assert crypto.decrypt(records[0]["email"], field="email") == "a@example.com"
+        assert crypto.decrypt(records[0]["inn"], field="inn") == "7707083893"
+        assert records[1] == {"id": 2, "email": None}
+        assert records[2] == {"id": 3}
+
+    def test_decrypt_failure(self, crypto, tmp_path, capsys):
+        """Tampered ciphertext makes the command fail."""
+        path = tmp_path / "bad.jsonl"
+        path.write_text(json.dumps({"email": "hc1:AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"}) + "\n")
+        assert main(["decrypt", str(path), "--field", "email"]) == 1
+        assert "Decryption failed" in capsys.readouterr().err
+
+
+class TestAudit:
+    """Test the audit command."""
+
+    def test_audit_csv(self, crypto, users_csv, tmp_path, capsys):
+        """Audit reports coverage per column of the file."""
+        encrypted = tmp_path / "users.enc.csv"
+        main(["encrypt", str(users_csv), "-o", str(encrypted), "--field", "email"])
+
+        assert main(["audit", str(encrypted), "--field", "email", "--field", "phone"]) == 0
+        report = json.loads(capsys.readouterr().out)
+
+        assert report["users.enc"]["email"]["counts"] == {"hc1": 25}
+        assert report["users.enc"]["phone"]["counts"] == {"plaintext": 24, "empty": 1}
@@ -0,0 +1,169 @@
+"""
+Tests for the columnar (NumPy / pandas / Arrow) API.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.columnar import blind_index_column, decrypt_column, encrypt_column
+
+from .test_migration import TEST_MASTER_KEY
+
+np = pytest.importorskip("numpy")
+
+VALUES = ["user@example.com", None, "", "  Иван@Example.RU ", "hc1:already"]
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY, iterations=1000)
+
+
+class TestNumpy:
+    """Test NumPy object arrays."""
+
+    def test_roundtrip_preserves_nulls(self, crypto):
+        """Nulls stay null, empty stays empty, hc1 values pass through."""
+        column = np.array(VALUES, dtype=object)
+        encrypted = encrypt_column(crypto, column, field="email")
+
+        assert isinstance(encrypted, np.ndarray)
+        assert encrypted[0].startswith("hc1:")
+        assert encrypted[1] is None
+        assert encrypted[2] == ""
+        assert encrypted[4] == "hc1:already"
+        assert decrypt_column(crypto, encrypted[:4], field="email").tolist() == VALUES[:4]
+
+    def test_blind_index_matches_scalar(self, crypto):
+        """Same hashes as blind_index()."""
+        column = np.array(VALUES[:4], dtype=object)
+        result = blind_index_column(crypto, column, field="email")
+        assert result[0] == crypto.blind_index(VALUES[0], field="email")
+        assert result[3] == crypto.blind_index(VALUES[3], field="email")
+        assert result[1] is None
+
+    def test_rejects_non_strings(self, crypto):
+        """Non-null values must be strings."""
+        with pytest.raises(TypeError):
+            encrypt_column(crypto, np.array([1, 2], dtype=object))
+        with pytest.raises(TypeError):
+            encrypt_column(crypto, ["a", "b"])
+
+
+class TestPandas:
+    """Test pandas Series."""
+
+    @pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]"])
+    def test_roundtrip(self, crypto, dtype):
+        """Index, name and dtype are kept; NA values stay NA."""
+        pd = pytest.importorskip("pandas")
+        if dtype == "string[pyarrow]":
+            pytest.importorskip("pyarrow")
+
+        series = pd.Series(VALUES[:4], index=[10, 11, 12, 13], name="email", dtype=dtype)
+        encrypted = encrypt_column(crypto, series, field="email")
+
+        assert encrypted.dtype == series.dtype
+        assert encrypted.name == "email"
+        assert list(encrypted.index) == [10, 11, 12, 13]
+        assert encrypted.isna().tolist() == series.isna().tolist()
+        assert crypto.decrypt(encrypted[10], field="email") == VALUES[0]
+
+        decrypted = decrypt_column(crypto, encrypted, field="email")
+        pd.testing.assert_series_equal(decrypted, series)
+
+        hashes = blind_index_column(crypto, series, field="email")
+        assert hashes[13] == crypto.blind_index(VALUES[3], field="email")
+
+    def test_nan_in_object_series(self, crypto):
+        """NaN counts as null in object columns."""
+        pd = pytest.importorskip("pandas")
+        series = pd.Series(["a@example.com", float("nan")])
+        result = encrypt_column(crypto, series)
+        assert result.isna().tolist() == [False, True]
+
+
+class TestArrow:
+    """Test pyarrow arrays built from buffers."""
+
+    @pytest.fixture
+    def pa(self):
+        return pytest.importorskip("pyarrow")
+
+    @pytest.mark.parametrize("arrow_type", ["string", "large_string"])
+    def test_roundtrip(self, crypto, pa, arrow_type):
+        """Arrow arrays keep their type and nulls."""
+        column = pa.array(VALUES, type=getattr(pa, arrow_type)())
+        encrypted = encrypt_column(crypto, column, field="email")
+
+        assert encrypted.type == column.type
+        assert encrypted.null_count == 1
+        encrypted.validate(full=True)
+        assert crypto.decrypt(encrypted[0].as_py(), field="email") == VALUES[0]
+        assert encrypted[4].as_py() == "hc1:already"
+        decrypted = decrypt_column(crypto, encrypted.slice(0, 4), field="email")
+        assert decrypted.to_pylist() == VALUES[:4]
+
+    def test_sliced_and_chunked(self, crypto, pa):
+        """Slices (non-zero offset) and chunked arrays are handled."""
+        column = pa.array(VALUES[:4] * 3).slice(3, 6)
+        result = blind_index_column(crypto, column, field="email")
+        expected = [
+            crypto.blind_index(v, field="email") if v is not None else None
+            for v in column.to_pylist()
+        ]
+        result.validate(full=True)
+        assert result.to_pylist() == expected
+
+        chunked = pa.chunked_array([column, pa.array(["x@example.com"])])
+        hashes = blind_index_column(crypto, chunked, field="email")
+        assert isinstance(hashes, pa.ChunkedArray)
+        assert hashes.to_pylist() == expected + [crypto.blind_index("x@example.com", field="email")]
+
+    @pytest.mark.parametrize("digest_size,encoding", [(16, "base64url"), (8, "hex"), (12, "raw")])
+    def test_blind_index_settings(self, crypto, pa, digest_size, encoding):
+        """Digest size and encoding match blind_index() for every column type."""
+        pd = pytest.importorskip("pandas")
+        options = {"digest_size": digest_size, "encoding": encoding}
+        expected = [
+            crypto.blind_index(v, field="email", **options) if v is not None else None
+            for v in VALUES[:4]
+        ]
+
+        arrow = blind_index_column(crypto, pa.chunked_array([VALUES[:2], VALUES[2:4]]), "email", **options)
+        assert arrow.type == (pa.binary() if encoding == "raw" else pa.string())
+        assert arrow.to_pylist() == expected
+        assert blind_index_column(crypto, np.array(VALUES[:4], dtype=object), "email", **options).tolist() == expected
+        for dtype in (object, "string[pyarrow]"):
+            series = pd.Series(VALUES[:4], dtype=dtype)
+            result = blind_index_column(crypto, series, "email", **options)
+            assert [None if pd.isna(v) else v for v in result] == expected
+
+        with pytest.raises(ValueError):
+            blind_index_column(crypto, pa.array(VALUES[:1]), "email", digest_size=64)
+
+    def test_ascii_whitespace_normalization(self, crypto, pa):
+        """The bytes fast path strips exactly what str.strip() strips."""
+        values = ["\x1c A@B.C \x1f\t", "\x85x@y.z　", "mixed "]
+        result = blind_index_column(crypto, pa.array(values), field="email").to_pylist()
+        assert result == [crypto.blind_index(v, field="email") for v in values]
+
+    def test_decrypt_deterministic(self, crypto, pa):
+        """AES-SIV values decrypt alongside AES-GCM ones."""
+        column = pa.array([
+            crypto.encrypt_deterministic("a@example.com", field="email"),
+            crypto.encrypt("b@example.com", field="email"),
+        ])
+        assert decrypt_column(crypto, column, field="email").to_pylist() == [
+            "a@example.com", "b@example.com",
+        ]
+
+    def test_tampered(self, crypto, pa):
+        """A bad ciphertext raises ValueError."""
+        encrypted = encrypt_column(crypto, pa.array(["secret"]), field="email").to_pylist()[0]
+        with pytest.raises(ValueError):
+            decrypt_column(crypto, pa.array([encrypted[:-4] + "AAAA"]), field="email")
+
+    def test_rejects_other_types(self, crypto, pa):
+        """Only string arrays are accepted."""
+        with pytest.raises(TypeError):
+            encrypt_column(crypto, pa.array([1, 2]))
@@ -8,6 +8,8 @@ from housler_crypto import HouslerCrypto
 
 # Test key (32 bytes = 64 hex chars)
 TEST_KEY = "a" * 64  # Simple test key
+# encrypt_deterministic("user@example.com", field="email") with TEST_KEY
+KNOWN_SIV = "hc1:AmG6+qJi8PVKEaz+Y869SFao2eCkJdJdqE3m7QgmaESK"
 
 
 class TestHouslerCryptoInit:
@@ -262,3 +264,193 @@ class TestCrossInstance:
         hash2 = crypto2.blind_index("test", field="email")
 
         assert hash1 == hash2
+
+
+class TestBatch:
+    """Test batch encrypt/decrypt/blind_index."""
+
+    @pytest.fixture
+    def crypto(self):
+        return HouslerCrypto(master_key=TEST_KEY)
+
+    def test_encrypt_many_roundtrip(self, crypto):
+        """Batch output decrypts with the single-value API."""
+        values = ["a@example.com", "", "Иван", "x" * 1000]
+        encrypted = crypto.encrypt_many(values, field="email")
+
+        assert encrypted[1] == ""
+        assert len(set(encrypted)) == 4
+        assert [crypto.decrypt(v, field="email") for v in encrypted] == values
+
+    def test_encrypt_many_passthrough(self, crypto):
+        """Already encrypted values are not encrypted twice."""
+        encrypted = crypto.encrypt("test", field="email")
+        assert crypto.encrypt_many([encrypted], field="email") == [encrypted]
+
+    def test_decrypt_many(self, crypto):
+        """Batch decrypt matches single decrypt, including passthrough."""
+        values = [crypto.encrypt("one", field="name"), "legacy", "", None]
+        assert crypto.decrypt_many(values, field="name") == ["one", "legacy", "", ""]
+
+    def test_decrypt_many_invalid(self, crypto):
+        """Invalid values raise like decrypt()."""
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt_many(["hc1:AAAA"], field="name")
+
+    def test_blind_index_many(self, crypto):
+        """Batch blind indexes equal single ones."""
+        values = ["Test@Example.com", "", "  other@example.com "]
+        assert crypto.blind_index_many(values, field="email") == [
+            crypto.blind_index(v, field="email") for v in values
+        ]
+
+
+class TestDeterministic:
+    """Test the AES-SIV deterministic mode."""
+
+    @pytest.fixture
+    def crypto(self):
+        return HouslerCrypto(master_key=TEST_KEY)
+
+    def test_equal_plaintexts_equal_ciphertexts(self, crypto):
+        """Same value and field give the same ciphertext; fields differ."""
+        first = crypto.encrypt_deterministic("user@example.com", field="email")
+        assert first.startswith("hc1:")
+        assert crypto.encrypt_deterministic("user@example.com", field="email") == first
+        assert crypto.encrypt_deterministic("other@example.com", field="email") != first
+        assert crypto.encrypt_deterministic("user@example.com", field="login") != first
+
+    def test_decrypt(self, crypto):
+        """decrypt() and decrypt_many() read deterministic and random values alike."""
+        deterministic = crypto.encrypt_deterministic("Тест 🔐", field="name")
+        random = crypto.encrypt("Тест 🔐", field="name")
+        assert crypto.decrypt(deterministic, field="name") == "Тест 🔐"
+        assert crypto.decrypt_many([deterministic, random], field="name") == ["Тест 🔐"] * 2
+
+    def test_known_vector(self, crypto):
+        """Envelope matches the TypeScript implementation."""
+        assert crypto.encrypt_deterministic("user@example.com", field="email") == KNOWN_SIV
+
+    def test_tampered(self, crypto):
+        """Modified ciphertexts and wrong fields fail authentication."""
+        encrypted = crypto.encrypt_deterministic("secret", field="email")
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt(encrypted, field="phone")
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt(encrypted[:-4] + "AAAA", field="email")
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt("hc1:Ag==", field="email")
+
+    def test_many(self, crypto):
+        """Batch output equals single calls, with empty and encrypted passthrough."""
+        encrypted = crypto.encrypt("x", field="email")
+        values = ["a@example.com", "", None, encrypted, "b@example.com"]
+        assert crypto.encrypt_deterministic_many(values, field="email") == [
+            crypto.encrypt_deterministic(v, field="email") for v in values
+        ]
+
+
+class TestCompactBlindIndex:
+    """Test digest size and encoding options of blind indexes."""
+
+    @pytest.fixture
+    def crypto(self):
+        return HouslerCrypto(master_key=TEST_KEY)
+
+    def test_default_unchanged(self, crypto):
+        """Default settings still give 64 hex characters."""
+        value = crypto.blind_index("test@example.com", field="email")
+        assert value == crypto.blind_index(
+            "test@example.com", field="email", digest_size=32, encoding="hex",
+        )
+        assert len(value) == 64
+
+    @pytest.mark.parametrize(
+        "digest_size,encoding,length",
+        [(8, "hex", 16), (16, "base64url", 22), (16, "raw", 16), (32, "base64url", 43)],
+    )
+    def test_sizes_and_encodings(self, crypto, digest_size, encoding, length):
+        """Output length follows blind_index_length(); batches match singles."""
+        from housler_crypto.core import blind_index_length
+
+        value = crypto.blind_index("Test@Example.com ", "email", digest_size, encoding)
+        assert len(value) == length == blind_index_length(digest_size, encoding)
+        assert value == crypto.blind_index("test@example.com", "email", digest_size, encoding)
+        assert HouslerCrypto.is_blind_index(value, digest_size, encoding)
+        values = ["Test@Example.com", "", "other@example.com"]
+        assert crypto.blind_index_many(values, "email", digest_size, encoding) == [
+            crypto.blind_index(v, "email", digest_size, encoding) for v in values
+        ]
+
+    def test_settings_do_not_collide(self, crypto):
+        """A short digest is not a prefix of a long one; shapes are told apart."""
+        short = crypto.blind_index("test", digest_size=16)
+        assert not crypto.blind_index("test").startswith(short)
+        assert not HouslerCrypto.is_blind_index(short)
+        compact = crypto.blind_index("test", digest_size=24, encoding="base64url")
+        assert len(compact) == len(short)
+        assert not HouslerCrypto.is_blind_index(compact, 16)
+        assert not HouslerCrypto.is_blind_index(short.upper(), 16)
+        assert not HouslerCrypto.is_blind_index(short.encode(), 16, "raw")
+
+    def test_invalid_settings(self, crypto):
+        """Out-of-range sizes and unknown encodings raise ValueError."""
+        with pytest.raises(ValueError, match="digest_size"):
+            crypto.blind_index("test", digest_size=4)
+        with pytest.raises(ValueError, match="digest_size"):
+            crypto.blind_index_many(["test"], digest_size=64)
+        with pytest.raises(ValueError, match="encoding"):
+            crypto.blind_index("test", encoding="base32")
+        assert crypto.blind_index("", encoding="raw") == b""
+
+
+class TestCompoundBlindIndex:
+    """Test blind indexes over several fields."""
+
+    @pytest.fixture
+    def crypto(self):
+        return HouslerCrypto(master_key=TEST_KEY)
+
+    def test_field_normalization(self, crypto):
+        """Formatting differences of each field do not change the index."""
+        first = crypto.compound_blind_index([
+            ("last_name", "Пётр  Петров"), ("birth_date", "01.02.1990"), ("phone", "8 999 123-45-67"),
+        ])
+        second = crypto.compound_blind_index([
+            ("last_name", " петр петров"), ("birth_date", "1990-02-01"), ("phone", "+79991234567"),
+        ])
+        assert first == second
+        assert len(first) == 64
+
+    def test_unambiguous_parts(self, crypto):
+        """Moving characters between parts or reordering fields changes the index."""
+        assert crypto.compound_blind_index([("a", "xy"), ("b", "z")]) != (
+            crypto.compound_blind_index([("a", "x"), ("b", "yz")])
+        )
+        assert crypto.compound_blind_index([("a", "x"), ("b", "y")]) != (
+            crypto.compound_blind_index([("b", "y"), ("a", "x")])
+        )
+        assert crypto.compound_blind_index([("a", "x")]) != crypto.blind_index("x", field="a")
+
+    def test_empty_part(self, crypto):
+        """A missing part gives an empty index."""
+        assert crypto.compound_blind_index([("passport_series", "45 10"), ("passport_number", "")]) == ""
+        assert crypto.compound_blind_index([("inn", "—"), ("name", "x")], encoding="raw") == b""
+
+    def test_many(self, crypto):
+        """Batch output equals single calls; compact settings apply."""
+        fields = ["passport_series", "passport_number"]
+        rows = [("45 10", "123456"), ("4510", "№123456"), (None, "1"), ("45 11", "123456")]
+        result = crypto.compound_blind_index_many(rows, fields, digest_size=16, encoding="base64url")
+        assert result == [
+            crypto.compound_blind_index(list(zip(fields, row, strict=True)), 16, "base64url") for row in rows
+        ]
+        assert result[0] == result[1] != result[3]
+        assert result[2] == ""
+
+    def test_invalid(self, crypto):
+        """No fields or mismatched rows raise ValueError."""
+        with pytest.raises(ValueError):
+            crypto.compound_blind_index([])
+        with pytest.raises(ValueError, match="Expected 2 values"):
+            crypto.compound_blind_index_many([("a",)], ["x", "y"])
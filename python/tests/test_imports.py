@@ -0,0 +1,67 @@
+"""
+Tests for import-time cost of the package.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Generous bound for slow CI machines; a cold import takes a few ms locally
+MAX_IMPORT_SECONDS = 0.5
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImports:
+    """Test that heavy modules load on first use only."""
+
+    def test_import_skips_cryptography_and_migration(self):
+        """Importing the package loads neither cryptography nor migration."""
+        loaded = _run(
+            "import sys, housler_crypto; "
+            "print(','.join(sorted(m for m in sys.modules "
+            "if m.startswith(('cryptography', 'housler_crypto.migration')))))"
+        )
+        assert loaded == ""
+
+    def test_lazy_attribute_loads_on_access(self):
+        """FernetMigrator is importable from the package root and cached."""
+        import housler_crypto
+        from housler_crypto.migration import FernetMigrator
+
+        assert housler_crypto.FernetMigrator is FernetMigrator
+        assert "FernetMigrator" in vars(housler_crypto)
+        assert "FernetMigrator" in dir(housler_crypto)
+
+    def test_unknown_attribute(self):
+        """Unknown attributes still raise AttributeError."""
+        import housler_crypto
+
+        with pytest.raises(AttributeError):
+            housler_crypto.does_not_exist  # noqa: B018
+
+    def test_first_encrypt_imports_cryptography(self):
+        """Deferred imports are resolved on first use."""
+        output = _run(
+            "from housler_crypto import HouslerCrypto; "
+            "c = HouslerCrypto('0f' * 32, iterations=1000); "
+            "print(c.decrypt(c.encrypt('x', 'f'), 'f'))"
+        )
+        assert output == "x"
+
+    def test_import_time(self):
+        """Import-time benchmark: `import housler_crypto` stays cheap."""
+        elapsed = float(_run(
+            "import time; start = time.perf_counter(); import housler_crypto; "
+            "print(time.perf_counter() - start)"
+        ))
+        assert elapsed < MAX_IMPORT_SECONDS
@@ -0,0 +1,147 @@
+"""
+Tests for path-based JSON document encryption.
+"""
+
+import io
+import json
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.jsondoc import WILDCARD, JsonPathCrypto, field_for_selector, parse_selector
+
+from .test_migration import TEST_MASTER_KEY
+
+DOCUMENT = {
+    "id": 7,
+    "applicant": {
+        "name": "Иван \"Ваня\" Иванов",
+        "passport": {"series": "4510", "number": 123456},
+    },
+    "contacts": [
+        {"type": "mobile", "phone": "+79991234567"},
+        {"type": "home", "phone": None},
+        {"type": "work", "phone": "+74951234567", "ext": [1, 2]},
+    ],
+    "notes": [],
+}
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY, iterations=1000)
+
+
+@pytest.fixture(scope="module")
+def paths(crypto):
+    return JsonPathCrypto(crypto, [
+        "$.applicant.passport.number",
+        "$.applicant['name']",
+        "$.contacts[*].phone",
+    ])
+
+
+class TestSelectors:
+    """Test selector parsing."""
+
+    def test_parse(self):
+        """Keys, quoted keys, indexes and wildcards."""
+        assert parse_selector("$.a['b c'][2][*].*") == ("a", "b c", 2, WILDCARD, WILDCARD)
+        assert field_for_selector("$.contacts[*].phone") == "contacts.phone"
+
+    @pytest.mark.parametrize("selector", ["a.b", "$", "$.a..b", "$.a[x]"])
+    def test_invalid(self, selector):
+        """Invalid selectors raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_selector(selector)
+
+
+class TestJsonPathCrypto:
+    """Test streaming encryption of documents."""
+
+    def test_roundtrip(self, crypto, paths):
+        """Selected scalars are encrypted under path fields; the rest is untouched."""
+        text = json.dumps(DOCUMENT, ensure_ascii=False, indent=2)
+        encrypted = paths.encrypt(text)
+        document = json.loads(encrypted)
+
+        assert document["id"] == 7
+        assert document["contacts"][1]["phone"] is None
+        assert document["contacts"][2]["ext"] == [1, 2]
+        assert crypto.decrypt(document["contacts"][0]["phone"], field="contacts.phone") == "+79991234567"
+        assert crypto.decrypt(
+            document["applicant"]["passport"]["number"], field="applicant.passport.number",
+        ) == "123456"
+        assert document["applicant"]["passport"]["series"] == "4510"
+        # Formatting outside matched values is kept
+        assert encrypted.count("\n") == text.count("\n")
+
+        decrypted = json.loads(paths.decrypt(encrypted))
+        expected = json.loads(text)
+        expected["applicant"]["passport"]["number"] = "123456"
+        assert decrypted == expected
+
+    def test_explicit_fields(self, crypto):
+        """A dict of selectors sets fields explicitly."""
+        paths = JsonPathCrypto(crypto, {"$.contacts[0].phone": "phone"})
+        document = json.loads(paths.encrypt(json.dumps(DOCUMENT)))
+        assert crypto.decrypt(document["contacts"][0]["phone"], field="phone") == "+79991234567"
+        assert document["contacts"][2]["phone"] == "+74951234567"
+
+    def test_stream_small_chunks_and_batches(self, crypto, paths, monkeypatch):
+        """Tokens split across reads and many batches per document."""
+        monkeypatch.setattr("housler_crypto.jsondoc._CHUNK_SIZE", 7)
+        small = JsonPathCrypto(crypto, ["$.contacts[*].phone"], batch_size=3)
+        document = {"contacts": [{"phone": f"+7999{i:07d}\\é"} for i in range(20)]}
+        fout = io.StringIO()
+
+        assert small.encrypt_stream(io.StringIO(json.dumps(document)), fout) == 20
+        encrypted = json.loads(fout.getvalue())
+        assert crypto.decrypt(encrypted["contacts"][13]["phone"], field="contacts.phone") == (
+            "+79990000013\\é"
+        )
+        assert json.loads(small.decrypt(fout.getvalue())) == document
+
+    @pytest.mark.parametrize("chunk_size", range(1, 12))
+    def test_numbers_split_across_reads(self, crypto, paths, monkeypatch, chunk_size):
+        """A number cut before its fraction or exponent is read whole."""
+        monkeypatch.setattr("housler_crypto.jsondoc._CHUNK_SIZE", chunk_size)
+        text = '{"id": 1.5e-3, "applicant": {"passport": {"number": -12.75E+2}}, "n": 10}'
+        encrypted = json.loads(paths.encrypt(text))
+
+        assert encrypted["id"] == 1.5e-3
+        assert encrypted["n"] == 10
+        number = encrypted["applicant"]["passport"]["number"]
+        assert crypto.decrypt(number, field="applicant.passport.number") == "-12.75E+2"
+
+    def test_unselected_subtrees_copied(self, paths, monkeypatch):
+        """Skipped subtrees are copied verbatim, brackets inside strings included."""
+        monkeypatch.setattr("housler_crypto.jsondoc._CHUNK_SIZE", 5)
+        text = '{"meta": {"x": ["a]}", {"y": "\\"[{"}], "z": [[[]]]}, "id": 1}'
+        assert paths.encrypt(text) == text
+
+    def test_json_lines(self, crypto, paths):
+        """Several documents in one stream are processed one after another."""
+        lines = "".join(json.dumps(DOCUMENT) + "\n" for _ in range(3))
+        encrypted = paths.encrypt(lines).splitlines()
+        assert len(encrypted) == 3
+        assert [json.loads(paths.decrypt(line))["contacts"][0]["phone"] for line in encrypted] == [
+            "+79991234567"
+        ] * 3
+
+    def test_idempotent(self, paths):
+        """Encrypting twice leaves hc1 values alone."""
+        once = paths.encrypt(json.dumps(DOCUMENT))
+        assert paths.encrypt(once) == once
+
+    @pytest.mark.parametrize("text", ['{"a": [1, 2}', '{"a": tru}', '{"a": 1', '{1: 2}'])
+    def test_invalid_json(self, paths, text):
+        """Malformed documents raise ValueError."""
+        with pytest.raises(ValueError):
+            paths.encrypt(text)
+
+    def test_tampered(self, paths):
+        """Decrypting a tampered value raises ValueError."""
+        encrypted = json.loads(paths.encrypt(json.dumps(DOCUMENT)))
+        encrypted["contacts"][0]["phone"] = encrypted["contacts"][0]["phone"][:-4] + "AAAA"
+        with pytest.raises(ValueError):
+            paths.decrypt(json.dumps(encrypted))
@@ -0,0 +1,134 @@
+"""
+Tests for compact blind index lookup tables.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+
+from .test_migration import TEST_MASTER_KEY
+
+np = pytest.importorskip("numpy")
+
+from housler_crypto.lookup import DigestTable  # noqa: E402
+
+EMAILS = ["a@example.com", "b@example.com", "", "A@Example.com ", "c@example.com", None]
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+
+@pytest.fixture
+def table(crypto):
+    return DigestTable.build(crypto, EMAILS, [10, 20, 30, 40, 50, 60], field="email")
+
+
+def _digest(crypto, value):
+    return crypto.blind_index(value, "email", digest_size=16, encoding="raw")
+
+
+class TestLookup:
+    """Test construction and lookups."""
+
+    def test_build_skips_empty(self, table):
+        """Empty values have no digest and are left out."""
+        assert len(table) == 4
+        assert table.digests.dtype == np.dtype("S16")
+        assert table.keys.dtype == np.int64
+
+    def test_get_and_contains(self, crypto, table):
+        """Single lookups return the first key; duplicates are all reachable."""
+        assert table.get(_digest(crypto, "b@example.com")) == 20
+        assert table.get(_digest(crypto, "x@example.com")) is None
+        assert _digest(crypto, "c@example.com") in table
+        assert sorted(table.keys_for(_digest(crypto, "a@example.com"))) == [10, 40]
+
+    def test_many(self, crypto, table):
+        """Batch lookups are vectorized and accept encoded hashes."""
+        hashes = [
+            crypto.blind_index(v, "email", digest_size=16, encoding="base64url")
+            for v in ["c@example.com", "x@example.com", "b@example.com"]
+        ]
+        assert table.get_many(hashes, encoding="base64url").tolist() == [50, -1, 20]
+        assert table.contains_many(hashes, encoding="base64url").tolist() == [True, False, True]
+
+    def test_from_hex_hashes(self, crypto):
+        """blind_index_many() hex output builds the same table."""
+        values = ["a@example.com", "b@example.com", ""]
+        table = DigestTable.from_hashes(crypto.blind_index_many(values, "email"), [1, 2, 3])
+        assert table.digest_size == 32
+        assert table.get(crypto.blind_index("b@example.com", "email"), encoding="hex") == 2
+
+    def test_mismatched_sizes(self, crypto, table):
+        """Digests of another size are rejected, as are key count mismatches."""
+        with pytest.raises(ValueError, match="16-byte"):
+            table.get(crypto.blind_index("a@example.com", "email", digest_size=8, encoding="raw"))
+        with pytest.raises(ValueError, match="keys"):
+            DigestTable.from_hashes(["00" * 16], [1, 2])
+
+    def test_empty(self, crypto, table):
+        """Empty input keeps the requested digest size and finds nothing."""
+        for empty in (
+            DigestTable.build(crypto, [], [], field="email"),
+            DigestTable.build(crypto, ["", None], [1, 2], field="email"),
+        ):
+            assert len(empty) == 0
+            assert empty.digest_size == 16
+            assert empty.get(_digest(crypto, "a@example.com")) is None
+            assert empty.contains_many([_digest(crypto, "a@example.com")]).tolist() == [False]
+            mine, theirs = empty.join(table)
+            assert len(mine) == len(theirs) == 0
+        assert DigestTable.from_hashes([], [], encoding="raw", digest_size=8).digest_size == 8
+
+
+class TestJoin:
+    """Test joins and duplicate groups."""
+
+    def test_join(self, crypto, table):
+        """Every matching pair is returned, including duplicates on both sides."""
+        other = DigestTable.build(
+            crypto, ["a@example.com", "c@example.com", "z@example.com", "a@example.com"],
+            [1, 2, 3, 4], field="email",
+        )
+        mine, theirs = table.join(other)
+        assert sorted(zip(mine.tolist(), theirs.tolist(), strict=True)) == [
+            (10, 1), (10, 4), (40, 1), (40, 4), (50, 2),
+        ]
+
+    def test_duplicates(self, table):
+        """Only groups of two or more rows are reported."""
+        groups = [sorted(group.tolist()) for group in table.duplicates()]
+        assert groups == [[10, 40]]
+
+
+class TestSaveLoad:
+    """Test the file format."""
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_roundtrip(self, crypto, table, tmp_path, mmap):
+        """Loaded tables answer the same queries."""
+        path = str(tmp_path / "emails.hcdt")
+        table.save(path)
+        loaded = DigestTable.load(path, mmap=mmap)
+
+        assert len(loaded) == 4
+        assert loaded.get(_digest(crypto, "b@example.com")) == 20
+        mine, theirs = loaded.join(table)
+        assert len(mine) == 6
+
+    def test_empty_and_invalid(self, tmp_path):
+        """Empty tables roundtrip; foreign and truncated files are rejected."""
+        path = tmp_path / "empty.hcdt"
+        DigestTable.from_hashes([], []).save(str(path))
+        assert len(DigestTable.load(str(path))) == 0
+
+        (tmp_path / "other").write_bytes(b"PK\x03\x04" + b"\0" * 20)
+        with pytest.raises(ValueError, match="not a digest table"):
+            DigestTable.load(str(tmp_path / "other"))
+
+        full = tmp_path / "full.hcdt"
+        DigestTable.from_hashes(["ab" * 16], [1]).save(str(full))
+        full.write_bytes(full.read_bytes()[:-1])
+        with pytest.raises(ValueError, match="truncated"):
+            DigestTable.load(str(full))
@@ -0,0 +1,199 @@
+"""
+Tests for the optional metrics layer.
+"""
+
+import pytest
+from housler_crypto import FernetMigrator, HouslerCrypto
+from housler_crypto.metrics import Metrics, instrument, uninstrument
+from housler_crypto.tokens import TokenIndex
+
+from .test_migration import TEST_ENCRYPTION_KEY, TEST_MASTER_KEY, TEST_SALT, _lk_fernet
+
+
+@pytest.fixture
+def metrics():
+    return Metrics()
+
+
+@pytest.fixture
+def crypto(metrics):
+    return instrument(HouslerCrypto(master_key=TEST_MASTER_KEY), metrics)
+
+
+class TestInstrumentCrypto:
+    """Test counters and histograms for HouslerCrypto."""
+
+    def test_counts_per_operation_and_field(self, crypto, metrics):
+        """Operations, bytes and key cache usage are labelled by field."""
+        encrypted = crypto.encrypt("user@example.com", field="email")
+        crypto.decrypt(encrypted, field="email")
+        crypto.blind_index("user@example.com", "email")
+        crypto.encrypt("+79991234567", field="phone")
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["operations"]["encrypt"] == {"email": 1, "phone": 1}
+        assert counters["operations"]["decrypt"] == {"email": 1}
+        assert counters["operations"]["blind_index"] == {"email": 1}
+        assert counters["bytes"]["encrypt"]["email"] == len(encrypted)
+        assert counters["bytes"]["decrypt"]["email"] == len(encrypted)
+        assert counters["key_derivations"]["derive_key"] == {
+            "email": 1, "email:blind_index": 1, "phone": 1,
+        }
+        assert counters["key_cache_hits"]["derive_key"] == {"email": 1}
+
+    def test_errors_and_histograms(self, crypto, metrics):
+        """Failures are counted and every call lands in the histogram."""
+        with pytest.raises(ValueError):
+            crypto.decrypt("hc1:AAAA", field="email")
+        crypto.decrypt("legacy", field="email")
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["errors"]["decrypt"] == {"email": 1}
+        histogram = snapshot["histograms"]["decrypt"]["email"]
+        assert histogram["count"] == 2
+        assert histogram["buckets"]["+Inf"] == 2
+        assert histogram["sum"] > 0
+
+    def test_batch_counts_values(self, crypto, metrics):
+        """Batch calls count values as operations and one latency sample."""
+        crypto.encrypt_many(iter(["a", "b", "c"]), field="name")
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["operations"]["encrypt_many"] == {"name": 3}
+        assert snapshot["histograms"]["encrypt_many"]["name"]["count"] == 1
+
+    def test_keyword_arguments(self, crypto, metrics):
+        """Values passed by keyword are counted like positional ones."""
+        encrypted = crypto.encrypt(plaintext="a@b.c", field="email")
+        crypto.decrypt(ciphertext=encrypted, field="email")
+        crypto.encrypt_many(plaintexts=iter(["a", "bc"]), field="email")
+        crypto.compound_blind_index_many(rows=iter([("a", "b")]), fields=["x", "y"])
+        index = instrument(TokenIndex(crypto, "name"), metrics)
+        assert len(list(index.tokens_many(values=iter(["Иванов"])))) == 1
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["bytes"]["encrypt"] == {"email": len(encrypted)}
+        assert counters["bytes"]["decrypt"] == {"email": len(encrypted)}
+        assert counters["operations"]["encrypt_many"] == {"email": 2}
+        assert counters["bytes"]["encrypt_many"]["email"] > 0
+        assert counters["operations"]["compound_blind_index_many"] == {"x+y": 1}
+        assert counters["bytes"]["tokens_many"] == {"name": 6}
+
+    def test_deterministic_and_compound(self, crypto, metrics):
+        """Deterministic encryption and compound indexes are recorded too."""
+        encrypted = crypto.encrypt_deterministic("user@example.com", field="email")
+        crypto.encrypt_deterministic_many(["a", "b"], field="email")
+        crypto.compound_blind_index([("last_name", "Иванов"), ("birth_date", "1990-01-01")])
+        crypto.compound_blind_index_many(
+            iter([("Иванов", "1990-01-01"), ("Петров", "1985-05-05")]), ["last_name", "birth_date"],
+        )
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["operations"]["encrypt_deterministic"] == {"email": 1}
+        assert counters["bytes"]["encrypt_deterministic"]["email"] == len(encrypted)
+        assert counters["operations"]["encrypt_deterministic_many"] == {"email": 2}
+        assert counters["operations"]["compound_blind_index"] == {"last_name+birth_date": 1}
+        assert counters["operations"]["compound_blind_index_many"] == {"last_name+birth_date": 2}
+        assert counters["bytes"]["compound_blind_index"]["last_name+birth_date"] == 16
+
+    def test_token_index(self, metrics):
+        """Token index calls are labelled by the index field; tokens_many stays lazy."""
+        index = TokenIndex(HouslerCrypto(master_key=TEST_MASTER_KEY), "last_name")
+        instrument(index, metrics)
+        index.tokens("Иванов")
+        index.query("Ива")
+        results = index.tokens_many(iter(["Петров", None, "Сидоров"]))
+
+        assert "tokens_many" not in metrics.snapshot()["histograms"]
+        assert len(list(results)) == 3
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["operations"]["tokens"] == {"last_name": 1}
+        assert snapshot["counters"]["operations"]["token_query"] == {"last_name": 1}
+        assert snapshot["counters"]["operations"]["tokens_many"] == {"last_name": 3}
+        assert snapshot["counters"]["bytes"]["tokens_many"] == {"last_name": 13}
+        assert snapshot["histograms"]["tokens_many"]["last_name"]["count"] == 1
+
+        with pytest.raises(ValueError):
+            index.query("a")
+        assert metrics.snapshot()["counters"]["errors"]["token_query"] == {"last_name": 1}
+
+    def test_uninstrument_restores_methods(self, crypto, metrics):
+        """After uninstrument nothing more is recorded."""
+        uninstrument(crypto)
+        crypto.encrypt("value", field="email")
+
+        assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+        assert "encrypt" not in vars(crypto)
+
+    def test_reinstrument_does_not_double_count(self, crypto, metrics):
+        """Instrumenting twice replaces the previous wrappers."""
+        instrument(crypto, metrics)
+        crypto.encrypt("value", field="email")
+
+        assert metrics.snapshot()["counters"]["operations"]["encrypt"] == {"email": 1}
+
+    def test_rejects_other_objects(self, metrics):
+        """Only HouslerCrypto, FernetMigrator and TokenIndex can be instrumented."""
+        with pytest.raises(TypeError):
+            instrument(object(), metrics)
+
+
+class TestInstrumentMigrator:
+    """Test metrics for FernetMigrator."""
+
+    def test_legacy_operations(self, crypto, metrics):
+        """Migrations record legacy decrypt, migrate and the new encrypt."""
+        migrator = instrument(
+            FernetMigrator.from_lk_config(TEST_ENCRYPTION_KEY, TEST_SALT), metrics,
+        )
+        token = _lk_fernet().encrypt(b"user@example.com").decode()
+
+        migrator.migrate(token, "email", crypto)
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["operations"]["legacy_migrate"] == {"email": 1}
+        assert counters["operations"]["legacy_decrypt"] == {"email": 1}
+        assert counters["operations"]["encrypt"] == {"email": 1}
+        assert counters["bytes"]["legacy_migrate"]["email"] == len(token)
+        assert counters["key_cache_hits"]["legacy_key"] == {"email": 1}
+
+    def test_fernet_passthrough_counted_as_error(self, metrics):
+        """Values that are not Fernet tokens are returned as is and counted as failures."""
+        migrator = instrument(
+            FernetMigrator.from_lk_config(TEST_ENCRYPTION_KEY, TEST_SALT), metrics,
+        )
+
+        assert migrator.decrypt("plain text", "email") == "plain text"
+
+        counters = metrics.snapshot()["counters"]
+        assert counters["errors"]["legacy_fernet_passthrough"] == {"email": 1}
+        assert counters["operations"]["legacy_decrypt"] == {"email": 1}
+
+        uninstrument(migrator)
+        migrator.decrypt("plain text", "email")
+        assert metrics.snapshot()["counters"]["errors"]["legacy_fernet_passthrough"] == {"email": 1}
+
+
+class TestPrometheus:
+    """Test the text exposition format."""
+
+    def test_exposition(self, crypto, metrics):
+        """Counters and histogram series are rendered with labels."""
+        crypto.encrypt("value", field='we"ird')
+        text = metrics.to_prometheus()
+
+        assert "# TYPE housler_crypto_operations_total counter" in text
+        assert 'housler_crypto_operations_total{operation="encrypt",field="we\\"ird"} 1' in text
+        assert "# TYPE housler_crypto_operation_duration_seconds histogram" in text
+        assert (
+            'housler_crypto_operation_duration_seconds_bucket'
+            '{operation="encrypt",field="we\\"ird",le="+Inf"} 1'
+        ) in text
+        assert 'housler_crypto_operation_duration_seconds_count{operation="encrypt"' in text
+        assert text.endswith("\n")
+
+    def test_reset(self, crypto, metrics):
+        """reset() clears everything."""
+        crypto.encrypt("value", field="email")
+        metrics.reset()
+        assert metrics.to_prometheus() == "\n"
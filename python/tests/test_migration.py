@@ -225,3 +225,433 @@ class TestMigratorNotConfigured:
 
         with pytest.raises(ValueError, match="not configured"):
             migrator.decrypt("something", field="email")
+
+
+def _lk_fernet(encryption_key: str = TEST_ENCRYPTION_KEY, salt: str = TEST_SALT):
+    """Build the Fernet instance lk uses for the given config."""
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    import base64
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt.encode("utf-8"),
+        iterations=100_000,
+    )
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(bytes.fromhex(encryption_key))))
+
+
+class TestMigrateDatabaseFields:
+    """Test multi-column migration against SQLite."""
+
+    USERS = [
+        (1, "user1@example.com", "+79991234567", "Иван Иванов"),
+        (2, "user2@example.com", None, "Пётр Петров"),
+        (3, None, "+79990000000", None),
+    ]
+
+    @pytest.fixture
+    def new_crypto(self):
+        return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+    @pytest.fixture
+    def migrator(self):
+        return FernetMigrator.from_lk_config(
+            encryption_key=TEST_ENCRYPTION_KEY,
+            encryption_salt=TEST_SALT,
+        )
+
+    @pytest.fixture
+    def db(self, new_crypto):
+        import sqlite3
+
+        fernet = _lk_fernet()
+
+        def enc(value):
+            return fernet.encrypt(value.encode("utf-8")).decode("utf-8") if value else None
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, phone TEXT, name TEXT)")
+        for pk, email, phone, name in self.USERS:
+            conn.execute(
+                "INSERT INTO users VALUES (?, ?, ?, ?)",
+                (pk, enc(email), enc(phone), enc(name)),
+            )
+        # One value already migrated
+        conn.execute(
+            "UPDATE users SET name = ? WHERE id = 2",
+            (new_crypto.encrypt("Пётр Петров", field="name"),),
+        )
+        conn.commit()
+        yield conn
+        conn.close()
+
+    def test_single_scan_migrates_all_columns(self, db, migrator, new_crypto):
+        """All mapped columns should be migrated and decryptable."""
+        from housler_crypto.migration import migrate_database_fields
+
+        stats = migrate_database_fields(
+            db, "users", "id",
+            {"email": "email", "phone": "phone", "name": "name"},
+            migrator, new_crypto,
+            batch_size=2, dry_run=False, placeholder="?",
+        )
+
+        assert stats["rows"] == 3
+        assert stats["columns"]["email"] == {"total": 2, "migrated": 2, "skipped": 0, "errors": 0}
+        assert stats["columns"]["phone"] == {"total": 2, "migrated": 2, "skipped": 0, "errors": 0}
+        assert stats["columns"]["name"] == {"total": 2, "migrated": 1, "skipped": 1, "errors": 0}
+        assert stats["migrated"] == 5
+        assert stats["skipped"] == 1
+
+        rows = db.execute("SELECT id, email, phone, name FROM users ORDER BY id").fetchall()
+        for (_pk, email, phone, name), expected in zip(rows, self.USERS, strict=True):
+            for column, value, plain in zip(
+                ("email", "phone", "name"), (email, phone, name), expected[1:], strict=True
+            ):
+                if plain is None:
+                    assert value is None
+                else:
+                    assert value.startswith("hc1:")
+                    assert new_crypto.decrypt(value, field=column) == plain
+
+    def test_dry_run_does_not_write(self, db, migrator, new_crypto):
+        """dry_run should count but leave the table untouched."""
+        from housler_crypto.migration import migrate_database_fields
+
+        before = db.execute("SELECT * FROM users ORDER BY id").fetchall()
+        stats = migrate_database_fields(
+            db, "users", "id", {"email": "email", "phone": "phone"},
+            migrator, new_crypto, placeholder="?",
+        )
+
+        assert stats["dry_run"] is True
+        assert stats["migrated"] == 4
+        assert db.execute("SELECT * FROM users ORDER BY id").fetchall() == before
+
+    def test_per_column_errors(self, db, new_crypto):
+        """A failing column should not block the other columns of the row."""
+        from housler_crypto.migration import migrate_database_fields
+
+        agent_migrator = FernetMigrator.from_agent_config(encryption_key=TEST_ENCRYPTION_KEY)
+        db.execute("UPDATE users SET phone = NULL")
+        db.execute("UPDATE users SET email = 'hc1:already' WHERE id = 1")
+
+        stats = migrate_database_fields(
+            db, "users", "id", {"email": "email", "name": "name"},
+            agent_migrator, new_crypto, dry_run=False, placeholder="?",
+        )
+
+        assert stats["columns"]["email"]["skipped"] == 1
+        assert stats["columns"]["email"]["errors"] == 1
+        assert stats["columns"]["name"]["errors"] == 1
+        assert stats["columns"]["name"]["skipped"] == 1
+
+    def test_empty_mapping_rejected(self, db, migrator, new_crypto):
+        """An empty column mapping is a usage error."""
+        from housler_crypto.migration import migrate_database_fields
+
+        with pytest.raises(ValueError, match="columns mapping is required"):
+            migrate_database_fields(db, "users", "id", {}, migrator, new_crypto)
+
+    def test_single_field_wrapper(self, db, migrator, new_crypto):
+        """migrate_database_field keeps its flat stats format."""
+        from housler_crypto.migration import migrate_database_field
+
+        stats = migrate_database_field(
+            db, "users", "id", "phone", "phone",
+            migrator, new_crypto, dry_run=False, placeholder="?",
+        )
+
+        assert stats == {
+            "total": 2, "migrated": 2, "skipped": 0, "errors": 0, "dry_run": False, "last_pk": 3,
+        }
+        phone = db.execute("SELECT phone FROM users WHERE id = 1").fetchone()[0]
+        assert new_crypto.decrypt(phone, field="phone") == "+79991234567"
+
+
+class TestPipelinedMigration:
+    """Test the pipelined reader/crypto/writer mode end to end on SQLite."""
+
+    ROWS = 57
+
+    @pytest.fixture
+    def new_crypto(self):
+        return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+    @pytest.fixture
+    def migrator(self):
+        return FernetMigrator.from_lk_config(
+            encryption_key=TEST_ENCRYPTION_KEY,
+            encryption_salt=TEST_SALT,
+        )
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        import sqlite3
+
+        fernet = _lk_fernet()
+        path = tmp_path / "users.db"
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, phone TEXT)")
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?, ?)",
+            [
+                (
+                    pk,
+                    fernet.encrypt(f"user{pk}@example.com".encode()).decode(),
+                    fernet.encrypt(f"+7999{pk:07d}".encode()).decode() if pk % 3 else None,
+                )
+                for pk in range(1, self.ROWS + 1)
+            ],
+        )
+        conn.commit()
+        conn.close()
+        return path
+
+    def _assert_migrated(self, conn, new_crypto):
+        for pk, email, phone in conn.execute("SELECT id, email, phone FROM users"):
+            assert new_crypto.decrypt(email, field="email") == f"user{pk}@example.com"
+            if pk % 3:
+                assert new_crypto.decrypt(phone, field="phone") == f"+7999{pk:07d}"
+            else:
+                assert phone is None
+
+    def test_separate_read_connection(self, db_path, migrator, new_crypto):
+        """Reader on its own connection, commits reported in pk order."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_fields
+
+        conn = sqlite3.connect(db_path)
+        reader = sqlite3.connect(db_path, check_same_thread=False)
+        checkpoints = []
+
+        stats = migrate_database_fields(
+            conn, "users", "id", {"email": "email", "phone": "phone"},
+            migrator, new_crypto,
+            batch_size=5, dry_run=False, placeholder="?",
+            workers=3, queue_size=2, read_connection=reader,
+            on_commit=checkpoints.append,
+        )
+
+        assert stats["rows"] == self.ROWS
+        assert stats["columns"]["email"]["migrated"] == self.ROWS
+        assert stats["columns"]["phone"]["migrated"] == self.ROWS - self.ROWS // 3
+        assert stats["errors"] == 0
+        assert stats["last_pk"] == self.ROWS
+        assert checkpoints == sorted(checkpoints)
+        assert checkpoints == list(range(5, self.ROWS, 5)) + [self.ROWS]
+        self._assert_migrated(conn, new_crypto)
+
+    def test_shared_connection(self, db_path, migrator, new_crypto):
+        """Reader and writer may share one connection."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_field
+
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_database_field(
+            conn, "users", "id", "phone", "phone", migrator, new_crypto,
+            batch_size=4, dry_run=False, placeholder="?", workers=2,
+        )
+        stats = migrate_database_field(
+            conn, "users", "id", "email", "email", migrator, new_crypto,
+            batch_size=4, dry_run=False, placeholder="?", workers=2,
+        )
+
+        assert stats["migrated"] == self.ROWS
+        self._assert_migrated(conn, new_crypto)
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_resume_after_checkpoint(self, db_path, migrator, new_crypto, workers):
+        """start_after should skip rows committed by a previous run, in both modes."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_fields
+
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+
+        class MigrationInterruptedError(Exception):
+            pass
+
+        checkpoints = []
+
+        def interrupt_after_two(last_pk):
+            checkpoints.append(last_pk)
+            if len(checkpoints) == 2:
+                raise MigrationInterruptedError
+
+        with pytest.raises(MigrationInterruptedError):
+            migrate_database_fields(
+                conn, "users", "id", {"email": "email", "phone": "phone"},
+                migrator, new_crypto,
+                batch_size=10, dry_run=False, placeholder="?", workers=workers,
+                on_commit=interrupt_after_two,
+            )
+
+        stats = migrate_database_fields(
+            conn, "users", "id", {"email": "email", "phone": "phone"},
+            migrator, new_crypto,
+            batch_size=10, dry_run=False, placeholder="?", workers=workers,
+            start_after=checkpoints[-1],
+        )
+
+        assert stats["rows"] == self.ROWS - 20
+        assert stats["skipped"] == 0
+        self._assert_migrated(conn, new_crypto)
+
+    def test_dry_run(self, db_path, migrator, new_crypto):
+        """Pipelined dry run counts without writing or checkpointing."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_fields
+
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        checkpoints = []
+        stats = migrate_database_fields(
+            conn, "users", "id", {"email": "email"}, migrator, new_crypto,
+            batch_size=8, placeholder="?", workers=4, on_commit=checkpoints.append,
+        )
+
+        assert stats["migrated"] == self.ROWS
+        assert checkpoints == []
+        email = conn.execute("SELECT email FROM users WHERE id = 1").fetchone()[0]
+        assert not email.startswith("hc1:")
+
+    def test_invalid_workers(self, db_path, migrator, new_crypto):
+        """workers must be positive."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_fields
+
+        conn = sqlite3.connect(db_path)
+        with pytest.raises(ValueError, match="workers"):
+            migrate_database_fields(
+                conn, "users", "id", {"email": "email"}, migrator, new_crypto,
+                placeholder="?", workers=0,
+            )
+
+
+class TestGovernedMigration:
+    """Test migrations driven by a RateGovernor."""
+
+    def test_governor_sets_batch_size(self):
+        """Batch size should follow the governor as it backs off."""
+        import sqlite3
+        from housler_crypto.migration import migrate_database_fields
+        from housler_crypto.throttle import RateGovernor
+
+        fernet = _lk_fernet()
+        new_crypto = HouslerCrypto(master_key=TEST_MASTER_KEY)
+        migrator = FernetMigrator.from_lk_config(
+            encryption_key=TEST_ENCRYPTION_KEY,
+            encryption_salt=TEST_SALT,
+        )
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?)",
+            [(pk, fernet.encrypt(f"u{pk}@example.com".encode()).decode()) for pk in range(1, 31)],
+        )
+        conn.commit()
+
+        batch_sizes = []
+        healthy = iter([False, False, True, True, True, True, True, True, True])
+
+        governor = RateGovernor(
+            health_probe=lambda: next(healthy), batch_size=8, min_batch_size=2,
+            max_batch_size=8, sleep=lambda seconds: None,
+        )
+        original = RateGovernor.throttle
+
+        def recording_throttle(self, rows, nbytes=0):
+            batch_sizes.append(rows)
+            original(self, rows, nbytes)
+
+        governor.throttle = recording_throttle.__get__(governor)
+
+        stats = migrate_database_fields(
+            conn, "users", "id", {"email": "email"}, migrator, new_crypto,
+            dry_run=False, placeholder="?", governor=governor,
+        )
+
+        assert stats["migrated"] == 30
+        assert stats["throttle"]["backoffs"] == 2
+        assert batch_sizes[:3] == [8, 4, 2]
+        assert sum(batch_sizes) == 30
+        for pk, email in conn.execute("SELECT id, email FROM users"):
+            assert new_crypto.decrypt(email, field="email") == f"u{pk}@example.com"
+
+
+class TestRecomputeBlindIndexes:
+    """Test compact blind index recomputation against SQLite."""
+
+    @pytest.fixture
+    def crypto(self):
+        return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+    @pytest.fixture
+    def db(self, crypto):
+        import sqlite3
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, email_hash TEXT)")
+        rows = [
+            (1, crypto.encrypt("a@example.com", field="email")),
+            (2, "legacy@example.com"),
+            (3, None),
+            (4, "hc1:broken"),
+            (5, crypto.encrypt_deterministic("b@example.com", field="email")),
+        ]
+        for pk, email in rows:
+            conn.execute(
+                "INSERT INTO users VALUES (?, ?, ?)",
+                (pk, email, crypto.blind_index(crypto.decrypt(email, "email"), "email")
+                 if email and email != "hc1:broken" else "stale"),
+            )
+        conn.commit()
+        yield conn
+        conn.close()
+
+    def test_recompute(self, db, crypto):
+        """Indexes are rewritten compactly; NULL sources clear the index."""
+        from housler_crypto.migration import recompute_blind_indexes
+
+        stats = recompute_blind_indexes(
+            db, "users", "id", {"email_hash": ("email", "email")}, crypto,
+            batch_size=2, dry_run=False, placeholder="?",
+        )
+
+        assert stats["rows"] == 5
+        assert stats["updated"] == 4
+        assert stats["errors"] == 1
+        hashes = dict(db.execute("SELECT id, email_hash FROM users"))
+        assert hashes[1] == crypto.blind_index(
+            "a@example.com", "email", digest_size=16, encoding="base64url",
+        )
+        assert len(hashes[2]) == 22
+        assert hashes[3] is None
+        assert hashes[4] == "stale"
+        assert HouslerCrypto.is_blind_index(hashes[5], 16, "base64url")
+
+        again = recompute_blind_indexes(
+            db, "users", "id", {"email_hash": ("email", "email")}, crypto,
+            dry_run=False, placeholder="?",
+        )
+        assert again["updated"] == 0
+        assert again["skipped"] == 3
+
+    def test_dry_run_and_validation(self, db, crypto):
+        """dry_run writes nothing; bad settings are rejected up front."""
+        from housler_crypto.migration import recompute_blind_indexes
+
+        before = list(db.execute("SELECT * FROM users"))
+        stats = recompute_blind_indexes(
+            db, "users", "id", {"email_hash": ("email", "email")}, crypto,
+            digest_size=8, encoding="raw", placeholder="?",
+        )
+        assert stats["updated"] == 4
+        assert list(db.execute("SELECT * FROM users")) == before
+
+        with pytest.raises(ValueError, match="digest_size"):
+            recompute_blind_indexes(db, "users", "id", {"h": ("email", "email")}, crypto, 4)
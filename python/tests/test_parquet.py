@@ -0,0 +1,81 @@
+"""
+Tests for the Parquet row-group transform.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+
+from .test_migration import TEST_MASTER_KEY
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from housler_crypto.parquet import decrypt_parquet, encrypt_parquet  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY, iterations=1000)
+
+
+@pytest.fixture
+def users_parquet(tmp_path):
+    """Three row groups with a null email."""
+    table = pa.table({
+        "id": pa.array(range(30), type=pa.int64()),
+        "email": [None if i == 5 else f"User{i}@Example.com" for i in range(30)],
+        "phone": [f"+7999000{i:04d}" for i in range(30)],
+    })
+    path = tmp_path / "users.parquet"
+    pq.write_table(table, path, row_group_size=10)
+    return path, table
+
+
+class TestParquet:
+    """Test encrypt/decrypt round trips."""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_roundtrip(self, crypto, users_parquet, tmp_path, workers):
+        """Row groups, schema and nulls survive; blind indexes are appended."""
+        source, original = users_parquet
+        encrypted = tmp_path / "users.enc.parquet"
+        decrypted = tmp_path / "users.dec.parquet"
+
+        stats = encrypt_parquet(
+            source, encrypted, crypto,
+            columns={"email": "email", "phone": "phone"},
+            blind_indexes={"email": "email_hash"},
+            workers=workers,
+        )
+        assert stats == {"row_groups": 3, "rows": 30}
+
+        parquet_file = pq.ParquetFile(encrypted)
+        assert parquet_file.num_row_groups == 3
+        assert parquet_file.schema_arrow.names == ["id", "email", "phone", "email_hash"]
+
+        table = pq.read_table(encrypted)
+        assert table.column("id").equals(original.column("id"))
+        assert table.column("email").null_count == 1
+        assert crypto.decrypt(table.column("phone")[12].as_py(), field="phone") == "+79990000012"
+        assert table.column("email_hash")[7].as_py() == crypto.blind_index(
+            "user7@example.com", field="email"
+        )
+        assert table.column("email_hash")[5].as_py() is None
+
+        decrypt_parquet(
+            encrypted, decrypted, crypto, columns={"email": "email", "phone": "phone"},
+            workers=workers,
+        )
+        assert pq.read_table(decrypted).drop_columns(["email_hash"]).equals(original)
+
+    def test_validation(self, crypto, users_parquet, tmp_path):
+        """Missing, non-string and clashing columns are rejected."""
+        source, _ = users_parquet
+        dest = tmp_path / "out.parquet"
+
+        with pytest.raises(ValueError):
+            encrypt_parquet(source, dest, crypto, columns={"passport": "passport"})
+        with pytest.raises(TypeError):
+            encrypt_parquet(source, dest, crypto, columns={"id": "id"})
+        with pytest.raises(ValueError):
+            encrypt_parquet(source, dest, crypto, columns={}, blind_indexes={"email": "phone"})
@@ -0,0 +1,90 @@
+"""
+Tests for PII redaction in logs.
+"""
+
+import logging
+
+import pytest
+from housler_crypto.redact import (
+    PIIRedactingFilter,
+    PIIRedactingFormatter,
+    is_valid_inn,
+    redact,
+)
+
+
+def _record(msg, args=None, exc_info=None):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+class TestRedact:
+    """Test the combined matcher."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("login test@example.com ok", "login te***@example.com ok"),
+        ("call +7 (999) 123-45-67", "call +7***4567"),
+        ("call 8-999-123-45-67 or 89991234567", "call 8***4567 or 8***4567"),
+        ("card 4111 1111 1111 1111", "card **** **** **** 1111"),
+        ("card 4111111111111111", "card **** **** **** 1111"),
+        ("inn 7707083893 / 500100732259", "inn 77***3893 / 50***2259"),
+    ])
+    def test_masks_pii(self, text, expected):
+        """PII is rewritten with the mask rules."""
+        assert redact(text) == expected
+
+    @pytest.mark.parametrize("text", [
+        "Processed 12 rows in 3.40 ms",
+        "ts=1700000000 id=123456789012",
+        "2026-10-19 12:00:00,123 started",
+        "ts_ns=1700000000123456789 order=1712345678901234",
+    ])
+    def test_leaves_other_text(self, text):
+        """Timestamps and ids without valid INN check digits or Luhn sums stay as they are."""
+        assert redact(text) == text
+
+    def test_inn_checksum(self):
+        """INN check digits."""
+        assert is_valid_inn("7707083893")
+        assert is_valid_inn("500100732259")
+        assert not is_valid_inn("7707083894")
+        assert not is_valid_inn("12345")
+
+
+class TestLogging:
+    """Test the filter and formatter."""
+
+    def test_filter_formats_args_once(self):
+        """Args are merged into the message and redacted."""
+        record = _record("User %s from %s", ("test@example.com", "+79991234567"))
+        assert PIIRedactingFilter().filter(record) is True
+        assert record.getMessage() == "User te***@example.com from +7***4567"
+        assert not record.args
+
+    def test_filter_keeps_broken_records(self):
+        """A message that cannot be formatted is left for the handler."""
+        record = _record("%d items", ("x",))
+        assert PIIRedactingFilter().filter(record) is True
+        assert record.args == ("x",)
+
+    def test_formatter_covers_tracebacks(self):
+        """The formatter redacts the whole line, exception text included."""
+        try:
+            raise ValueError("bad email test@example.com")
+        except ValueError:
+            import sys
+
+            record = _record("failed", exc_info=sys.exc_info())
+        output = PIIRedactingFormatter("%(message)s").format(record)
+        assert "test@example.com" not in output
+        assert "te***@example.com" in output
+
+    def test_handler(self, caplog):
+        """Works when attached to a logger."""
+        logger = logging.getLogger("housler_crypto.test_redact")
+        logger.addFilter(PIIRedactingFilter())
+        try:
+            with caplog.at_level(logging.INFO, logger=logger.name):
+                logger.info("Sent code to %s", "+7 999 123 45 67")
+        finally:
+            logger.filters.clear()
+        assert caplog.records[0].getMessage() == "Sent code to +7***4567"
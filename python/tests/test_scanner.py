@@ -0,0 +1,81 @@
+"""
+Tests for the free-text PII scanner.
+"""
+
+import pytest
+from housler_crypto.scanner import PIIScanner, Span, is_valid_luhn
+
+TEXT = "Паспорт 45 10 123456, тел. +7 999 123-45-67, почта ivan@example.ru"
+
+
+class TestScan:
+    """Test span detection."""
+
+    def test_spans(self):
+        """Spans are typed and ordered by position."""
+        spans = PIIScanner().scan(TEXT)
+        assert [span.kind for span in spans] == ["passport", "phone", "email"]
+        assert TEXT[spans[0].start:spans[0].end] == "45 10 123456"
+        assert TEXT[spans[2].start:spans[2].end] == "ivan@example.ru"
+
+    def test_checksums(self):
+        """Cards need a valid Luhn sum, INNs valid check digits."""
+        scanner = PIIScanner()
+        text = "4111 1111 1111 1111 / 4111 1111 1111 1112 / 7707083893 / 7707083894"
+        assert [(s.kind, text[s.start:s.end]) for s in scanner.scan(text)] == [
+            ("card", "4111 1111 1111 1111"), ("inn", "7707083893"),
+        ]
+        assert len(PIIScanner(validate=False).scan(text)) == 4
+
+    def test_luhn(self):
+        """Luhn check."""
+        assert is_valid_luhn("4111111111111111")
+        assert is_valid_luhn("5500000000000004")
+        assert not is_valid_luhn("4111111111111112")
+
+    def test_kinds(self):
+        """Only requested kinds are reported."""
+        assert [s.kind for s in PIIScanner(kinds=["email"]).scan(TEXT)] == ["email"]
+        with pytest.raises(ValueError):
+            PIIScanner(kinds=["snils"])
+
+    def test_no_pii(self):
+        """Plain text, empty and None have no spans."""
+        scanner = PIIScanner()
+        assert scanner.scan("Заявка 42 принята 2026-10-19 в 12:00") == []
+        assert scanner.scan("") == []
+        assert scanner.scan(None) == []
+
+    def test_redact(self):
+        """Spans are rewritten with the mask rules."""
+        scanner = PIIScanner()
+        assert scanner.redact(TEXT) == (
+            "Паспорт ** ** ******, тел. +7***4567, почта iv***@example.ru"
+        )
+        start = TEXT.index("ivan@")
+        spans = [Span("email", start, len(TEXT))]
+        assert scanner.redact(TEXT, spans).endswith("iv***@example.ru")
+
+
+class TestScanMany:
+    """Test streaming scans and counters."""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_stream_and_counts(self, workers):
+        """Results follow input order; counters cover every document."""
+        documents = [TEXT, None, "no pii here", "card 5500 0000 0000 0004"] * 25
+        scanner = PIIScanner()
+
+        results = list(scanner.scan_many(iter(documents), workers=workers, chunk_size=7))
+
+        assert len(results) == 100
+        assert [s.kind for s in results[3]] == ["card"]
+        assert results[1] == []
+        assert scanner.to_dict() == {
+            "documents": 100,
+            "documents_with_pii": 50,
+            "counts": {"email": 25, "phone": 25, "inn": 0, "card": 25, "passport": 25},
+        }
+
+        scanner.reset()
+        assert scanner.to_dict()["documents"] == 0
@@ -0,0 +1,142 @@
+"""
+Tests for declarative record schemas.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.schema import Attribute, RecordSchema
+
+from .test_migration import TEST_MASTER_KEY
+
+
+@pytest.fixture(scope="module")
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY, iterations=1000)
+
+
+@pytest.fixture(scope="module")
+def plan(crypto):
+    schema = RecordSchema({
+        "phone": Attribute(normalize="phone", blind_index=True, mask="phone"),
+        "email": Attribute(normalize="email", blind_index="email_bi", mask="email"),
+        "full_name": Attribute(field="name", mask="name"),
+        "city": Attribute(encrypt=False, normalize="strip"),
+    })
+    return schema.compile(crypto)
+
+
+RECORD = {
+    "id": 42,
+    "phone": "8 (999) 123-45-67",
+    "email": " User@Example.com ",
+    "full_name": "Иван Иванов",
+    "city": " Москва ",
+}
+
+
+class TestRecordSchema:
+    """Test schema validation."""
+
+    def test_unknown_options(self):
+        """Unknown normalizers and masks are rejected."""
+        with pytest.raises(ValueError):
+            Attribute(normalize="snils")
+        with pytest.raises(ValueError):
+            Attribute(mask="passport")
+        with pytest.raises(ValueError):
+            Attribute(blind_index=True, digest_size=4)
+        with pytest.raises(ValueError):
+            Attribute(blind_index=True, encoding="base32")
+
+    def test_blind_index_key_clash(self):
+        """A blind index cannot overwrite another attribute."""
+        with pytest.raises(ValueError):
+            RecordSchema({"email": Attribute(blind_index="phone"), "phone": Attribute()})
+
+
+class TestRecordPlan:
+    """Test compiled plans against the scalar API."""
+
+    def test_encrypt(self, crypto, plan):
+        """Values are normalized, hashed and encrypted like the manual boilerplate."""
+        row = plan.encrypt(RECORD)
+
+        assert row["id"] == 42
+        assert crypto.decrypt(row["phone"], field="phone") == "79991234567"
+        assert row["phone_hash"] == crypto.blind_index("79991234567", field="phone")
+        assert crypto.decrypt(row["email"], field="email") == "user@example.com"
+        assert row["email_bi"] == crypto.blind_index("user@example.com", field="email")
+        assert crypto.decrypt(row["full_name"], field="name") == "Иван Иванов"
+        assert row["city"] == "Москва"
+        assert RECORD["phone"] == "8 (999) 123-45-67"
+
+    @pytest.mark.parametrize("digest_size,encoding", [(16, "base64url"), (8, "raw")])
+    def test_blind_index_settings(self, crypto, digest_size, encoding):
+        """Blind indexes use the attribute's digest size and encoding."""
+        plan = RecordSchema({
+            "email": Attribute(blind_index=True, digest_size=digest_size, encoding=encoding),
+        }).compile(crypto)
+
+        row = plan.encrypt({"email": "user@example.com"})
+        assert row["email_hash"] == crypto.blind_index(
+            "user@example.com", field="email", digest_size=digest_size, encoding=encoding,
+        )
+        assert plan.encrypt({"email": ""})["email_hash"] == (b"" if encoding == "raw" else "")
+
+    @pytest.mark.parametrize("value", [42, b"user@example.com"])
+    def test_rejects_non_strings(self, plan, value):
+        """Values other than None and str raise TypeError naming the attribute."""
+        with pytest.raises(TypeError, match="'email'"):
+            plan.encrypt({"email": value})
+        with pytest.raises(TypeError, match="'email'"):
+            plan.decryptor().decrypt({"email": value})
+
+    def test_missing_and_empty(self, plan):
+        """Missing and None values are skipped; empty values stay empty."""
+        row = plan.encrypt({"phone": None, "email": ""})
+        assert row == {"phone": None, "email": "", "email_bi": ""}
+
+    def test_encrypt_many_unique_ivs(self, plan):
+        """Every value in a batch gets its own IV."""
+        rows = plan.encrypt_many([RECORD] * 50)
+        assert len({row["phone"] for row in rows}) == 50
+        assert len({row["phone_hash"] for row in rows}) == 1
+
+    def test_encrypt_twice(self, crypto, plan):
+        """Re-running a plan leaves encrypted values and their blind indexes alone."""
+        row = plan.encrypt(RECORD)
+        again = plan.encrypt_many([row])[0]
+
+        assert again == row
+        assert crypto.decrypt(again["phone"], field="phone") == "79991234567"
+        assert plan.decryptor().decrypt(again)["email"] == "user@example.com"
+
+    def test_mask(self, plan):
+        """mask() masks configured attributes of plaintext records."""
+        masked = plan.mask(RECORD)
+        assert masked["phone"] == "8***4567"
+        assert masked["full_name"] == "Ив*** Ив***"
+        assert masked["city"] == RECORD["city"]
+        assert plan.mask_many([RECORD]) == [masked]
+
+    def test_decrypt_subset(self, plan):
+        """The reverse plan decrypts only the requested attributes."""
+        row = plan.encrypt(RECORD)
+        reader = plan.decryptor(["email"])
+        decrypted = reader.decrypt(row)
+
+        assert decrypted["email"] == "user@example.com"
+        assert decrypted["phone"] == row["phone"]
+
+        full = plan.decryptor().decrypt_many([row])[0]
+        assert full["full_name"] == "Иван Иванов"
+
+        with pytest.raises(ValueError):
+            plan.decryptor(["city"])
+
+    def test_decrypt_tampered(self, plan):
+        """Tampered values raise ValueError."""
+        row = plan.encrypt(RECORD)
+        row["email"] = row["email"][:-4] + "AAAA"
+        with pytest.raises(ValueError):
+            plan.decryptor(["email"]).decrypt(row)
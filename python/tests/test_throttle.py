@@ -0,0 +1,129 @@
+"""
+Tests for the adaptive migration rate governor.
+"""
+
+import pytest
+from housler_crypto.throttle import RateGovernor
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateCap:
+    """Test throughput caps."""
+
+    def test_rows_per_sec_cap(self):
+        """Fast batches should be slowed down to the row cap."""
+        clock = FakeClock()
+        governor = RateGovernor(max_rows_per_sec=100, clock=clock, sleep=clock.sleep)
+
+        governor.throttle(100)  # first batch only sets the reference point
+        clock.now += 0.25
+        governor.throttle(100)
+
+        assert clock.slept == [pytest.approx(0.75)]
+        assert governor.stats["throttled_seconds"] == pytest.approx(0.75)
+
+    def test_bytes_per_sec_cap(self):
+        """The stricter of both caps should win."""
+        clock = FakeClock()
+        governor = RateGovernor(
+            max_rows_per_sec=1000, max_bytes_per_sec=1000,
+            clock=clock, sleep=clock.sleep,
+        )
+
+        governor.throttle(10, 2000)
+        governor.throttle(10, 2000)
+
+        assert clock.slept == [pytest.approx(2.0)]
+
+    def test_slow_batches_not_throttled(self):
+        """No sleep when the batch already took longer than needed."""
+        clock = FakeClock()
+        governor = RateGovernor(max_rows_per_sec=100, clock=clock, sleep=clock.sleep)
+
+        governor.throttle(50)
+        clock.now += 1.0
+        governor.throttle(50)
+
+        assert clock.slept == []
+
+    def test_batch_size_limited_by_rate(self):
+        """Batch size should not exceed one commit interval of rows."""
+        governor = RateGovernor(max_rows_per_sec=200, batch_size=5000)
+        assert governor.batch_size == 200
+
+    def test_invalid_cap(self):
+        """Non-positive caps are rejected."""
+        with pytest.raises(ValueError, match="max_rows_per_sec"):
+            RateGovernor(max_rows_per_sec=0)
+
+
+class TestHealthProbe:
+    """Test back-off and recovery driven by the health probe."""
+
+    def test_back_off_and_recover(self):
+        """Unhealthy halves the batch and pauses; healthy recovers."""
+        clock = FakeClock()
+        lag = [5.0, 5.0, 0.1, 0.1, 0.1]
+        governor = RateGovernor(
+            health_probe=lambda: lag.pop(0), max_lag=1.0,
+            batch_size=1000, max_batch_size=1000, base_pause=0.5,
+            clock=clock, sleep=clock.sleep,
+        )
+
+        governor.throttle(1000)
+        assert governor.batch_size == 500
+        assert governor.pause == 0.5
+
+        governor.throttle(500)
+        assert governor.batch_size == 250
+        assert governor.pause == 1.0
+        assert governor.stats["backoffs"] == 2
+
+        governor.throttle(250)
+        assert governor.batch_size == 350
+        assert governor.pause == 0.5
+
+        governor.throttle(350)
+        governor.throttle(450)
+        assert governor.batch_size == 550
+        assert clock.slept == [0.5, 1.0, 0.5, 0.25, 0.125]
+
+    def test_bool_probe_and_bounds(self):
+        """Bool probes work and the batch never drops below the minimum."""
+        clock = FakeClock()
+        governor = RateGovernor(
+            health_probe=lambda: False, batch_size=40, min_batch_size=10,
+            max_pause=2.0, clock=clock, sleep=clock.sleep,
+        )
+
+        for _ in range(6):
+            governor.throttle(10)
+
+        assert governor.batch_size == 10
+        assert governor.pause == 2.0
+
+    def test_failing_probe_counts_as_unhealthy(self):
+        """An exception from the probe backs off instead of aborting."""
+        clock = FakeClock()
+
+        def probe():
+            raise RuntimeError("replica unreachable")
+
+        governor = RateGovernor(health_probe=probe, clock=clock, sleep=clock.sleep)
+        governor.throttle(100)
+
+        assert governor.stats["backoffs"] == 1
@@ -0,0 +1,92 @@
+"""
+Tests for token blind indexes.
+"""
+
+import pytest
+from housler_crypto import HouslerCrypto
+from housler_crypto.tokens import TokenIndex
+
+from .test_migration import TEST_MASTER_KEY
+
+
+@pytest.fixture
+def crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+
+def _matches(index, values, term):
+    """Values whose stored tokens contain every query token."""
+    wanted = set(index.query(term))
+    return [v for v, tokens in zip(values, index.tokens_many(values), strict=True)
+            if wanted <= set(tokens)]
+
+
+class TestPrefix:
+    """Test prefix tokens."""
+
+    def test_starts_with(self, crypto):
+        """Prefix queries find words starting with the term, case and ё insensitive."""
+        index = TokenIndex(crypto, "last_name")
+        values = ["Петров", "Пётр Иванов", "Сидоров", None, "Петрушин"]
+        assert _matches(index, values, "петр") == ["Петров", "Пётр Иванов", "Петрушин"]
+        assert _matches(index, values, "ПЕТРО") == ["Петров"]
+        assert _matches(index, values, "пет ива") == ["Пётр Иванов"]
+
+    def test_limits(self, crypto):
+        """Prefix lengths and token counts are bounded; long terms are cut."""
+        index = TokenIndex(crypto, "name", min_length=2, max_length=4, max_tokens=4)
+        assert len(index.tokens("Александр")) == 3
+        assert len(index.tokens("Александр Сергеевич Пушкин")) == 4
+        assert index.query("Александрович") == index.query("алек")
+
+    def test_too_short(self, crypto):
+        """Terms shorter than min_length cannot be searched."""
+        index = TokenIndex(crypto, "last_name")
+        with pytest.raises(ValueError, match="too short"):
+            index.query("пе")
+        assert index.tokens("") == []
+
+
+class TestNgramAndWord:
+    """Test n-gram and word tokens."""
+
+    def test_ngram_contains(self, crypto):
+        """N-gram queries find substrings."""
+        index = TokenIndex(crypto, "email", mode="ngram")
+        values = ["ivan.petrov@example.com", "petra@mail.ru", "sidorov@example.com"]
+        assert _matches(index, values, "PETR") == values[:2]
+        assert _matches(index, values, "example") == [values[0], values[2]]
+
+    def test_word(self, crypto):
+        """Word mode splits on punctuation and drops short words."""
+        index = TokenIndex(crypto, "email", mode="word")
+        assert len(index.tokens("ivan.petrov@example.com")) == 4
+        assert _matches(index, ["ivan.petrov@example.com", "petrova@x.ru"], "petrov") == [
+            "ivan.petrov@example.com"
+        ]
+
+    def test_modes_and_fields_do_not_mix(self, crypto):
+        """The same token string hashes differently per mode, n-gram size and field."""
+        prefix = TokenIndex(crypto, "email", mode="prefix", min_length=3, max_length=3)
+        ngram = TokenIndex(crypto, "email", mode="ngram")
+        other = TokenIndex(crypto, "login", mode="ngram")
+        assert prefix.tokens("abc") != ngram.tokens("abc") != other.tokens("abc")
+        assert ngram.tokens("abc") != TokenIndex(crypto, "email", mode="ngram", ngram_size=2).tokens("abc")
+
+
+class TestSettings:
+    """Test validation and encodings."""
+
+    def test_invalid(self, crypto):
+        """Bad modes and lengths raise ValueError."""
+        with pytest.raises(ValueError, match="mode"):
+            TokenIndex(crypto, "name", mode="suffix")
+        with pytest.raises(ValueError, match="min_length"):
+            TokenIndex(crypto, "name", min_length=5, max_length=4)
+        with pytest.raises(ValueError, match="digest_size"):
+            TokenIndex(crypto, "name", digest_size=4)
+
+    def test_encoding(self, crypto):
+        """Digest size and encoding follow the blind index settings."""
+        index = TokenIndex(crypto, "name", digest_size=16, encoding="base64url")
+        assert all(HouslerCrypto.is_blind_index(t, 16, "base64url") for t in index.tokens("Иванов"))
@@ -0,0 +1,185 @@
+"""
+Tests for tracing and profiling hooks.
+"""
+
+import pytest
+from housler_crypto import FernetMigrator, HouslerCrypto
+from housler_crypto.tracing import SamplingProfiler, TraceHooks, attach_hooks, detach_hooks
+
+from .test_migration import TEST_ENCRYPTION_KEY, TEST_MASTER_KEY, TEST_SALT, _lk_fernet
+
+
+class RecordingHooks(TraceHooks):
+    """Records enter/exit events."""
+
+    def __init__(self):
+        self.events = []
+
+    def enter(self, operation, stage, field):
+        self.events.append(("enter", operation, stage, field))
+        return stage
+
+    def exit(self, operation, stage, field, state, error):
+        assert state == stage
+        self.events.append(("exit", operation, stage, type(error).__name__ if error else None))
+
+
+@pytest.fixture
+def hooks():
+    return RecordingHooks()
+
+
+@pytest.fixture
+def crypto(hooks):
+    return attach_hooks(HouslerCrypto(master_key=TEST_MASTER_KEY), hooks)
+
+
+class TestCryptoHooks:
+    """Test stage callbacks around HouslerCrypto calls."""
+
+    def test_encrypt_stages(self, crypto, hooks):
+        """encrypt reports nested stages and still roundtrips."""
+        encrypted = crypto.encrypt("user@example.com", field="email")
+
+        assert [e[2] for e in hooks.events if e[0] == "enter"] == [
+            "total", "derive_key", "aead", "encode",
+        ]
+        assert hooks.events[-1] == ("exit", "encrypt", "total", None)
+        detach_hooks(crypto)
+        assert crypto.decrypt(encrypted, field="email") == "user@example.com"
+
+    def test_decrypt_stages_and_errors(self, crypto, hooks):
+        """decrypt reports stages; failures reach exit() and raise ValueError."""
+        encrypted = crypto.encrypt("secret", field="name")
+        hooks.events.clear()
+
+        assert crypto.decrypt(encrypted, field="name") == "secret"
+        assert [e[2] for e in hooks.events if e[0] == "enter"] == [
+            "total", "decode", "derive_key", "aead",
+        ]
+
+        hooks.events.clear()
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt(encrypted, field="other")
+        assert ("exit", "decrypt", "aead", "InvalidTag") in hooks.events
+        assert hooks.events[-1] == ("exit", "decrypt", "total", "ValueError")
+
+    def test_blind_index_stages(self, crypto, hooks):
+        """blind_index output is unchanged by tracing."""
+        plain = HouslerCrypto(master_key=TEST_MASTER_KEY)
+        assert crypto.blind_index("A@B.c", "email") == plain.blind_index("A@B.c", "email")
+        assert [e[2] for e in hooks.events if e[0] == "enter"] == ["total", "derive_key", "hash"]
+
+    def test_passthrough_values_not_traced(self, crypto, hooks):
+        """Empty and already encrypted values take the original path."""
+        crypto.encrypt("")
+        crypto.decrypt("legacy")
+        assert hooks.events == []
+
+    def test_deterministic_stages(self, crypto, hooks):
+        """AES-SIV values are traced on encrypt and decrypt."""
+        encrypted = crypto.encrypt_deterministic("secret", field="name")
+        assert crypto.decrypt(encrypted, field="name") == "secret"
+        assert [e[1:3] for e in hooks.events if e[0] == "enter"] == [
+            ("encrypt_deterministic", "total"), ("encrypt_deterministic", "derive_key"),
+            ("encrypt_deterministic", "aead"), ("encrypt_deterministic", "encode"),
+            ("decrypt", "total"), ("decrypt", "decode"), ("decrypt", "derive_key"),
+            ("decrypt", "aead"),
+        ]
+
+    def test_batch_and_compound_stages(self, crypto, hooks):
+        """Batch calls report one stage for the value loop; output is unchanged."""
+        plain = HouslerCrypto(master_key=TEST_MASTER_KEY)
+        encrypted = crypto.encrypt_many(["a", "b", ""], field="email")
+        assert crypto.decrypt_many(encrypted, field="email") == ["a", "b", ""]
+        assert crypto.blind_index_many(["a"], "email") == plain.blind_index_many(["a"], "email")
+        parts = [("last_name", "Иванов"), ("birth_date", "01.02.1990")]
+        assert crypto.compound_blind_index(parts) == plain.compound_blind_index(parts)
+
+        stages = [e[1:4] for e in hooks.events if e[0] == "enter"]
+        assert stages == [
+            ("encrypt_many", "total", "email"), ("encrypt_many", "derive_key", "email"),
+            ("encrypt_many", "aead", "email"),
+            ("decrypt_many", "total", "email"), ("decrypt_many", "derive_key", "email"),
+            ("decrypt_many", "aead", "email"),
+            ("blind_index_many", "total", "email"), ("blind_index_many", "derive_key", "email"),
+            ("blind_index_many", "hash", "email"),
+            ("compound_blind_index", "total", "last_name+birth_date"),
+            ("compound_blind_index", "derive_key", "last_name+birth_date"),
+            ("compound_blind_index", "hash", "last_name+birth_date"),
+        ]
+        assert len(hooks.events) == 2 * len(stages)
+
+    def test_batch_errors(self, crypto, hooks):
+        """A failing batch ends its stage with the cause and the call with ValueError."""
+        encrypted = crypto.encrypt_many(["a"], field="email")
+        hooks.events.clear()
+        with pytest.raises(ValueError, match="Decryption failed"):
+            crypto.decrypt_many(encrypted, field="phone")
+        assert hooks.events[-2:] == [
+            ("exit", "decrypt_many", "aead", "InvalidTag"),
+            ("exit", "decrypt_many", "total", "ValueError"),
+        ]
+
+    def test_detach(self, crypto, hooks):
+        """After detach no callbacks fire."""
+        detach_hooks(crypto)
+        crypto.encrypt("value")
+        assert hooks.events == []
+        assert "_tracer" not in vars(crypto)
+
+
+class TestMigratorHooks:
+    """Test stage callbacks around FernetMigrator.decrypt."""
+
+    def test_fernet_stages(self, hooks):
+        """Fernet decrypt reports derive_key and fernet stages."""
+        migrator = attach_hooks(
+            FernetMigrator.from_lk_config(TEST_ENCRYPTION_KEY, TEST_SALT), hooks,
+        )
+        token = _lk_fernet().encrypt(b"user@example.com").decode()
+
+        assert migrator.decrypt(token, field="email") == "user@example.com"
+        assert migrator.decrypt("plain", field="email") == "plain"
+        assert [e[2] for e in hooks.events if e[0] == "enter"] == [
+            "total", "derive_key", "fernet", "total", "derive_key", "fernet",
+        ]
+        # The plaintext passthrough ends its fernet stage with InvalidToken
+        assert ("exit", "legacy_decrypt", "fernet", "InvalidToken") in hooks.events
+        assert hooks.events[-1] == ("exit", "legacy_decrypt", "total", None)
+
+    def test_not_configured(self, hooks):
+        """An unconfigured migrator still raises."""
+        migrator = attach_hooks(FernetMigrator(), hooks)
+        with pytest.raises(ValueError, match="not configured"):
+            migrator.decrypt("something", field="email")
+
+    def test_rejects_other_objects(self, hooks):
+        """Only library objects accept hooks."""
+        with pytest.raises(TypeError):
+            attach_hooks(object(), hooks)
+
+
+class TestSamplingProfiler:
+    """Test the built-in 1-in-N profiler."""
+
+    def test_samples_one_in_n(self):
+        """Only every N-th call is timed."""
+        profiler = SamplingProfiler(every=4)
+        crypto = attach_hooks(HouslerCrypto(master_key=TEST_MASTER_KEY), profiler)
+
+        for _ in range(12):
+            crypto.encrypt("user@example.com", field="email")
+
+        snapshot = profiler.snapshot()["encrypt"]
+        assert snapshot["total"]["count"] == 3
+        assert set(snapshot) == {"total", "derive_key", "aead", "encode"}
+        assert snapshot["total"]["max_seconds"] >= snapshot["total"]["mean_seconds"] > 0
+
+        profiler.reset()
+        assert profiler.snapshot() == {}
+
+    def test_invalid_rate(self):
+        """every must be positive."""
+        with pytest.raises(ValueError):
+            SamplingProfiler(every=0)
@@ -4,7 +4,7 @@ Tests for utility functions: masking, normalization, validation.
 
 import pytest
 from housler_crypto import mask, normalize_phone, normalize_email
-from housler_crypto.utils import validate_email, validate_phone, validate_inn
+from housler_crypto.utils import batched, ordered_pool_map, validate_email, validate_phone, validate_inn
 
 
 class TestMaskEmail:
@@ -255,3 +255,148 @@ class TestValidateInn:
     def test_empty(self):
         """Empty is invalid."""
         assert validate_inn("") is False
+
+
+class TestBatch:
+    """Test batch normalization and validation against the single-value functions."""
+
+    PHONES = [
+        "+7 (999) 123-45-67", "8-999-123-45-67", "9991234567", "79991234567", "123",
+        "", None, "+7 ９９９ 123 45 67", "٨٩٩٩١٢٣٤٥٦٧", "tel: 8 800 555 35 35 ext 2",
+    ]
+    EMAILS = [
+        "Test@Example.COM", "  user@example.com  ", "invalid", "a@b.c", "", None,
+        "user@example.com\n", "пользователь@пример.рф", "user+tag@sub.example.org",
+    ]
+    INNS = ["7707083893", "500100732259", "77-07-08", "", None, "７７０７０８３８９３"]
+
+    def test_normalize_phones(self):
+        """Same values as normalize_phone(), validity as validate_phone()."""
+        from housler_crypto.utils import normalize_phones
+
+        normalized, valid = normalize_phones(self.PHONES)
+        assert normalized == [normalize_phone(p) for p in self.PHONES]
+        assert list(valid) == [int(validate_phone(p)) for p in self.PHONES]
+        assert isinstance(valid, bytearray)
+
+    def test_normalize_emails(self):
+        """Same values as normalize_email(), validity as validate_email()."""
+        from housler_crypto.utils import normalize_emails
+
+        normalized, valid = normalize_emails(self.EMAILS)
+        assert normalized == [normalize_email(e) for e in self.EMAILS]
+        assert list(valid) == [int(validate_email(e)) for e in self.EMAILS]
+
+    def test_validate(self):
+        """Batch validators match the single-value ones."""
+        from housler_crypto.utils import validate_emails, validate_inns, validate_phones
+
+        assert list(validate_emails(self.EMAILS)) == [int(validate_email(e)) for e in self.EMAILS]
+        assert list(validate_phones(self.PHONES)) == [int(validate_phone(p)) for p in self.PHONES]
+        assert list(validate_inns(self.INNS)) == [int(validate_inn(i)) for i in self.INNS]
+
+    def test_digits_parity_with_regex(self):
+        """The translate fast path strips exactly what re.sub(r"\\D") strips."""
+        import re
+
+        from housler_crypto.utils import _digits
+
+        samples = ["".join(map(chr, range(128))), "+7\t(999)\x00 12٣", "²³¹", "①"]
+        for sample in samples:
+            assert _digits(sample) == re.sub(r"\D", "", sample)
+
+
+class TestMaskBatch:
+    """Test batch masking against the single-value functions."""
+
+    VALUES = [
+        "test@example.com", "ab@example.com", "a@b@c", "invalid", "", None,
+        "+7 (999) 123-45-67", "8-999-123-45-67", "+123", "٨٩٩٩١٢٣٤٥٦٧",
+        "Иван Иванов", "  Ян  Ли ", "7707083893", "4111 1111 1111 1111", "12345",
+    ]
+
+    @pytest.mark.parametrize("kind", ["email", "phone", "name", "inn", "card"])
+    def test_columns(self, kind):
+        """mask.<kind>s() matches mask.<kind>() on every value."""
+        single = getattr(mask, kind)
+        batch = getattr(mask, kind + "s")
+        assert batch(self.VALUES) == [single(v) for v in self.VALUES]
+        assert batch(iter(self.VALUES)) == [single(v) for v in self.VALUES]
+
+    def test_apply(self):
+        """Records are masked per key; None and missing values are kept."""
+        records = [
+            {"email": "test@example.com", "phone": "+79991234567", "id": 1},
+            {"email": None, "full_name": "Иван Иванов", "id": 2},
+        ]
+        masked = mask.apply(records, {"email": "email", "phone": mask.phone, "full_name": "name"})
+        assert masked == [
+            {"email": "te***@example.com", "phone": "+7***4567", "id": 1},
+            {"email": None, "full_name": "Ив*** Ив***", "id": 2},
+        ]
+        assert records[0]["email"] == "test@example.com"
+
+    def test_apply_callable_and_schema(self):
+        """Arbitrary callables and RecordSchema masks are applied."""
+        from housler_crypto.schema import Attribute, RecordSchema
+
+        records = [{"email": "test@example.com", "code": "abc"}]
+        assert mask.apply(records, {"code": str.upper}) == [
+            {"email": "test@example.com", "code": "ABC"}
+        ]
+        schema = RecordSchema({"email": Attribute(mask="email"), "code": Attribute()})
+        assert mask.apply(records, schema) == [{"email": "te***@example.com", "code": "abc"}]
+
+    def test_apply_unknown_kind(self):
+        """Unknown mask kinds are rejected."""
+        with pytest.raises(ValueError, match="Unknown mask"):
+            mask.apply([], {"x": "passport"})
+
+
+class TestNormalizeField:
+    """Test field-aware normalization."""
+
+    def test_normalizers(self):
+        """Names, dates and document numbers are normalized by field."""
+        from housler_crypto.utils import normalize_date, normalize_field, normalize_name
+
+        assert normalize_name("  Пётр   ПЕТРОВ ") == "петр петров"
+        assert normalize_date("1.2.1990") == "1990-02-01"
+        assert normalize_date(" 1990-02-01 ") == "1990-02-01"
+        assert normalize_field("45 10 № 123456", "passport") == "4510123456"
+        assert normalize_field("8 (999) 123-45-67", "phone") == "79991234567"
+        assert normalize_field(" Some Value ", "unknown") == "some value"
+        assert normalize_field("", "name") == ""
+
+
+def _scale(factor, batch):
+    return [factor * value for value in batch]
+
+
+class TestOrderedPoolMap:
+    """Test the shared worker pool helpers."""
+
+    def test_batched(self):
+        """Batches keep order; the last one may be shorter."""
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert list(batched([], 3)) == []
+
+    @pytest.mark.parametrize("processes", [0, 2])
+    def test_results_in_input_order(self, processes):
+        """Results come back in input order, with per-process state from the initializer."""
+        results = ordered_pool_map(_scale, batched(range(10), 3), processes, int, (3,))
+        assert list(results) == [[0, 3, 6], [9, 12, 15], [18, 21, 24], [27]]
+
+    def test_reads_items_lazily(self):
+        """At most ``window`` items are in flight before the first result."""
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield [i]
+
+        results = ordered_pool_map(_scale, items(), 2, int, (1,), window=3)
+        assert next(results) == [0]
+        assert len(consumed) == 3
+        results.close()
@@ -0,0 +1,134 @@
+"""
+Tests for post-migration verification.
+"""
+
+import sqlite3
+
+import pytest
+from housler_crypto import FernetMigrator, HouslerCrypto
+from housler_crypto.migration import migrate_database_field
+from housler_crypto.verify import iter_column, verify_migration
+
+from .test_migration import TEST_ENCRYPTION_KEY, TEST_MASTER_KEY, TEST_SALT, _lk_fernet
+
+
+ROWS = 40
+
+
+@pytest.fixture
+def new_crypto():
+    return HouslerCrypto(master_key=TEST_MASTER_KEY)
+
+
+@pytest.fixture
+def migrator():
+    return FernetMigrator.from_lk_config(
+        encryption_key=TEST_ENCRYPTION_KEY,
+        encryption_salt=TEST_SALT,
+    )
+
+
+@pytest.fixture
+def databases(migrator, new_crypto):
+    """Backup with legacy values and a migrated live copy."""
+    fernet = _lk_fernet()
+    backup = sqlite3.connect(":memory:")
+    live = sqlite3.connect(":memory:")
+    for conn in (backup, live):
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?)",
+            [
+                (pk, fernet.encrypt(f"user{pk}@example.com".encode()).decode() if pk % 7 else None)
+                for pk in range(1, ROWS + 1)
+            ],
+        )
+        conn.commit()
+
+    migrate_database_field(
+        live, "users", "id", "email", "email", migrator, new_crypto,
+        dry_run=False, placeholder="?",
+    )
+    return backup, live
+
+
+class TestVerifyMigration:
+    """Test verification of migrated columns."""
+
+    def test_full_scan_clean(self, databases, migrator, new_crypto):
+        """A correct migration verifies without problems."""
+        backup, live = databases
+        report = verify_migration(
+            iter_column(backup, "users", "id", "email", batch_size=7),
+            iter_column(live, "users", "id", "email", batch_size=7),
+            "email", migrator, new_crypto, workers=3, chunk_size=4,
+        )
+
+        assert report["joined"] == ROWS
+        assert report["checked"] == ROWS
+        assert report["matched"] == ROWS
+        assert report["mismatched"] == 0
+        assert report["mismatches"] == []
+
+    def test_detects_problems_by_pk(self, databases, migrator, new_crypto):
+        """Every kind of problem is reported by primary key only."""
+        backup, live = databases
+        live.execute(
+            "UPDATE users SET email = ? WHERE id = 1",
+            (new_crypto.encrypt("someone-else@example.com", field="email"),),
+        )
+        live.execute("UPDATE users SET email = 'legacy-value' WHERE id = 2")
+        live.execute("UPDATE users SET email = 'hc1:broken' WHERE id = 3")
+        live.execute("DELETE FROM users WHERE id = 4")
+        live.execute("INSERT INTO users VALUES (100, NULL)")
+
+        report = verify_migration(
+            iter_column(backup, "users", "id", "email"),
+            iter_column(live, "users", "id", "email"),
+            "email", migrator, new_crypto, workers=2, chunk_size=3,
+        )
+
+        assert sorted(report["mismatches"]) == [
+            (1, "mismatch"),
+            (2, "not_migrated"),
+            (3, "decrypt_error"),
+            (4, "missing_in_live"),
+            (100, "missing_in_backup"),
+        ]
+        assert report["mismatched"] == 5
+        assert report["matched"] == ROWS - 4
+        assert "someone-else" not in repr(report)
+
+    def test_sampling_is_reproducible(self, databases, migrator, new_crypto):
+        """Sampling checks a subset, the same one for the same seed."""
+        backup, live = databases
+
+        def run():
+            return verify_migration(
+                iter_column(backup, "users", "id", "email"),
+                iter_column(live, "users", "id", "email"),
+                "email", migrator, new_crypto, sample_rate=0.25, seed=7,
+            )
+
+        first, second = run(), run()
+        assert 0 < first["checked"] < ROWS
+        assert first["checked"] == second["checked"]
+        assert first["joined"] == ROWS
+        assert first["mismatched"] == 0
+
+    def test_mismatch_list_is_capped(self, migrator, new_crypto):
+        """Counts stay complete when the listed mismatches are capped."""
+        legacy = [(pk, f"plain{pk}") for pk in range(20)]
+        live = [(pk, new_crypto.encrypt("other", field="name")) for pk in range(20)]
+
+        report = verify_migration(
+            legacy, live, "name", migrator, new_crypto, max_mismatches=5,
+        )
+
+        assert report["mismatch"] == 20
+        assert len(report["mismatches"]) == 5
+
+    def test_invalid_sample_rate(self, migrator, new_crypto):
+        """sample_rate outside (0, 1] is rejected."""
+        with pytest.raises(ValueError, match="sample_rate"):
+            verify_migration([], [], "email", migrator, new_crypto, sample_rate=0)
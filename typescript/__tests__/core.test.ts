@@ -237,4 +237,46 @@ describe('HouslerCrypto', () => {
       expect(hash1).toBe(hash2);
     });
   });
+
+  describe('encryptDeterministic', () => {
+    let crypto: HouslerCrypto;
+
+    beforeEach(() => {
+      crypto = new HouslerCrypto({ masterKey: TEST_KEY });
+    });
+
+    it('should match the Python implementation', () => {
+      expect(crypto.encryptDeterministic('user@example.com', 'email')).toBe(
+        'hc1:AmG6+qJi8PVKEaz+Y869SFao2eCkJdJdqE3m7QgmaESK'
+      );
+      expect(crypto.encryptDeterministic('x'.repeat(16), 'name')).toBe(
+        'hc1:ArKr0Lxtj9kIQQBVWnwouqWTeelTBv/msVqo582AsK+V'
+      );
+    });
+
+    it('should give equal ciphertexts for equal values', () => {
+      const encrypted = crypto.encryptDeterministic('test', 'email');
+      expect(crypto.encryptDeterministic('test', 'email')).toBe(encrypted);
+      expect(crypto.encryptDeterministic('test', 'phone')).not.toBe(encrypted);
+    });
+
+    it('should decrypt with decrypt()', () => {
+      for (const value of ['a', 'Тест 🔐', 'y'.repeat(33)]) {
+        expect(crypto.decrypt(crypto.encryptDeterministic(value, 'name'), 'name')).toBe(value);
+      }
+    });
+
+    it('should fail with wrong field', () => {
+      const encrypted = crypto.encryptDeterministic('secret', 'email');
+      expect(() => crypto.decrypt(encrypted, 'phone')).toThrow('Decryption failed');
+    });
+
+    it('should encrypt batches', () => {
+      expect(crypto.encryptDeterministicMany(['a', '', 'b'], 'email')).toEqual([
+        crypto.encryptDeterministic('a', 'email'),
+        '',
+        crypto.encryptDeterministic('b', 'email'),
+      ]);
+    });
+  });
 });
@@ -5,6 +5,7 @@
  *
  * Features:
  * - AES-256-GCM authenticated encryption
+ * - Opt-in deterministic AES-256-SIV encryption for equality lookups
  * - Per-field key derivation (PBKDF2-SHA256)
  * - BLAKE2b keyed blind index for searchable encryption
  * - Cross-platform format (compatible with Python version)
@@ -28,10 +29,104 @@ import crypto from 'crypto';
 
 // Constants matching Python implementation
 const VERSION_GCM = 0x01;
+const VERSION_SIV = 0x02;
 const IV_LENGTH = 12; // 96 bits for GCM
 const TAG_LENGTH = 16; // 128 bits
 const KEY_LENGTH = 32; // 256 bits
 const ENCRYPTED_PREFIX = 'hc1:'; // housler-crypto v1
+const BLOCK_LENGTH = 16; // AES block, also the SIV length
+
+/**
+ * Encrypt one block with AES-256 (no chaining, no padding).
+ */
+function aesBlock(key: Buffer, block: Buffer): Buffer {
+  const cipher = crypto.createCipheriv('aes-256-ecb', key, null);
+  cipher.setAutoPadding(false);
+  return Buffer.concat([cipher.update(block), cipher.final()]);
+}
+
+/**
+ * Multiply a block by x in GF(2^128) (RFC 5297 "dbl").
+ */
+function dbl(block: Buffer): Buffer {
+  const out = Buffer.alloc(BLOCK_LENGTH);
+  for (let i = 0; i < BLOCK_LENGTH; i++) {
+    const carry = i + 1 < BLOCK_LENGTH ? block[i + 1] >> 7 : 0;
+    out[i] = ((block[i] << 1) | carry) & 0xff;
+  }
+  if (block[0] & 0x80) {
+    out[BLOCK_LENGTH - 1] ^= 0x87;
+  }
+  return out;
+}
+
+/**
+ * XOR `b` into the last bytes of a copy of `a`.
+ */
+function xorEnd(a: Buffer, b: Buffer): Buffer {
+  const out = Buffer.from(a);
+  const offset = out.length - b.length;
+  for (let i = 0; i < b.length; i++) {
+    out[offset + i] ^= b[i];
+  }
+  return out;
+}
+
+/**
+ * Pad a partial block with 0x80 and zeros.
+ */
+function padBlock(data: Buffer): Buffer {
+  const out = Buffer.alloc(BLOCK_LENGTH);
+  data.copy(out);
+  out[data.length] = 0x80;
+  return out;
+}
+
+/**
+ * AES-CMAC (RFC 4493).
+ */
+function cmac(key: Buffer, data: Buffer): Buffer {
+  const subkey1 = dbl(aesBlock(key, Buffer.alloc(BLOCK_LENGTH)));
+  const complete = data.length > 0 && data.length % BLOCK_LENGTH === 0;
+  const lastStart = complete
+    ? data.length - BLOCK_LENGTH
+    : data.length - (data.length % BLOCK_LENGTH);
+
+  const last = complete
+    ? xorEnd(data.subarray(lastStart), subkey1)
+    : xorEnd(padBlock(data.subarray(lastStart)), dbl(subkey1));
+
+  // CBC-MAC with a zero IV: the last ciphertext block is the tag
+  const cipher = crypto.createCipheriv('aes-256-cbc', key, Buffer.alloc(BLOCK_LENGTH));
+  cipher.setAutoPadding(false);
+  const encrypted = Buffer.concat([
+    cipher.update(Buffer.concat([data.subarray(0, lastStart), last])),
+    cipher.final(),
+  ]);
+  return encrypted.subarray(encrypted.length - BLOCK_LENGTH);
+}
+
+/**
+ * S2V (RFC 5297) of a plaintext without associated data.
+ */
+function s2v(key: Buffer, plaintext: Buffer): Buffer {
+  const d = cmac(key, Buffer.alloc(BLOCK_LENGTH));
+  const t = plaintext.length >= BLOCK_LENGTH
+    ? xorEnd(plaintext, d)
+    : xorEnd(padBlock(plaintext), dbl(d));
+  return cmac(key, t);
+}
+
+/**
+ * AES-256-CTR keyed by the SIV, with bits 63 and 31 cleared (RFC 5297).
+ */
+function sivCtr(key: Buffer, siv: Buffer, data: Buffer): Buffer {
+  const counter = Buffer.from(siv);
+  counter[8] &= 0x7f;
+  counter[12] &= 0x7f;
+  const cipher = crypto.createCipheriv('aes-256-ctr', key, counter);
+  return Buffer.concat([cipher.update(data), cipher.final()]);
+}
 
 interface HouslerCryptoOptions {
   masterKey: string;
@@ -134,7 +229,46 @@ export class HouslerCrypto {
   }
 
   /**
-   * Decrypt data encrypted with AES-256-GCM.
+   * Encrypt data deterministically using AES-256-SIV.
+   *
+   * Equal plaintexts of one field give equal ciphertexts, so the stored
+   * value can be indexed and queried directly instead of a blind index.
+   * This reveals which rows share a value: use it only for lookup fields
+   * and normalize values before encrypting. decrypt() reads both formats.
+   *
+   * @param plaintext - Data to encrypt
+   * @param field - Field name for key derivation (e.g., "email", "phone")
+   * @returns Encrypted string with "hc1:" prefix
+   */
+  encryptDeterministic(plaintext: string, field: string = 'default'): string {
+    if (!plaintext) {
+      return '';
+    }
+
+    // Skip if already encrypted
+    if (plaintext.startsWith(ENCRYPTED_PREFIX)) {
+      return plaintext;
+    }
+
+    const data = Buffer.from(plaintext, 'utf8');
+    const siv = s2v(this.deriveKey(field + ':siv_mac'), data);
+    const encrypted = sivCtr(this.deriveKey(field + ':siv_ctr'), siv, data);
+
+    // Pack: version (1) + siv (16) + ciphertext
+    const packed = Buffer.concat([Buffer.from([VERSION_SIV]), siv, encrypted]);
+
+    return ENCRYPTED_PREFIX + packed.toString('base64');
+  }
+
+  /**
+   * Encrypt a batch of values deterministically for one field.
+   */
+  encryptDeterministicMany(plaintexts: string[], field: string = 'default'): string[] {
+    return plaintexts.map((plaintext) => this.encryptDeterministic(plaintext, field));
+  }
+
+  /**
+   * Decrypt data encrypted with AES-256-GCM or AES-256-SIV.
    *
    * @param ciphertext - Encrypted string (with "hc1:" prefix)
    * @param field - Field name for key derivation
@@ -154,6 +288,10 @@ export class HouslerCrypto {
       const encoded = ciphertext.slice(ENCRYPTED_PREFIX.length);
       const packed = Buffer.from(encoded, 'base64');
 
+      if (packed[0] === VERSION_SIV) {
+        return this.decryptSiv(packed, field);
+      }
+
       // Minimum size check
       if (packed.length < 1 + IV_LENGTH + TAG_LENGTH + 1) {
         throw new Error('Ciphertext too short');
@@ -187,6 +325,29 @@ export class HouslerCrypto {
     }
   }
 
+  /**
+   * Decrypt a decoded AES-256-SIV envelope.
+   */
+  private decryptSiv(packed: Buffer, field: string): string {
+    if (packed.length < 1 + BLOCK_LENGTH + 1) {
+      throw new Error('Ciphertext too short');
+    }
+
+    const siv = packed.subarray(1, 1 + BLOCK_LENGTH);
+    const decrypted = sivCtr(
+      this.deriveKey(field + ':siv_ctr'),
+      siv,
+      packed.subarray(1 + BLOCK_LENGTH)
+    );
+
+    const expected = s2v(this.deriveKey(field + ':siv_mac'), decrypted);
+    if (!crypto.timingSafeEqual(expected, siv)) {
+      throw new Error('Unsupported state or unable to authenticate data');
+    }
+
+    return decrypted.toString('utf8');
+  }
+
   /**
    * Create a blind index (deterministic hash) for searchable encryption.
    *